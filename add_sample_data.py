@@ -1,56 +1,55 @@
 """
 Sample Data Script for Course Registration System
 Run this script to populate the database with sample students and courses
+
+For a full catalog with program plans and schedules use load_sample_data.py;
+for large realistic test databases use synthetic_data.py.
 """
 
-from database import Database, Student, Course
+from database import Database
 
 
 def add_sample_data():
     """Add sample students and courses to the database"""
     db = Database()
-    
+
     print("Adding sample data to the database...")
-    
-    # Sample students
+
+    # Sample students: (student_id, name, email, program, level)
     students = [
-        Student(student_id="S001", name="Alice Johnson", email="alice@university.edu", major="Computer Science"),
-        Student(student_id="S002", name="Bob Smith", email="bob@university.edu", major="Mathematics"),
-        Student(student_id="S003", name="Carol Williams", email="carol@university.edu", major="Physics"),
-        Student(student_id="S004", name="David Brown", email="david@university.edu", major="Computer Science"),
-        Student(student_id="S005", name="Emma Davis", email="emma@university.edu", major="Engineering"),
+        ("2023101", "Alice Johnson", "alice@ece.edu", "Computer", 2),
+        ("2023102", "Bob Smith", "bob@ece.edu", "Communications", 2),
+        ("2022103", "Carol Williams", "carol@ece.edu", "Power", 3),
+        ("2024104", "David Brown", "david@ece.edu", "Computer", 1),
+        ("2021105", "Emma Davis", "emma@ece.edu", "Biomedical", 4),
     ]
-    
+
     for student in students:
-        if db.add_student(student):
-            print(f"✓ Added student: {student.name}")
+        success, msg = db.add_student(*student)
+        if success:
+            print(f"✓ Added student: {student[1]}")
         else:
-            print(f"✗ Student {student.student_id} already exists")
-    
-    # Sample courses
+            print(f"✗ {msg}")
+
+    # Sample courses: (course_code, name, credits, lecture_hours, lab_hours, max_capacity, description)
     courses = [
-        Course(course_code="CS101", name="Introduction to Programming", 
-               instructor="Dr. Anderson", credits=3, max_students=30),
-        Course(course_code="CS201", name="Data Structures", 
-               instructor="Dr. Martinez", credits=4, max_students=25),
-        Course(course_code="MATH101", name="Calculus I", 
-               instructor="Prof. Johnson", credits=4, max_students=40),
-        Course(course_code="PHYS101", name="Physics I", 
-               instructor="Dr. Lee", credits=4, max_students=35),
-        Course(course_code="ENG101", name="Engineering Design", 
-               instructor="Prof. Wilson", credits=3, max_students=20),
+        ("CS101", "Introduction to Programming", 3, 2, 2, 30, "Programming basics in Python"),
+        ("CS201", "Data Structures", 4, 3, 2, 25, "Lists, trees, graphs and hashing"),
+        ("MATH101", "Calculus I", 4, 4, 0, 40, "Differential calculus"),
+        ("PHYS101", "Physics I", 4, 3, 2, 35, "Mechanics and thermodynamics"),
+        ("ENG101", "Engineering Design", 3, 2, 2, 20, "Design process and teamwork"),
     ]
-    
+
     for course in courses:
-        if db.add_course(course):
-            print(f"✓ Added course: {course.name}")
+        success, msg = db.add_course(*course)
+        if success:
+            print(f"✓ Added course: {course[1]}")
         else:
-            print(f"✗ Course {course.course_code} already exists")
-    
+            print(f"✗ {msg}")
+
     print("\nSample data added successfully!")
     print("You can now run main.py to start the application.")
 
 
 if __name__ == "__main__":
     add_sample_data()
-
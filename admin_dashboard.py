@@ -6,11 +6,21 @@ Provides admin interface for course and curriculum management
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                              QTabWidget, QTableWidget, QTableWidgetItem, QLineEdit,
                              QTextEdit, QSpinBox, QComboBox, QMessageBox, QGroupBox,
-                             QHeaderView, QCheckBox)
-from PyQt6.QtCore import Qt
+                             QHeaderView, QCheckBox, QTableView)
+from functools import partial
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
 from database import Database
+from async_db import AsyncDatabase
 from models import Course
+from paged_table_model import PagedTableModel
+from prerequisite_graph import PrerequisiteGraph
+from qt_async import watch_future
+
+# Search-as-you-type: wait this long after the last keystroke, and show at
+# most this many matches
+STUDENT_SEARCH_DEBOUNCE_MS = 250
+STUDENT_SEARCH_LIMIT = 100
 
 
 class AdminDashboard(QWidget):
@@ -23,7 +33,8 @@ class AdminDashboard(QWidget):
         super().__init__()
         self.main_window = main_window
         self.user_info = user_info
-        self.db = Database()
+        self.db = Database.shared()
+        self.async_db = AsyncDatabase.shared(self.db)
         self.init_ui()
     
     def init_ui(self):
@@ -134,12 +145,14 @@ class AdminDashboard(QWidget):
         form_group.setLayout(form_layout)
         layout.addWidget(form_group)
         
-        # Courses table
-        self.courses_table = QTableWidget()
-        self.courses_table.setColumnCount(7)
-        self.courses_table.setHorizontalHeaderLabels([
-            "ID", "Code", "Name", "Credits", "Lec Hours", "Lab Hours", "Capacity"
-        ])
+        # Courses table (rows are loaded page by page as the view scrolls)
+        self.courses_model = PagedTableModel([
+            ("ID", "id"), ("Code", "course_code"), ("Name", "name"), ("Credits", "credits"),
+            ("Lec Hours", "lecture_hours"), ("Lab Hours", "lab_hours"), ("Capacity", "max_capacity")
+        ], self.db.get_courses_page, async_db=self.async_db, parent=self)
+        self.courses_model.loadFailed.connect(self._show_load_error)
+        self.courses_table = QTableView()
+        self.courses_table.setModel(self.courses_model)
         self.courses_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         layout.addWidget(self.courses_table)
         
@@ -156,9 +169,17 @@ class AdminDashboard(QWidget):
         search_layout = QHBoxLayout()
         search_layout.addWidget(QLabel("Search:"))
         self.student_search_input = QLineEdit()
-        self.student_search_input.setPlaceholderText("Search by ID or name")
+        self.student_search_input.setPlaceholderText("Search by ID, name or email")
         search_layout.addWidget(self.student_search_input)
         
+        # Search as the user types, once typing pauses
+        self.student_search_timer = QTimer(self)
+        self.student_search_timer.setSingleShot(True)
+        self.student_search_timer.setInterval(STUDENT_SEARCH_DEBOUNCE_MS)
+        self.student_search_timer.timeout.connect(self.refresh_students)
+        self.student_search_input.textChanged.connect(self.student_search_timer.start)
+        self.student_search_input.returnPressed.connect(self.refresh_students)
+        
         search_btn = QPushButton("Search")
         search_btn.clicked.connect(self.refresh_students)
         search_layout.addWidget(search_btn)
@@ -169,12 +190,14 @@ class AdminDashboard(QWidget):
         
         layout.addLayout(search_layout)
         
-        # Students table
-        self.students_table = QTableWidget()
-        self.students_table.setColumnCount(6)
-        self.students_table.setHorizontalHeaderLabels([
-            "DB ID", "Student ID", "Name", "Email", "Program", "Level"
-        ])
+        # Students table (rows are loaded page by page as the view scrolls)
+        self.students_model = PagedTableModel([
+            ("DB ID", "id"), ("Student ID", "student_id"), ("Name", "name"),
+            ("Email", "email"), ("Program", "program"), ("Level", "level")
+        ], self.db.get_students_page, async_db=self.async_db, parent=self)
+        self.students_model.loadFailed.connect(self._show_load_error)
+        self.students_table = QTableView()
+        self.students_table.setModel(self.students_model)
         self.students_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         layout.addWidget(self.students_table)
         
@@ -346,28 +369,72 @@ class AdminDashboard(QWidget):
         tab = QWidget()
         layout = QVBoxLayout()
         
-        # Filter
+        # Filters and sort order (applied in SQL, see Database.get_registrations_page)
         filter_layout = QHBoxLayout()
         filter_layout.addWidget(QLabel("Semester:"))
         self.reg_semester_input = QLineEdit()
         self.reg_semester_input.setPlaceholderText("e.g., Fall 2025")
+        self.reg_semester_input.returnPressed.connect(self.view_registrations)
         filter_layout.addWidget(self.reg_semester_input)
         
+        filter_layout.addWidget(QLabel("Course:"))
+        self.reg_course_combo = QComboBox()
+        filter_layout.addWidget(self.reg_course_combo)
+        self.load_registration_courses()
+        
+        filter_layout.addWidget(QLabel("Program:"))
+        self.reg_program_combo = QComboBox()
+        self.reg_program_combo.addItem("All Programs", None)
+        for program in ["Computer", "Communications", "Power", "Biomedical"]:
+            self.reg_program_combo.addItem(program, program)
+        filter_layout.addWidget(self.reg_program_combo)
+        
+        filter_layout.addWidget(QLabel("Status:"))
+        self.reg_status_combo = QComboBox()
+        self.reg_status_combo.addItem("All Statuses", None)
+        for status in ["Pending", "Approved", "Dropped"]:
+            self.reg_status_combo.addItem(status, status)
+        filter_layout.addWidget(self.reg_status_combo)
+        
+        filter_layout.addWidget(QLabel("Sort by:"))
+        self.reg_sort_combo = QComboBox()
+        for label, sort in [("Course", "course"), ("Student", "student"),
+                            ("Program", "program"), ("Status", "status")]:
+            self.reg_sort_combo.addItem(label, sort)
+        filter_layout.addWidget(self.reg_sort_combo)
+        
         view_regs_btn = QPushButton("View Registrations")
         view_regs_btn.clicked.connect(self.view_registrations)
         filter_layout.addWidget(view_regs_btn)
-        filter_layout.addStretch()
         
         layout.addLayout(filter_layout)
         
-        # Registrations table
-        self.registrations_table = QTableWidget()
-        self.registrations_table.setColumnCount(6)
-        self.registrations_table.setHorizontalHeaderLabels([
-            "Student ID", "Student Name", "Course Code", "Course Name", "Semester", "Status"
+        # Per-course totals, counted by the database
+        summary_group = QGroupBox("Course Summary")
+        summary_layout = QVBoxLayout()
+        self.reg_summary_table = QTableWidget()
+        self.reg_summary_table.setColumnCount(8)
+        self.reg_summary_table.setHorizontalHeaderLabels([
+            "Course Code", "Course Name", "Capacity", "Active", "Pending", "Approved",
+            "Dropped", "% Full"
         ])
+        self.reg_summary_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        summary_layout.addWidget(self.reg_summary_table)
+        summary_group.setLayout(summary_layout)
+        layout.addWidget(summary_group)
+        
+        # Registrations table (rows are loaded page by page as the view scrolls)
+        self.registrations_model = PagedTableModel([
+            ("Student ID", "student_id"), ("Student Name", "student_name"), ("Program", "program"),
+            ("Level", "level"), ("Course Code", "course_code"), ("Course Name", "course_name"),
+            ("Status", "status"), ("Registered", "registration_date")
+        ], lambda after, limit: [], async_db=self.async_db, parent=self,
+            row_key=lambda row: row['sort_key'])
+        self.registrations_model.loadFailed.connect(self._show_load_error)
+        self.registrations_table = QTableView()
+        self.registrations_table.setModel(self.registrations_model)
         self.registrations_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        layout.addWidget(self.registrations_table)
+        layout.addWidget(self.registrations_table, 2)
         
         tab.setLayout(layout)
         return tab
@@ -393,6 +460,7 @@ class AdminDashboard(QWidget):
             QMessageBox.information(self, "Success", message)
             self.clear_course_form()
             self.refresh_courses()
+            self.load_registration_courses()
         else:
             QMessageBox.critical(self, "Error", message)
     
@@ -408,30 +476,26 @@ class AdminDashboard(QWidget):
     
     def refresh_courses(self):
         """Refresh courses table"""
-        courses = self.db.get_all_courses()
-        self.courses_table.setRowCount(len(courses))
-        
-        for i, course in enumerate(courses):
-            self.courses_table.setItem(i, 0, QTableWidgetItem(str(course['id'])))
-            self.courses_table.setItem(i, 1, QTableWidgetItem(course['course_code']))
-            self.courses_table.setItem(i, 2, QTableWidgetItem(course['name']))
-            self.courses_table.setItem(i, 3, QTableWidgetItem(str(course['credits'])))
-            self.courses_table.setItem(i, 4, QTableWidgetItem(str(course['lecture_hours'])))
-            self.courses_table.setItem(i, 5, QTableWidgetItem(str(course['lab_hours'])))
-            self.courses_table.setItem(i, 6, QTableWidgetItem(str(course['max_capacity'])))
+        self.courses_model.reset()
     
     def refresh_students(self):
-        """Refresh students table"""
-        students = self.db.get_all_students()
-        self.students_table.setRowCount(len(students))
-        
-        for i, student in enumerate(students):
-            self.students_table.setItem(i, 0, QTableWidgetItem(str(student['id'])))
-            self.students_table.setItem(i, 1, QTableWidgetItem(student['student_id']))
-            self.students_table.setItem(i, 2, QTableWidgetItem(student['name']))
-            self.students_table.setItem(i, 3, QTableWidgetItem(student['email']))
-            self.students_table.setItem(i, 4, QTableWidgetItem(student['program']))
-            self.students_table.setItem(i, 5, QTableWidgetItem(str(student['level'])))
+        """Refresh students table, showing search matches if there is a query"""
+        self.student_search_timer.stop()
+        query = self.student_search_input.text().strip()
+        if query:
+            self.students_model.set_fetch_page(partial(self._fetch_student_matches, query))
+        else:
+            self.students_model.set_fetch_page(self.db.get_students_page)
+    
+    def _fetch_student_matches(self, query, after_id, limit):
+        """Search results as a single page for the students model"""
+        if after_id:
+            return []  # Results are capped, there is no next page
+        return self.db.search_students(query, min(limit, STUDENT_SEARCH_LIMIT))
+    
+    def _show_load_error(self, error):
+        """Report a failed background load"""
+        QMessageBox.critical(self, "Error", f"Failed to load data: {error}")
     
     def add_to_program_plan(self):
         """Add course to program plan"""
@@ -462,7 +526,7 @@ class AdminDashboard(QWidget):
             QMessageBox.warning(self, "Validation Error", "Both course codes are required")
             return
         
-        success, message = self.db.add_prerequisite(course, prereq)
+        success, message = PrerequisiteGraph.shared(self.db).add_prerequisite(course, prereq)
         
         if success:
             QMessageBox.information(self, "Success", message)
@@ -525,8 +589,40 @@ class AdminDashboard(QWidget):
         else:
             QMessageBox.critical(self, "Error", message)
     
+    def load_registration_courses(self):
+        """Fill the registrations course filter with the current courses"""
+        selected = self.reg_course_combo.currentData()
+        self.reg_course_combo.clear()
+        self.reg_course_combo.addItem("All Courses", None)
+        for course in self.db.get_all_courses():
+            self.reg_course_combo.addItem(course['course_code'], course['id'])
+        index = self.reg_course_combo.findData(selected)
+        self.reg_course_combo.setCurrentIndex(max(index, 0))
+    
     def view_registrations(self):
-        """View all registrations"""
-        # This would require a more complex query combining multiple tables
-        QMessageBox.information(self, "Info", "View registrations functionality")
+        """View a semester's registrations with the selected filters and sort order"""
+        semester = self.reg_semester_input.text().strip()
+        if not semester:
+            QMessageBox.warning(self, "Validation Error", "Semester is required")
+            return
+        
+        course_id = self.reg_course_combo.currentData()
+        self.registrations_model.set_fetch_page(partial(
+            self.db.get_registrations_page, semester,
+            sort=self.reg_sort_combo.currentData(), course_id=course_id,
+            program=self.reg_program_combo.currentData(),
+            status=self.reg_status_combo.currentData()))
+        
+        future = self.async_db.submit(self.db.get_registration_summary, semester, course_id)
+        watch_future(future, self, self._show_registration_summary, self._show_load_error)
+    
+    def _show_registration_summary(self, summary):
+        """Fill the course summary table"""
+        self.reg_summary_table.setRowCount(len(summary))
+        for i, course in enumerate(summary):
+            values = [course['course_code'], course['name'], course['max_capacity'],
+                      course['active'], course['pending'], course['approved'],
+                      course['dropped'], f"{course['percent_full']}%"]
+            for column, value in enumerate(values):
+                self.reg_summary_table.setItem(i, column, QTableWidgetItem(str(value)))
 
@@ -0,0 +1,66 @@
+"""
+ECE Department Course Registration System - Asynchronous Data Access
+Runs Database queries on a background worker thread and returns
+concurrent.futures.Future objects
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from database import Database
+
+
+class AsyncDatabase:
+    """
+    Asynchronous facade over Database
+
+    Every Database method is available under the same name but returns a
+    Future instead of blocking, e.g. ``async_db.get_all_courses()``.
+    Compound loads (several queries plus post-processing) go through
+    submit(). Qt code delivers results with qt_async.watch_future or
+    qt_async.LatestRequestLoader.
+
+    Attributes:
+        db: Wrapped Database
+        max_workers: Number of worker threads
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db: Database, max_workers: int = 1):
+        self.db = db
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="db-query")
+
+    @classmethod
+    def shared(cls, db: Database) -> 'AsyncDatabase':
+        """Get the process-wide AsyncDatabase for a Database"""
+        with cls._shared_lock:
+            async_db = cls._shared.get(db.db_name)
+            if async_db is None:
+                async_db = cls(db)
+                cls._shared[db.db_name] = async_db
+            return async_db
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run fn(*args, **kwargs) on the worker thread"""
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.db, name)
+        if not callable(attr):
+            return attr
+
+        def call_async(*args, **kwargs) -> Future:
+            return self.executor.submit(attr, *args, **kwargs)
+
+        call_async.__name__ = name
+        call_async.__doc__ = attr.__doc__
+        return call_async
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker thread"""
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,85 @@
+"""
+ECE Department Course Registration System - Authentication Service
+Runs the deliberately slow bcrypt work (login checks and password hashing)
+on a worker pool and hands results back as concurrent.futures.Future objects,
+so neither the GUI event loop nor a server loop blocks on it
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from database import Database
+
+
+class AuthService:
+    """
+    Asynchronous authentication and account creation
+
+    bcrypt releases the GIL while hashing, so a thread pool gives real
+    parallelism. Qt code can deliver results with qt_async.watch_future;
+    asyncio code can await asyncio.wrap_future(future).
+
+    Attributes:
+        db: Database holding the user accounts
+        max_workers: Number of hashing threads
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db: Database, max_workers: Optional[int] = None):
+        self.db = db
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                           thread_name_prefix="auth")
+
+    @classmethod
+    def shared(cls, db: Database) -> 'AuthService':
+        """Get the process-wide AuthService for a Database"""
+        with cls._shared_lock:
+            service = cls._shared.get(db.db_name)
+            if service is None:
+                service = cls(db)
+                cls._shared[db.db_name] = service
+            return service
+
+    def authenticate(self, username: str, password: str) -> Future:
+        """
+        Check a login on the worker pool
+
+        Returns:
+            Future resolving to the user info dict, or None if the
+            credentials are wrong
+        """
+        return self.executor.submit(self.db.authenticate_user, username, password)
+
+    def register_student(self, student_id: str, name: str, email: str, program: str,
+                         level: int, username: str, password: str) -> Future:
+        """
+        Create a student profile and its login account on the worker pool
+
+        Returns:
+            Future resolving to (success: bool, message: str)
+        """
+        return self.executor.submit(self._register_student, student_id, name, email,
+                                    program, level, username, password)
+
+    def _register_student(self, student_id: str, name: str, email: str, program: str,
+                          level: int, username: str, password: str) -> Tuple[bool, str]:
+        """Blocking body of register_student"""
+        success, message = self.db.add_student(student_id, name, email, program, level)
+        if not success:
+            return False, message
+
+        student = self.db.get_student_by_student_id(student_id)
+        success, message = self.db.register_user(username, password, 'Student', student['id'])
+        if not success:
+            return False, f"Student created but account failed: {message}"
+
+        return True, "Student registered successfully"
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool"""
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,254 @@
+"""
+ECE Department Course Registration System - Batch Validation
+Validates every student's planned course load at once for advisors
+
+Everything the checks need (transcripts, program plans, prerequisites,
+capacities and schedules) is bulk loaded in a handful of queries; the
+per-student checks then run over a process pool with no database access.
+
+Usage:
+    python batch_validation.py --semester "Fall 2025" [--source registrations|plan]
+                               [--plan-semester 1] [--workers N] [--output report.csv]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from database import Database, DEFAULT_DB_NAME
+from models import RegistrationSystem, Student
+
+# Students per task sent to a worker process
+CHUNK_SIZE = 500
+
+# Set in each worker process by _init_worker
+_context = None
+
+
+def load_context(db: Database, semester_year: str) -> Dict:
+    """
+    Bulk load the catalog data shared by every student's checks
+
+    Returns:
+        Dict with 'courses', 'prerequisites', 'enrollment', 'schedules'
+        (all keyed by course ID) and 'plans' (keyed by (program, level))
+    """
+    with db.connection():
+        courses = {course['id']: course for course in db.get_all_courses()}
+        edges, _ = db.get_prerequisite_edges()
+        enrollment = db.get_enrollment_counts(list(courses), semester_year)
+        schedules = db.get_schedules_for_courses(list(courses), semester_year)
+        plans = db.get_all_program_plan_codes()
+
+    codes = {course_id: course['course_code'] for course_id, course in courses.items()}
+    prerequisites = {course_id: [] for course_id in courses}
+    for row in edges:
+        if row['prerequisite_course_id'] is not None:
+            prerequisites[row['id']].append(codes[row['prerequisite_course_id']])
+
+    # Only what the checks read, to keep the per-worker copy small
+    for meetings in schedules.values():
+        for sched in meetings:
+            sched.pop('slot_mask', None)
+
+    return {
+        'courses': courses,
+        'prerequisites': prerequisites,
+        'enrollment': enrollment,
+        'schedules': schedules,
+        'plans': plans,
+    }
+
+
+def load_selections(db: Database, semester_year: str, source: str = "registrations",
+                    plan_semester: int = 1) -> Dict[int, List[int]]:
+    """
+    Get the course load to validate for each student
+
+    Args:
+        db: Database instance
+        semester_year: Semester being registered for
+        source: "registrations" for each student's active registrations, or
+            "plan" for the program plan courses of their level
+        plan_semester: Plan semester (1 or 2) used with source="plan"
+
+    Returns:
+        {student DB ID: course IDs}
+    """
+    if source == "registrations":
+        return db.get_semester_registrations(semester_year)
+    if source != "plan":
+        raise ValueError(f"Unknown selection source '{source}'")
+
+    plan_ids = {}
+    selections = {}
+    for student in db.get_all_students():
+        key = (student['program'], student['level'])
+        if key not in plan_ids:
+            plan_ids[key] = [course['id'] for course in
+                             db.get_program_plan_courses(*key, plan_semester)]
+        selections[student['id']] = plan_ids[key]
+    return selections
+
+
+def validate_student(context: Dict, task: Dict) -> Dict:
+    """
+    Validate one student's selection against a loaded context
+
+    Runs the same checks, with the same messages, as
+    RegistrationSystem.validate_schedule. When the selection is the
+    student's existing registrations, their own seats are not counted
+    against course capacity.
+    """
+    courses = context['courses']
+    course_ids = [course_id for course_id in task['course_ids'] if course_id in courses]
+    selected = [courses[course_id] for course_id in course_ids]
+    completed = set(task['completed'])
+    held = set(task['held'])
+
+    blocked = {}
+    enrollment = {}
+    schedules = {}
+    for course_id in course_ids:
+        missing = [code for code in context['prerequisites'][course_id] if code not in completed]
+        if missing:
+            blocked[course_id] = missing
+        enrollment[course_id] = context['enrollment'][course_id] - (course_id in held)
+        schedules[course_id] = context['schedules'][course_id]
+
+    student = Student(task['student_id'], task['name'], "", task['program'], task['level'])
+    plan_codes = context['plans'].get((task['program'], task['level']), {1: set(), 2: set()})
+    valid, errors = RegistrationSystem.check_selection(
+        student, selected, blocked, enrollment, schedules, plan_codes
+    )
+    return {
+        'id': task['id'],
+        'student_id': task['student_id'],
+        'name': task['name'],
+        'program': task['program'],
+        'level': task['level'],
+        'courses': [course['course_code'] for course in selected],
+        'valid': valid,
+        'errors': errors,
+    }
+
+
+def _init_worker(context: Dict):
+    global _context
+    _context = context
+
+
+def _validate_chunk(tasks: List[Dict]) -> List[Dict]:
+    return [validate_student(_context, task) for task in tasks]
+
+
+def validate_cohort(db: Database, semester_year: str,
+                    selections: Optional[Dict[int, List[int]]] = None,
+                    source: str = "registrations", plan_semester: int = 1,
+                    workers: Optional[int] = None) -> List[Dict]:
+    """
+    Validate every student's course load for a semester
+
+    Args:
+        db: Database instance
+        semester_year: Semester being registered for
+        selections: {student DB ID: course IDs} to validate; loaded from
+            `source` when omitted
+        source: "registrations" or "plan" (see load_selections)
+        plan_semester: Plan semester used with source="plan"
+        workers: Worker processes (default: CPU count); 1 runs in-process
+
+    Returns:
+        Per-student reports (dicts with 'student_id', 'name', 'courses',
+        'valid' and 'errors'), in student ID order; students without a
+        selection are left out
+    """
+    context = load_context(db, semester_year)
+    # Students already hold seats in the courses of their own registrations
+    held_seats = selections is None and source == "registrations"
+    if selections is None:
+        selections = load_selections(db, semester_year, source, plan_semester)
+    passed = db.get_passed_course_codes()
+
+    tasks = []
+    for student in db.get_all_students():
+        course_ids = selections.get(student['id'])
+        if not course_ids:
+            continue
+        tasks.append({
+            'id': student['id'],
+            'student_id': student['student_id'],
+            'name': student['name'],
+            'program': student['program'],
+            'level': student['level'],
+            'course_ids': course_ids,
+            'completed': passed.get(student['id'], []),
+            'held': course_ids if held_seats else [],
+        })
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= CHUNK_SIZE:
+        return [validate_student(context, task) for task in tasks]
+
+    chunks = [tasks[i:i + CHUNK_SIZE] for i in range(0, len(tasks), CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(context,)) as pool:
+        return [report for chunk in pool.map(_validate_chunk, chunks) for report in chunk]
+
+
+def write_report(reports: Iterable[Dict], path: str):
+    """Write reports as JSON (.json) or CSV with one row per message"""
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(list(reports), f, indent=2)
+        return
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["student_id", "name", "program", "level", "courses", "message"])
+        for report in reports:
+            for message in report['errors'] or [""]:
+                writer.writerow([report['student_id'], report['name'], report['program'],
+                                 report['level'], " ".join(report['courses']), message])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate every student's course load")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="Database file")
+    parser.add_argument("--semester", required=True, help='Semester, e.g. "Fall 2025"')
+    parser.add_argument("--source", choices=["registrations", "plan"], default="registrations",
+                        help="Validate active registrations or the standard plan load")
+    parser.add_argument("--plan-semester", type=int, choices=[1, 2], default=1)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--output", help="Write the full report to a .csv or .json file")
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    start = time.perf_counter()
+    reports = validate_cohort(db, args.semester, source=args.source,
+                              plan_semester=args.plan_semester, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    db.close()
+
+    failing = [report for report in reports if not report['valid']]
+    print(f"Validated {len(reports)} students in {elapsed:.2f}s: "
+          f"{len(reports) - len(failing)} valid, {len(failing)} with errors")
+    if args.output:
+        write_report(reports, args.output)
+        print(f"Report written to {args.output}")
+    else:
+        for report in failing:
+            print(f"\n{report['student_id']} {report['name']} ({' '.join(report['courses'])})")
+            for message in report['errors']:
+                print(f"  - {message}")
+
+    sys.exit(1 if failing else 0)
+
+
+if __name__ == "__main__":
+    main()
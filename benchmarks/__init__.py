@@ -0,0 +1,5 @@
+"""
+ECE Department Course Registration System - Benchmarks
+Standalone performance scripts, run from the project root with
+``python -m benchmarks.<name>``
+"""
@@ -0,0 +1,124 @@
+"""
+Admin table loading benchmark
+
+Seeds a database with many students and compares the old admin Students
+table (get_all_students plus one QTableWidgetItem per cell) with the paged
+model/view table: time until the table is shown, and memory held after
+scrolling through every row. The paged model is driven the way QTableView
+drives it, through canFetchMore/fetchMore and data() on the visible rows.
+
+Usage:
+    python -m benchmarks.admin_tables [--students 50000] [--page-size 200]
+
+Without a display, Qt's offscreen platform is used.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+from database import Database
+from paged_table_model import PagedTableModel
+
+STUDENT_COLUMNS = [
+    ("DB ID", "id"), ("Student ID", "student_id"), ("Name", "name"),
+    ("Email", "email"), ("Program", "program"), ("Level", "level")
+]
+VISIBLE_ROWS = 30
+
+
+def seed(db: Database, count: int):
+    """Insert `count` students in one transaction"""
+    def work(cursor):
+        cursor.executemany(
+            "INSERT INTO students (student_id, name, email, program, level) VALUES (?, ?, ?, ?, ?)",
+            ((f"S{i:06d}", f"Student {i}", f"s{i}@ece.edu", "Computer", i % 4 + 1)
+             for i in range(count))
+        )
+    db.run_in_transaction(work)
+
+
+def widget_table(db: Database) -> QTableWidget:
+    """Build the Students table the way AdminDashboard used to"""
+    table = QTableWidget()
+    table.setColumnCount(len(STUDENT_COLUMNS))
+    students = db.get_all_students()
+    table.setRowCount(len(students))
+    for i, student in enumerate(students):
+        for col, (_, key) in enumerate(STUDENT_COLUMNS):
+            table.setItem(i, col, QTableWidgetItem(str(student[key])))
+    return table
+
+
+def scroll_model(model: PagedTableModel) -> int:
+    """Scroll from top to bottom a screenful at a time; return the rows seen"""
+    top = 0
+    while True:
+        while model.canFetchMore() and top + VISIBLE_ROWS >= model.rowCount():
+            model.fetchMore()
+        bottom = min(top + VISIBLE_ROWS, model.rowCount())
+        for row in range(top, bottom):
+            for col in range(model.columnCount()):
+                model.data(model.index(row, col), Qt.ItemDataRole.DisplayRole)
+        if bottom >= model.rowCount() and not model.canFetchMore():
+            return bottom
+        top = bottom
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Admin Students table: widget vs paged model")
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=200)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "admin_tables.db"))
+        print(f"Seeding {args.students} students...")
+        seed(db, args.students)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        table = widget_table(db)
+        widget_time = time.perf_counter() - start
+        widget_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del table
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        model = PagedTableModel(STUDENT_COLUMNS, db.get_students_page, page_size=args.page_size)
+        model.reset()
+        first_page_time = time.perf_counter() - start
+        rows = scroll_model(model)
+        model_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        # Scroll back to the top: evicted pages are re-read by key
+        start = time.perf_counter()
+        model.data(model.index(0, 0), Qt.ItemDataRole.DisplayRole)
+        reread_time = time.perf_counter() - start
+
+        db.close()
+
+    print(f"QTableWidget, all rows:  {widget_time * 1000:9.1f} ms to show, "
+          f"{widget_memory / 1e6:6.1f} MB Python memory")
+    print(f"Paged model, first page: {first_page_time * 1000:9.1f} ms to show")
+    print(f"Paged model, after scrolling all {rows} rows: "
+          f"{model_memory / 1e6:.1f} MB Python memory, {model.cached_pages()} pages cached")
+    print(f"Re-reading an evicted page: {reread_time * 1000:.2f} ms")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
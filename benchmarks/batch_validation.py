@@ -0,0 +1,167 @@
+"""
+Cohort batch validation benchmark
+
+Seeds a database with a synthetic cohort (students with transcripts, a
+catalog with prerequisites, schedules and program plans) and compares:
+
+- calling RegistrationSystem.validate_schedule once per student, timed on
+  a sample and extrapolated to the cohort
+- batch_validation.validate_cohort, which bulk loads everything once and
+  validates the whole cohort (in-process and over a process pool)
+
+Each student's standard plan load is validated. For the sampled students
+the batch results must match validate_schedule message for message; the
+script exits with status 1 if they differ.
+
+Usage:
+    python -m benchmarks.batch_validation [--students 10000] [--sample 500] [--workers 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from batch_validation import validate_cohort
+from database import Database
+from models import RegistrationSystem
+from schedule_conflicts import mask_to_bytes, meeting_mask
+
+SEMESTER = "Fall 2025"
+PROGRAMS = ["Computer", "Communications", "Power", "Biomedical"]
+DAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday"]
+
+
+def hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def seed(db: Database, students: int, rng: random.Random):
+    """Insert the catalog and cohort in one transaction"""
+    def work(cursor):
+        courses = []
+        for level in range(1, 5):
+            for number in range(30):
+                code = f"ECE{level}{number:02d}"
+                cursor.execute("""
+                    INSERT INTO courses (course_code, name, credits, lecture_hours, lab_hours, max_capacity)
+                    VALUES (?, ?, ?, 3, 0, ?)
+                """, (code, f"Course {code}", rng.choice([2, 3, 3, 4]), rng.choice([40, 400, 4000])))
+                courses.append((cursor.lastrowid, level))
+
+        for course_id, level in courses:
+            lower = [other for other, other_level in courses if other_level < level]
+            for prereq_id in rng.sample(lower, min(len(lower), rng.randint(0, 2))):
+                cursor.execute("""
+                    INSERT INTO prerequisites (course_id, prerequisite_course_id) VALUES (?, ?)
+                """, (course_id, prereq_id))
+
+            for _ in range(rng.randint(1, 2)):
+                day = rng.choice(DAYS)
+                start = rng.randrange(8 * 60, 18 * 60, 60)
+                end = start + 50
+                cursor.execute("""
+                    INSERT INTO course_schedules
+                        (course_id, day, start_time, end_time, room, is_lab, semester_year, slot_mask)
+                    VALUES (?, ?, ?, ?, 'R1', 0, ?, ?)
+                """, (course_id, day, hhmm(start), hhmm(end), SEMESTER,
+                      mask_to_bytes(meeting_mask(day, hhmm(start), hhmm(end)))))
+
+        for program in PROGRAMS:
+            for level in range(1, 5):
+                own = [course_id for course_id, course_level in courses if course_level == level]
+                for semester in (1, 2):
+                    for course_id in rng.sample(own, 5):
+                        cursor.execute("""
+                            INSERT OR IGNORE INTO program_plans (program, level, semester, course_id)
+                            VALUES (?, ?, ?, ?)
+                        """, (program, level, semester, course_id))
+
+        for i in range(students):
+            level = rng.randint(1, 4)
+            cursor.execute("""
+                INSERT INTO students (student_id, name, email, program, level) VALUES (?, ?, ?, ?, ?)
+            """, (f"S{i:06d}", f"Student {i}", f"s{i}@ece.edu", rng.choice(PROGRAMS), level))
+            student_id = cursor.lastrowid
+            lower = [course_id for course_id, course_level in courses if course_level < level]
+            cursor.executemany("""
+                INSERT INTO transcripts (student_id, course_id, grade, semester_year, passed)
+                VALUES (?, ?, ?, 'Spring 2025', ?)
+            """, [(student_id, course_id, "B", rng.random() < 0.97)
+                  for course_id in lower])
+            for course_id, _ in rng.sample(courses, 2):
+                cursor.execute("""
+                    INSERT OR IGNORE INTO registrations (student_id, course_id, semester_year)
+                    VALUES (?, ?, ?)
+                """, (student_id, course_id, SEMESTER))
+
+    db.run_in_transaction(work)
+
+
+def per_student(db: Database, sample):
+    """Validate each sampled student's plan load with validate_schedule"""
+    system = RegistrationSystem(db)
+    plans = {}
+    results = {}
+    for row in sample:
+        key = (row['program'], row['level'])
+        if key not in plans:
+            plans[key] = db.get_program_plan_courses(*key, 1)
+        student = system.get_student_info(row['id'])
+        results[row['id']] = system.validate_schedule(student, plans[key], SEMESTER)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-student vs. batch schedule validation")
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--sample", type=int, default=500,
+                        help="Students validated one at a time (timing is extrapolated)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "batch.db"))
+        print(f"Seeding {args.students} students...")
+        seed(db, args.students, rng)
+        students = db.get_all_students()
+        sample = rng.sample(students, min(args.sample, len(students)))
+
+        start = time.perf_counter()
+        expected = per_student(db, sample)
+        loop_time = (time.perf_counter() - start) * len(students) / len(sample)
+        print(f"validate_schedule per student: {loop_time:8.2f} s for the cohort "
+              f"(extrapolated from {len(sample)})")
+
+        start = time.perf_counter()
+        reports = validate_cohort(db, SEMESTER, source="plan", workers=1)
+        batch_time = time.perf_counter() - start
+        print(f"validate_cohort, in-process:   {batch_time:8.2f} s ({loop_time / batch_time:.0f}x)")
+
+        start = time.perf_counter()
+        pooled = validate_cohort(db, SEMESTER, source="plan", workers=args.workers)
+        pool_time = time.perf_counter() - start
+        print(f"validate_cohort, {args.workers} workers:   {pool_time:8.2f} s "
+              f"({loop_time / pool_time:.0f}x)")
+        db.close()
+
+    by_id = {report['id']: (report['valid'], report['errors']) for report in reports}
+    mismatches = [student_id for student_id, result in expected.items()
+                  if by_id.get(student_id) != result]
+    invalid = sum(not report['valid'] for report in reports)
+    print(f"{len(reports)} students validated, {invalid} with errors")
+    if pooled != reports:
+        print("FAIL: pooled and in-process reports differ")
+        sys.exit(1)
+    if mismatches:
+        print(f"FAIL: {len(mismatches)} sampled students differ from validate_schedule")
+        sys.exit(1)
+    print(f"OK: batch results match validate_schedule for all {len(expected)} sampled students")
+
+
+if __name__ == "__main__":
+    main()
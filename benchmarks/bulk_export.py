@@ -0,0 +1,125 @@
+"""
+Bulk export benchmark
+
+Seeds a semester of registrations and a transcript history, then exports
+registrations, rosters and transcripts in every format, first for a single
+course and then in full, reporting throughput and file size. The process's
+peak RSS after the full exports must be no higher than after the
+single-course ones, give or take a few MB: memory may not grow with the
+row count. SQLite's page cache and memory map are kept small for the
+exports so they do not mask Python's usage. Every columnar export is read
+back and compared with the JSONL export of the same data.
+
+Usage:
+    python -m benchmarks.bulk_export [--students 50000] [--per-student 10]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from bulk_export import EXPORT_FORMATS, export, read_columnar
+from database import Database
+
+SEMESTER = "Fall 2025"
+PROGRAMS = ["Computer", "Communications", "Power", "Biomedical"]
+STATUSES = ["Pending", "Pending", "Approved", "Dropped"]
+COURSES = 100
+
+
+def seed(path: str, students: int, per_student: int, seed_value: int):
+    """Create the database with courses, students, registrations and transcripts"""
+    db = Database(path, profile='bulk-load')
+    rng = random.Random(seed_value)
+
+    def work(cursor):
+        cursor.executemany("""
+            INSERT INTO courses (course_code, name, credits, lecture_hours, lab_hours, max_capacity)
+            VALUES (?, ?, 3, 3, 0, 10000)
+        """, [(f"ECE{i:03d}", f"Course {i}") for i in range(COURSES)])
+        cursor.executemany("""
+            INSERT INTO students (student_id, name, email, program, level) VALUES (?, ?, ?, ?, ?)
+        """, [(f"S{i:07d}", f"Student {i}", f"s{i}@example.com", rng.choice(PROGRAMS),
+               rng.randint(1, 4)) for i in range(students)])
+        for table, extra in (("registrations", "status"), ("transcripts", "grade")):
+            cursor.executemany(f"""
+                INSERT INTO {table} (student_id, course_id, semester_year, {extra}) VALUES (?, ?, ?, ?)
+            """, ((student_id, course_id, SEMESTER if table == "registrations" else "Spring 2025",
+                   rng.choice(STATUSES) if table == "registrations" else rng.choice("ABCDF"))
+                  for student_id in range(1, students + 1)
+                  for course_id in rng.sample(range(1, COURSES + 1), per_student)))
+    db.run_in_transaction(work)
+    db.close()
+
+
+def measure(db: Database, kind: str, fmt: str, path: str, **filters):
+    """(rows, seconds, bytes written) of one export"""
+    start = time.perf_counter()
+    with open(path, "w", newline="", encoding="utf-8") as out:
+        count = export(db, kind, out, fmt, **filters)
+    return count, time.perf_counter() - start, os.path.getsize(path)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming export throughput and memory")
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--per-student", type=int, default=10, help="Registrations and transcript rows per student")
+    parser.add_argument("--seed", type=int, default=23)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Seed in a child process so its memory does not count towards our peak
+        path = os.path.join(tmp, "export.db")
+        seeder = multiprocessing.Process(target=seed, args=(path, args.students, args.per_student, args.seed))
+        seeder.start()
+        seeder.join()
+        db = Database(path, profile={'cache_size': -2000, 'mmap_size': 0})
+
+        exports = (("registrations", {'semester': SEMESTER}), ("rosters", {'semester': SEMESTER}),
+                   ("transcripts", {}))
+        print(f"{'export':28s} {'format':9s} {'rows':>8s} {'seconds':>8s} {'rows/s':>9s} {'size MB':>8s}")
+        baseline = None
+        for label, extra in (("one course", {'course': "ECE000"}), ("all", {})):
+            for kind, filters in exports:
+                for fmt in EXPORT_FORMATS:
+                    count, elapsed, size = measure(db, kind, fmt, os.path.join(tmp, f"{kind}.{fmt}"),
+                                                   **filters, **extra)
+                    print(f"{kind + ' (' + label + ')':28s} {fmt:9s} {count:8d} {elapsed:8.2f} "
+                          f"{count / elapsed if elapsed else 0:9,.0f} {size / 1e6:8.1f}")
+            if baseline is None:
+                baseline = peak_rss_mb()
+        peak = peak_rss_mb()
+
+        # Columnar must read back as exactly the JSONL rows (after the
+        # memory reading: this comparison is not streaming)
+        for kind, _ in exports:
+            with open(os.path.join(tmp, f"{kind}.jsonl")) as jsonl, \
+                    open(os.path.join(tmp, f"{kind}.columnar")) as columnar:
+                if [json.loads(line) for line in jsonl] != list(read_columnar(columnar)):
+                    failures.append(f"{kind}: columnar rows differ from JSONL")
+        db.close()
+
+    print(f"\nPeak RSS after single-course exports {baseline:.0f} MB, after full exports {peak:.0f} MB")
+    if peak > baseline + 16:
+        failures.append(f"peak memory grew by {peak - baseline:.0f} MB with the row count")
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: exports stream in constant memory, columnar output round-trips")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Bulk import benchmark
+
+Writes registrar-style dumps (courses and program plans as CSV, students
+as CSV, transcripts as JSONL) with a sprinkling of bad rows, imports them
+with BulkImporter and checks that every good row landed and every bad row
+was rejected. For comparison it times the row-at-a-time path that
+load_sample_data.py uses (add_student / add_to_transcript, a connection
+and a commit per row) on a sample.
+
+Usage:
+    python -m benchmarks.bulk_import [--students 50000] [--transcripts-per-student 20]
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bulk_import import BulkImporter, PROGRAMS
+from database import Database
+
+COURSES = 400
+BAD_EVERY = 5000  # One bad row per this many rows
+SEMESTERS = ["Fall 2022", "Spring 2023", "Fall 2023", "Spring 2024", "Fall 2024", "Spring 2025"]
+GRADES = ["A", "A-", "B+", "B", "B-", "C+", "C", "D", "F"]
+
+
+def write_files(tmp: str, students: int, per_student: int, rng: random.Random):
+    """Write the dumps; returns (paths, expected bad rows per kind)"""
+    paths = {kind: os.path.join(tmp, name) for kind, name in (
+        ('courses', "courses.csv"), ('program_plans', "plans.csv"),
+        ('students', "students.csv"), ('transcripts', "transcripts.jsonl"))}
+    bad = {kind: 0 for kind in paths}
+
+    with open(paths['courses'], 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['course_code', 'name', 'credits', 'lecture_hours', 'lab_hours', 'max_capacity'])
+        for i in range(COURSES):
+            writer.writerow([f"ECE{i:03d}", f"Course {i}", rng.choice([2, 3, 4]), 3, 0, 60])
+        writer.writerow(["ECE000", "Duplicate code", 3, 3, 0, 60])
+        bad['courses'] += 1
+
+    with open(paths['program_plans'], 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['program', 'level', 'semester', 'course_code', 'is_elective'])
+        for program in PROGRAMS:
+            for level in range(1, 5):
+                for semester in (1, 2):
+                    for i in rng.sample(range(COURSES), 6):
+                        writer.writerow([program, level, semester, f"ECE{i:03d}", "false"])
+        writer.writerow(["Computer", 5, 1, "ECE001", "false"])
+        bad['program_plans'] += 1
+
+    with open(paths['students'], 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['student_id', 'name', 'email', 'program', 'level'])
+        for i in range(students):
+            if i and i % BAD_EVERY == 0:
+                writer.writerow([f"X{i}", "Bad Program", f"x{i}@example.com", "Chemistry", 2])
+                bad['students'] += 1
+            writer.writerow([f"S{i:07d}", f"Student {i}", f"s{i}@example.com", rng.choice(PROGRAMS),
+                             rng.randint(1, 4)])
+
+    with open(paths['transcripts'], 'w') as handle:
+        rows = 0
+        for i in range(students):
+            for course in rng.sample(range(COURSES), per_student):
+                rows += 1
+                if rows % BAD_EVERY == 0:
+                    handle.write(json.dumps({'student_id': f"S{i:07d}", 'course_code': "NOPE999",
+                                             'semester_year': "Fall 2024"}) + "\n")
+                    bad['transcripts'] += 1
+                grade = rng.choice(GRADES)
+                handle.write(json.dumps({'student_id': f"S{i:07d}", 'course_code': f"ECE{course:03d}",
+                                         'grade': grade, 'semester_year': rng.choice(SEMESTERS),
+                                         'passed': grade != "F"}) + "\n")
+    return paths, bad
+
+
+def row_at_a_time(tmp: str, sample: int, rng: random.Random) -> float:
+    """Rows per second of add_student + add_to_transcript, as load_sample_data does"""
+    db = Database(os.path.join(tmp, "per_row.db"))
+    for i in range(10):
+        db.add_course(f"ECE{i:03d}", f"Course {i}", 3, 3, 0, 60)
+    start = time.perf_counter()
+    for i in range(sample // 2):
+        db.add_student(f"S{i:07d}", f"Student {i}", f"s{i}@example.com", rng.choice(PROGRAMS), 1)
+        student = db.get_student_by_student_id(f"S{i:07d}")
+        db.add_to_transcript(student['id'], rng.randint(1, 10), "B", "Fall 2024", True)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return sample / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import throughput and reject handling")
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--transcripts-per-student", type=int, default=20)
+    parser.add_argument("--sample", type=int, default=2000, help="Rows for the row-at-a-time comparison")
+    parser.add_argument("--seed", type=int, default=22)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = random.Random(args.seed)
+        paths, bad = write_files(tmp, args.students, args.transcripts_per_student, rng)
+        db = Database(os.path.join(tmp, "bulk.db"), profile='bulk-load')
+        importer = BulkImporter(db)
+
+        total_rows = total_time = 0
+        for kind in ('courses', 'program_plans', 'students', 'transcripts'):
+            stats = importer.import_file(kind, paths[kind], rejects_path=os.path.join(tmp, f"{kind}.rejects.csv"))
+            total_rows += stats['read']
+            total_time += stats['seconds']
+            print(f"{kind:14s} {stats['imported']:9d} imported, {stats['rejected']:4d} rejected "
+                  f"in {stats['seconds']:6.2f} s ({stats['rows_per_second']:9,.0f} rows/s)")
+            if stats['rejected'] != bad[kind]:
+                failures.append(f"{kind}: {stats['rejected']} rejected, expected {bad[kind]}")
+            with open(os.path.join(tmp, f"{kind}.rejects.csv")) as handle:
+                if sum(1 for _ in handle) - 1 != bad[kind]:
+                    failures.append(f"{kind}: reject file does not list every rejected row")
+
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            counts = {table: cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                      for table in ('courses', 'program_plans', 'students', 'transcripts')}
+        expected = {'courses': COURSES, 'program_plans': len(PROGRAMS) * 4 * 2 * 6,
+                    'students': args.students, 'transcripts': args.students * args.transcripts_per_student}
+        for table, count in expected.items():
+            # Plans sample courses per semester, so a (program, level, semester, course) never repeats
+            if counts[table] != count:
+                failures.append(f"{table}: {counts[table]} rows, expected {count}")
+        db.close()
+
+        bulk_rate = total_rows / total_time
+        per_row_rate = row_at_a_time(tmp, args.sample, rng)
+        print(f"\nBulk import:     {total_rows} rows in {total_time:.2f} s ({bulk_rate:,.0f} rows/s)")
+        print(f"Row at a time:   {per_row_rate:,.0f} rows/s on a {args.sample}-row sample "
+              f"(bulk import {bulk_rate / per_row_rate:.0f}x faster)")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: every good row imported, every bad row rejected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Catalog cache benchmark
+
+Seeds a catalog with program plans and schedules, then replays what a
+busy registration period does to it: students refreshing their available
+courses and validating selections. The same workload runs against the
+Database directly and through CatalogCache, and the results must match.
+
+Afterwards it checks invalidation: a write through the Database must show
+up on the next read, and a write from another process (a separate sqlite3
+connection) once the catalog_version check interval has passed. Exits with
+status 1 if any result is stale or differs.
+
+Usage:
+    python -m benchmarks.catalog_cache [--lookups 20000] [--courses 300]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from catalog_cache import CatalogCache
+from database import Database
+from schedule_conflicts import WEEK_DAYS, mask_to_bytes, meeting_mask
+
+SEMESTER = "Fall 2025"
+PROGRAMS = ["Computer", "Communications", "Power", "Biomedical"]
+
+
+def seed(db: Database, courses: int, rng: random.Random):
+    """Insert courses, prerequisites, schedules and plans in one transaction"""
+    def work(cursor):
+        cursor.executemany("""
+            INSERT INTO courses (course_code, name, credits, lecture_hours, lab_hours, max_capacity)
+            VALUES (?, ?, ?, 3, 0, 60)
+        """, [(f"ECE{i:03d}", f"Course {i}", rng.choice([2, 3, 4])) for i in range(courses)])
+        course_ids = list(range(1, courses + 1))
+        cursor.executemany("""
+            INSERT OR IGNORE INTO prerequisites (course_id, prerequisite_course_id) VALUES (?, ?)
+        """, [(course_id, rng.randrange(1, course_id)) for course_id in course_ids[1:]
+              for _ in range(rng.randint(0, 2))])
+        meetings = [(course_id, rng.choice(WEEK_DAYS), f"{hour:02d}:00", f"{hour:02d}:50")
+                    for course_id in course_ids for hour in rng.sample(range(8, 18), 2)]
+        cursor.executemany("""
+            INSERT INTO course_schedules
+                (course_id, day, start_time, end_time, room, is_lab, semester_year, slot_mask)
+            VALUES (?, ?, ?, ?, 'R1', 0, ?, ?)
+        """, [(course_id, day, start, end, SEMESTER, mask_to_bytes(meeting_mask(day, start, end)))
+              for course_id, day, start, end in meetings])
+        cursor.executemany("""
+            INSERT OR IGNORE INTO program_plans (program, level, semester, course_id) VALUES (?, ?, ?, ?)
+        """, [(program, level, semester, course_id) for program in PROGRAMS for level in range(1, 5)
+              for semester in (1, 2) for course_id in rng.sample(course_ids, 6)])
+    db.run_in_transaction(work)
+
+
+def workload(source, lookups: int, courses: int, rng: random.Random):
+    """Plan, plan-code, schedule and mask lookups as a list of results"""
+    results = []
+    for _ in range(lookups):
+        program, level = rng.choice(PROGRAMS), rng.randint(1, 4)
+        plan = source.get_program_plan_courses(program, level, rng.randint(1, 2))
+        selected = [course['id'] for course in plan[:rng.randint(1, 6)]]
+        results.append((
+            plan,
+            source.get_program_plan_codes(program, level),
+            source.get_schedules_for_courses(selected, SEMESTER),
+            source.get_slot_masks(selected, SEMESTER),
+            source.get_course_prerequisites(rng.randint(1, courses)),
+        ))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalog reads with and without CatalogCache")
+    parser.add_argument("--lookups", type=int, default=20000, help="Simulated refresh/validate rounds")
+    parser.add_argument("--courses", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=18)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.db")
+        db = Database(path)
+        seed(db, args.courses, random.Random(args.seed))
+        cache = CatalogCache(db, check_interval=0.2)
+
+        start = time.perf_counter()
+        direct = workload(db, args.lookups, args.courses, random.Random(args.seed))
+        direct_time = time.perf_counter() - start
+        start = time.perf_counter()
+        cached = workload(cache, args.lookups, args.courses, random.Random(args.seed))
+        cache_time = time.perf_counter() - start
+        if cached != direct:
+            failures.append("cached results differ from direct queries")
+
+        stats = cache.stats()
+        print(f"Direct queries: {direct_time:6.2f} s ({direct_time / args.lookups * 1e6:6.0f} us per round)")
+        print(f"CatalogCache:   {cache_time:6.2f} s ({cache_time / args.lookups * 1e6:6.0f} us per round, "
+              f"{direct_time / cache_time:.1f}x)")
+        print(f"Hit rate {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses), "
+              f"{stats['entries']} entries")
+
+        # A write through the Database is visible on the next read
+        course_id = cache.get_program_plan_courses("Computer", 1, 1)[0]['id']
+        db.add_course_schedule(course_id, "Thursday", "19:00", "19:50", "R2", False, SEMESTER)
+        if cache.get_course_schedule(course_id, SEMESTER) != db.get_course_schedule(course_id, SEMESTER):
+            failures.append("schedule added through the Database not visible")
+
+        # A write by another process is visible once the version is rechecked
+        cache.get_program_plan_codes("Power", 2)
+        other = sqlite3.connect(path)
+        other.execute("""
+            INSERT INTO courses (course_code, name, credits, lecture_hours, lab_hours, max_capacity)
+            VALUES ('EXT999', 'Outside write', 3, 3, 0, 30)
+        """)
+        other.execute("""
+            INSERT INTO program_plans (program, level, semester, course_id)
+            SELECT 'Power', 2, 1, id FROM courses WHERE course_code = 'EXT999'
+        """)
+        other.commit()
+        other.close()
+        time.sleep(cache.check_interval)
+        if 'EXT999' not in cache.get_program_plan_codes("Power", 2)[1]:
+            failures.append("outside write not visible after the check interval")
+        print(f"Invalidations: {cache.stats()['invalidations']} (one per write)")
+        db.close()
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: cached reads match the database, writes invalidate the cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Instrumentation overhead benchmark
+
+Builds a synthetic database and runs a validation workload (load the
+student, their plan courses, validate_schedule) three ways: with the
+Database methods unwrapped, with instrumentation compiled in but
+switched off, and with it recording. Runs are interleaved and the best of
+each is reported.
+
+Wall-clock differences of a few percent drown in run-to-run noise, so
+the off overhead is gated on an estimate instead: the measured cost of a
+timed method call and of the validate_schedule phase laps with recording
+off, times how often the workload makes them, over the workload's time.
+
+The recording run's snapshot is then checked: every series kind is
+present, the validate_schedule phases were counted once per validation,
+statements report the rows they returned, and the JSON and Prometheus
+dumps are well formed. A run with recording off must leave no series.
+
+Usage:
+    python -m benchmarks.instrumentation [--students 3000] [--runs 7] [--budget-percent 1]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import timeit
+
+from database import Database
+from instrumentation import RECORDER, timed
+from models import RegistrationSystem
+from synthetic_data import SyntheticDataGenerator
+
+SEMESTER = "Fall 2025"
+PHASES = ["load.prereqs", "load.capacity", "load.conflicts", "load.plan",
+          "credits", "prereqs", "capacity", "conflicts", "plan"]
+_PROMETHEUS_LINE = re.compile(r'^[a-z_]+\{kind="[^"]+",name="(?:[^"\\]|\\.)*"(?:,quantile="[0-9.]+")?\} \S+$')
+
+
+def workload(db: Database, system: RegistrationSystem, students) -> float:
+    """Seconds to validate every student's plan load once"""
+    plans = {}
+    start = time.perf_counter()
+    for row in students:
+        key = (row['program'], row['level'])
+        if key not in plans:
+            plans[key] = db.get_program_plan_courses(*key, 1)
+        student = system.get_student_info(row['id'])
+        system.validate_schedule(student, plans[key], SEMESTER)
+    return time.perf_counter() - start
+
+
+def off_costs() -> tuple:
+    """Seconds added, with recording off, per timed call and per validation's phase laps"""
+    def plain():
+        return None
+    wrapped = timed('method', 'noop')(plain)
+
+    def laps():
+        phases = RECORDER.phases('validate_schedule')
+        for phase in PHASES:
+            phases.lap(phase)
+
+    def best(function, number=200000):
+        return min(timeit.repeat(function, number=number, repeat=5)) / number
+    return best(wrapped) - best(plain), best(laps)
+
+
+def set_wrapped(wrapped: bool, originals: dict):
+    """Swap the timed Database methods for the plain functions, or back"""
+    for name, (plain, timed) in originals.items():
+        setattr(Database, name, timed if wrapped else plain)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instrumentation overhead and snapshot checks")
+    parser.add_argument("--students", type=int, default=3000)
+    parser.add_argument("--runs", type=int, default=7, help="Interleaved runs per mode (best is kept)")
+    parser.add_argument("--budget-percent", type=float, default=1.0,
+                        help="Largest acceptable estimated overhead with recording off")
+    parser.add_argument("--seed", type=int, default=25)
+    args = parser.parse_args()
+
+    originals = {name: (value.__wrapped__, value) for name, value in vars(Database).items()
+                 if hasattr(value, '__wrapped__')}
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "instrumented.db")
+        db = Database(path, profile='bulk-load')
+        SyntheticDataGenerator(args.students, args.seed, SEMESTER).write(db)
+        db.close()
+
+        db = Database(path)
+        system = RegistrationSystem(db)
+        students = db.get_all_students()
+        workload(db, system, students)  # Warm the catalog cache and page cache
+
+        best = {'plain': float('inf'), 'off': float('inf'), 'on': float('inf')}
+        for _ in range(args.runs):
+            for mode in best:
+                set_wrapped(mode != 'plain', originals)
+                RECORDER.reset()
+                if mode == 'on':
+                    RECORDER.enable()
+                try:
+                    best[mode] = min(best[mode], workload(db, system, students))
+                finally:
+                    RECORDER.disable()
+                    set_wrapped(True, originals)
+                if mode == 'off' and RECORDER.snapshot()['series']:
+                    failures.append("series were recorded while recording was off")
+
+        for mode, seconds in best.items():
+            print(f"{mode:6s} {seconds:7.3f} s  {len(students) / seconds:8,.0f} validations/s  "
+                  f"({(seconds / best['plain'] - 1) * 100:+5.1f}%)")
+        # Snapshot of one recorded run, plus a connection opened and closed
+        RECORDER.reset()
+        RECORDER.enable()
+        workload(db, system, students)
+        Database(path).close()
+        RECORDER.disable()
+        db.close()
+        snapshot = RECORDER.snapshot()
+        series = {(entry['kind'], entry['name']): entry for entry in snapshot['series']}
+
+        per_call, per_validation = off_costs()
+        method_calls = sum(entry['calls'] for entry in snapshot['series'] if entry['kind'] == 'method')
+        overhead = (method_calls * per_call + len(students) * per_validation) / best['plain'] * 100
+        print(f"\nRecording off: {per_call * 1e9:.0f} ns per timed call x {method_calls}, "
+              f"{per_validation * 1e9:.0f} ns of phase laps x {len(students)} validations "
+              f"= {overhead:.2f}% of the workload")
+        if overhead > args.budget_percent:
+            failures.append(f"recording off costs {overhead:.2f}% (budget {args.budget_percent:g}%)")
+
+        for kind, name in [('connection', 'connect'), ('connection', 'close'), ('connection', 'checkout'),
+                           ('method', 'Database.get_student_by_id')]:
+            if (kind, name) not in series:
+                failures.append(f"no {kind} series {name}")
+        for phase in PHASES:
+            entry = series.get(('phase', f"validate_schedule.{phase}"))
+            if entry is None or entry['calls'] != len(students):
+                failures.append(f"phase {phase}: {entry and entry['calls']} calls, expected {len(students)}")
+        statements = [entry for entry in snapshot['series'] if entry['kind'] == 'sql']
+        if not any(entry['rows'] for entry in statements):
+            failures.append("no statement reported rows returned")
+        for entry in snapshot['series']:
+            if not entry['p50_seconds'] <= entry['p99_seconds'] <= entry['max_seconds'] or \
+                    entry['total_seconds'] > entry['calls'] * entry['max_seconds'] + 1e-9:
+                failures.append(f"inconsistent latencies for {entry['kind']} {entry['name'][:40]}")
+                break
+
+        json_path, prometheus_path = os.path.join(tmp, "metrics.json"), os.path.join(tmp, "metrics.prom")
+        RECORDER.write_json(json_path)
+        RECORDER.write_prometheus(prometheus_path)
+        with open(json_path) as handle:
+            if len(json.load(handle)['series']) != len(snapshot['series']):
+                failures.append("JSON dump does not hold every series")
+        with open(prometheus_path) as handle:
+            bad = [line for line in handle.read().splitlines()
+                   if not line.startswith("#") and not _PROMETHEUS_LINE.match(line)]
+        if bad:
+            failures.append(f"{len(bad)} malformed Prometheus lines, e.g. {bad[0][:80]}")
+
+        print(f"\n{len(snapshot['series'])} series recorded ({len(statements)} statements); slowest:")
+        for entry in snapshot['series'][:8]:
+            print(f"  {entry['kind']:10s} {entry['calls']:7d} calls {entry['total_seconds']:7.3f} s "
+                  f"p50 {entry['p50_seconds'] * 1e6:7.0f} us p99 {entry['p99_seconds'] * 1e6:7.0f} us  "
+                  f"{entry['name'][:60]}")
+        RECORDER.reset()
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print(f"OK: recording off costs about {overhead:.2f}%, snapshots complete and well formed")
+
+
+if __name__ == "__main__":
+    main()
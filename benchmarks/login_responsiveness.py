@@ -0,0 +1,102 @@
+"""
+Login responsiveness check
+
+Starts 20 logins through AuthService at once while a 10 ms QTimer ticks on
+the Qt event loop, and reports the longest gap between ticks. With bcrypt
+running on the worker pool the loop keeps ticking; the synchronous path
+would freeze it for the sum of all password checks.
+Exits with status 1 if the longest stall exceeds --max-stall-ms, or if a
+result is delivered off the GUI thread.
+
+Usage:
+    python -m benchmarks.login_responsiveness [--logins 20] [--max-stall-ms 100]
+
+Without a display, Qt's offscreen platform is used.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication, QObject, QTimer
+
+from auth_service import AuthService
+from database import Database
+from qt_async import watch_future
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event loop stalls during concurrent logins")
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--max-stall-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    gui_thread = threading.get_ident()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "logins.db"))
+        auth = AuthService(db)
+
+        # Accounts are created through the same worker pool
+        print(f"Creating {args.logins} accounts...")
+        creations = [
+            auth.register_student(f"L{i:04d}", f"Login {i}", f"l{i}@ece.edu",
+                                  "Computer", 1, f"user{i}", "password")
+            for i in range(args.logins)
+        ]
+        for future in creations:
+            assert future.result()[0]
+
+        owner = QObject()
+        results = []
+        off_thread = []
+        last_tick = [time.perf_counter()]
+        max_gap = [0.0]
+
+        def tick():
+            now = time.perf_counter()
+            max_gap[0] = max(max_gap[0], now - last_tick[0])
+            last_tick[0] = now
+
+        def on_result(user_info):
+            if threading.get_ident() != gui_thread:
+                off_thread.append(user_info)
+            results.append(user_info)
+            if len(results) == args.logins:
+                app.quit()
+
+        heartbeat = QTimer()
+        heartbeat.setInterval(10)
+        heartbeat.timeout.connect(tick)
+        heartbeat.start()
+
+        start = time.perf_counter()
+        last_tick[0] = start
+        for i in range(args.logins):
+            watch_future(auth.authenticate(f"user{i}", "password"), owner, on_result)
+        app.exec()
+        elapsed = time.perf_counter() - start
+
+        auth.shutdown()
+        db.close()
+
+    stall_ms = max_gap[0] * 1000
+    print(f"{args.logins} logins completed in {elapsed:.2f}s "
+          f"({auth.max_workers} worker threads)")
+    print(f"Successful logins: {sum(1 for r in results if r)}")
+    print(f"Longest event loop stall: {stall_ms:.1f} ms (limit {args.max_stall_ms:.0f} ms)")
+    if off_thread:
+        print(f"{len(off_thread)} results were delivered off the GUI thread")
+    if stall_ms > args.max_stall_ms or off_thread:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Connection pool benchmark
+
+Compares read queries per second using the old connect/close-per-call
+pattern against the pooled Database methods, single-threaded and with
+several threads sharing one Database.
+
+Usage:
+    python -m benchmarks.pool_throughput [--seconds 2] [--threads 4]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from database import Database
+
+SEMESTER = "Fall 2025"
+
+
+def seed(db: Database, course_count: int = 50):
+    """Populate a fresh database with courses and schedules"""
+    for i in range(course_count):
+        db.add_course(f"BEN{i:03d}", f"Benchmark Course {i}", 3, 3, 0, 40)
+    for course in db.get_all_courses():
+        db.add_course_schedule(course['id'], "Sunday", "08:00", "10:00", "A101", False, SEMESTER)
+        db.add_course_schedule(course['id'], "Tuesday", "10:00", "12:00", "Lab1", True, SEMESTER)
+    return [course['id'] for course in db.get_all_courses()]
+
+
+def legacy_queries(db_name: str):
+    """The pre-pool access pattern: open, configure and close per query"""
+
+    def run(sql, params):
+        conn = sqlite3.connect(db_name)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        conn.close()
+        return rows
+
+    def get_course_by_id(course_id):
+        return run("SELECT * FROM courses WHERE id = ?", (course_id,))
+
+    def get_course_schedule(course_id, semester_year):
+        return run("SELECT * FROM course_schedules WHERE course_id = ? AND semester_year = ?",
+                   (course_id, semester_year))
+
+    def get_course_enrollment_count(course_id, semester_year):
+        return run("""
+            SELECT COUNT(*) as count FROM registrations
+            WHERE course_id = ? AND semester_year = ? AND status != 'Dropped'
+        """, (course_id, semester_year))
+
+    return get_course_by_id, get_course_schedule, get_course_enrollment_count
+
+
+def pooled_queries(db: Database):
+    """The pooled Database methods"""
+    return db.get_course_by_id, db.get_course_schedule, db.get_course_enrollment_count
+
+
+def measure(queries, course_ids, seconds: float, threads: int) -> float:
+    """Run the query mix from several threads and return queries per second"""
+    by_id, schedule, enrollment = queries
+    deadline = time.perf_counter() + seconds
+    counts = [0] * threads
+
+    def worker(index):
+        done = 0
+        while time.perf_counter() < deadline:
+            for course_id in course_ids:
+                by_id(course_id)
+                schedule(course_id, SEMESTER)
+                enrollment(course_id, SEMESTER)
+                done += 3
+        counts[index] = done
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0, help="Duration of each run")
+    parser.add_argument("--threads", type=int, default=4, help="Threads for the concurrent run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "bench.db")
+        db = Database(db_name, pool_size=args.threads)
+        course_ids = seed(db)
+
+        print(f"{'pattern':<22}{'threads':>8}{'queries/s':>14}")
+        for threads in (1, args.threads):
+            legacy = measure(legacy_queries(db_name), course_ids, args.seconds, threads)
+            pooled = measure(pooled_queries(db), course_ids, args.seconds, threads)
+            print(f"{'connect/close':<22}{threads:>8}{legacy:>14,.0f}")
+            print(f"{'pooled':<22}{threads:>8}{pooled:>14,.0f}")
+            print(f"{'speedup':<22}{threads:>8}{pooled / legacy:>13.1f}x")
+
+        print(f"\nPool stats: {db.pool.stats()}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
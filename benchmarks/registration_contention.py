@@ -0,0 +1,119 @@
+"""
+Registration contention check
+
+Many processes register different students for the same two nearly-full
+courses at once. Afterwards no course may be over max_capacity, and every
+student must hold either both courses or neither (all-or-nothing).
+Exits with status 1 if either invariant is violated.
+
+Usage:
+    python -m benchmarks.registration_contention [--processes 8] [--students 200]
+    python -m benchmarks.registration_contention --legacy   # old per-course path
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from database import Database
+
+SEMESTER = "Fall 2025"
+
+
+def setup(db_name: str, students: int, capacity: int):
+    """Create two contested courses and the competing students"""
+    db = Database(db_name)
+    db.add_course("HOT100", "Contested Course A", 3, 3, 0, capacity)
+    db.add_course("HOT200", "Contested Course B", 3, 3, 0, capacity)
+    for i in range(students):
+        db.add_student(f"C{i:05d}", f"Contender {i}", f"c{i}@ece.edu", "Computer", 2)
+    course_ids = [c['id'] for c in db.get_all_courses()]
+    student_ids = [s['id'] for s in db.get_all_students()]
+    db.close()
+    return course_ids, student_ids
+
+
+def register_worker(db_name, course_ids, student_ids, legacy, start_at):
+    """Register each student for both courses, as one client process"""
+    db = Database(db_name, pool_size=1)
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    for student_id in student_ids:
+        if legacy:
+            # Check-then-insert without a shared transaction, one commit per course
+            for course_id in course_ids:
+                course = db.get_course_by_id(course_id)
+                if db.get_course_enrollment_count(course_id, SEMESTER) < course['max_capacity']:
+                    db.register_student_for_course(student_id, course_id, SEMESTER)
+        else:
+            db.register_student_for_courses(student_id, course_ids, SEMESTER)
+    db.close()
+
+
+def check(db_name: str, course_ids, student_ids):
+    """Return (over-capacity courses, students holding only part of the set)"""
+    db = Database(db_name)
+    overfilled = []
+    for course_id in course_ids:
+        course = db.get_course_by_id(course_id)
+        enrolled = db.get_course_enrollment_count(course_id, SEMESTER)
+        print(f"  {course['course_code']}: {enrolled}/{course['max_capacity']}")
+        if enrolled > course['max_capacity']:
+            overfilled.append(course['course_code'])
+
+    partial = []
+    for student_id in student_ids:
+        held = len(db.get_student_registrations(student_id, SEMESTER))
+        if held not in (0, len(course_ids)):
+            partial.append(student_id)
+    db.close()
+    return overfilled, partial
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent registration invariant check")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--capacity", type=int, default=50)
+    parser.add_argument("--legacy", action="store_true",
+                        help="Use the old per-course register_student_for_course path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "contention.db")
+        course_ids, student_ids = setup(db_name, args.students, args.capacity)
+
+        # Interleave students so every process competes for the last seats
+        shares = [student_ids[i::args.processes] for i in range(args.processes)]
+        start_at = time.time() + 1.0
+        procs = [
+            multiprocessing.Process(
+                target=register_worker,
+                args=(db_name, course_ids, share, args.legacy, start_at)
+            )
+            for share in shares
+        ]
+        started = time.perf_counter()
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - started - 1.0
+
+        mode = "legacy per-course" if args.legacy else "atomic bulk"
+        print(f"{mode} registration, {args.processes} processes, "
+              f"{args.students} students, {elapsed:.2f}s")
+        overfilled, partial = check(db_name, course_ids, student_ids)
+
+    print(f"Over-capacity courses: {len(overfilled)}")
+    print(f"Students with partial registrations: {len(partial)}")
+    if overfilled or partial:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
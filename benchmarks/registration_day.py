@@ -0,0 +1,417 @@
+"""
+Registration day load harness
+
+Seeds one database file with a scaled-up version of the sample data
+(programs, four levels, plans, schedules, prerequisites, transcripts and
+login accounts), then lets simulated students loose on it at once. Each
+student logs in, loads their plan courses, validates the plan load,
+registers for it, and with --drop-rate probability drops one course again.
+
+Clients run as:
+    threads    one shared Database and RegistrationSystem, like the server
+    processes  one Database per process on the same file, like desktop clients
+    http       HTTP clients against `python -m server` on the same file
+
+Reports p50/p95/p99 latency per step, throughput, time spent waiting for
+the write lock and capacity violations. --output saves the results as JSON
+and --compare prints the change against a saved run, so runs on different
+commits can be compared. Exits with status 1 if any course ends up over
+capacity or the enrollment counters disagree with the registrations.
+
+Usage:
+    python -m benchmarks.registration_day [--students 400] [--courses 80] [--clients 8]
+        [--mode threads|processes|http] [--output run.json] [--compare previous.json]
+"""
+
+import argparse
+import http.client
+import json
+import math
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from database import Database
+from models import RegistrationSystem
+from schedule_conflicts import WEEK_DAYS, mask_to_bytes, meeting_mask
+
+SEMESTER = "Fall 2025"
+PROGRAMS = ["Computer", "Communications", "Power", "Biomedical"]
+PASSWORD = "registration-day"
+PLAN_SIZE = 5         # Courses per (program, level) plan; 5 x 3 credits is a valid load
+MEETINGS = 2          # Weekly meetings per course
+HOURS = range(8, 18)  # Meeting start hours
+STEPS = ["login", "courses", "validate", "register", "drop"]
+
+
+def seed(db: Database, students: int, courses: int, capacity_ratio: float,
+         bcrypt_rounds: int, rng: random.Random):
+    """
+    Insert the catalog, plans, cohort and accounts in one transaction
+
+    Each level has its own course pool. Within a level every meeting gets a
+    distinct slot, so any plan is conflict-free; plans of different programs
+    share courses, which is where students compete for seats.
+    """
+    per_level = courses // 4
+    if per_level < PLAN_SIZE or per_level * MEETINGS > len(WEEK_DAYS) * len(HOURS):
+        raise SystemExit(f"--courses must be between {4 * PLAN_SIZE} and "
+                         f"{4 * len(WEEK_DAYS) * len(HOURS) // MEETINGS}")
+    # Expected demand per course, scaled down so popular courses fill up
+    capacity = max(1, math.ceil(students / 4 * PLAN_SIZE / per_level * capacity_ratio))
+    password_hash = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(bcrypt_rounds))
+
+    def work(cursor):
+        pools = {}
+        for level in range(1, 5):
+            slots = rng.sample([(day, hour) for day in WEEK_DAYS for hour in HOURS], per_level * MEETINGS)
+            pools[level] = []
+            for number in range(per_level):
+                code = f"ECE{level}{number:02d}"
+                cursor.execute("""
+                    INSERT INTO courses (course_code, name, credits, lecture_hours, lab_hours, max_capacity)
+                    VALUES (?, ?, 3, 3, 0, ?)
+                """, (code, f"Course {code}", capacity))
+                course_id = cursor.lastrowid
+                pools[level].append(course_id)
+                for day, hour in slots[number * MEETINGS:(number + 1) * MEETINGS]:
+                    start, end = f"{hour:02d}:00", f"{hour:02d}:50"
+                    cursor.execute("""
+                        INSERT INTO course_schedules
+                            (course_id, day, start_time, end_time, room, is_lab, semester_year, slot_mask)
+                        VALUES (?, ?, ?, ?, 'R1', 0, ?, ?)
+                    """, (course_id, day, start, end, SEMESTER, mask_to_bytes(meeting_mask(day, start, end))))
+                if level > 1:
+                    cursor.execute("""
+                        INSERT INTO prerequisites (course_id, prerequisite_course_id) VALUES (?, ?)
+                    """, (course_id, rng.choice(pools[level - 1])))
+
+        # Plan courses go in both plan semesters, as validate_schedule expects
+        cursor.executemany("""
+            INSERT INTO program_plans (program, level, semester, course_id) VALUES (?, ?, ?, ?)
+        """, [(program, level, semester, course_id)
+              for program in PROGRAMS for level in range(1, 5)
+              for course_id in rng.sample(pools[level], PLAN_SIZE) for semester in (1, 2)])
+
+        for i in range(students):
+            level = rng.randint(1, 4)
+            cursor.execute("""
+                INSERT INTO students (student_id, name, email, program, level) VALUES (?, ?, ?, ?, ?)
+            """, (f"S{i:06d}", f"Student {i}", f"s{i}@ece.edu", rng.choice(PROGRAMS), level))
+            student_id = cursor.lastrowid
+            cursor.executemany("""
+                INSERT INTO transcripts (student_id, course_id, grade, semester_year, passed)
+                VALUES (?, ?, 'B', 'Spring 2025', 1)
+            """, [(student_id, course_id) for lower in range(1, level) for course_id in pools[lower]])
+            cursor.execute("""
+                INSERT INTO users (username, password_hash, role, student_id) VALUES (?, ?, 'Student', ?)
+            """, (f"S{i:06d}", password_hash, student_id))
+
+    db.run_in_transaction(work)
+    return capacity
+
+
+# Simulated students
+def direct_session(system: RegistrationSystem, username: str, drop: bool):
+    """One student's visit through RegistrationSystem; returns [(step, seconds, ok)]"""
+    timings = []
+
+    def timed(step, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append((step, time.perf_counter() - start, result))
+        return result
+
+    user_info = timed("login", system.db.authenticate_user, username, PASSWORD)
+    if user_info is None:
+        return [("login", timings[0][1], False)]
+
+    def load(student_id):
+        student = system.get_student_info(student_id)
+        student.id = student_id
+        courses = system.get_available_courses(student.program, student.level, 1)
+        return student, courses
+
+    student, courses = timed("courses", load, user_info['student_id'])
+    timed("validate", system.validate_schedule, student, courses, SEMESTER)
+    registered, _ = timed("register", system.register_student, student, courses, SEMESTER)
+    if drop and registered:
+        registration_id = system.db.get_student_registrations(student.id, SEMESTER)[0]['registration_id']
+        timed("drop", system.db.drop_registration, registration_id)
+    return [(step, seconds, _ok(result)) for step, seconds, result in timings]
+
+
+def _ok(result) -> bool:
+    if isinstance(result, tuple):
+        return bool(result[0])
+    return result is not None
+
+
+def run_threads(db_name: str, sessions, clients: int):
+    db = Database(db_name, pool_size=clients)
+    system = RegistrationSystem(db)
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(lambda session: direct_session(system, *session), sessions))
+    stats = db.transaction_stats()
+    db.close()
+    return [timing for result in results for timing in result], stats
+
+
+def _process_worker(db_name: str, sessions, start_at: float):
+    db = Database(db_name, pool_size=1)
+    system = RegistrationSystem(db)
+    while time.time() < start_at:
+        time.sleep(0.001)
+    timings = [timing for session in sessions for timing in direct_session(system, *session)]
+    stats = db.transaction_stats()
+    db.close()
+    return timings, stats
+
+
+def run_processes(db_name: str, sessions, clients: int):
+    chunks = [sessions[i::clients] for i in range(clients)]
+    start_at = time.time() + 1.0  # Let every process import and open its pool first
+    with multiprocessing.Pool(clients) as pool:
+        results = pool.starmap(_process_worker, [(db_name, chunk, start_at) for chunk in chunks])
+    timings = [timing for chunk_timings, _ in results for timing in chunk_timings]
+    stats = {}
+    for _, chunk_stats in results:
+        for key, value in chunk_stats.items():
+            if key.startswith('max_'):
+                stats[key] = max(stats.get(key, 0), value)
+            else:
+                stats[key] = stats.get(key, 0) + value
+    return timings, stats
+
+
+class _Client:
+    """Keep-alive JSON client for one thread"""
+
+    def __init__(self, port: int):
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        self.token = None
+
+    def call(self, method: str, path: str, body=None):
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        self.conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+        response = self.conn.getresponse()
+        return response.status, json.loads(response.read())
+
+
+def http_session(client: _Client, username: str, drop: bool):
+    """One student's visit through the HTTP API; returns [(step, seconds, ok)]"""
+    timings = []
+
+    def timed(step, method, path, body=None):
+        start = time.perf_counter()
+        status, payload = client.call(method, path, body)
+        timings.append((step, time.perf_counter() - start, status == 200 and payload.get('valid', True)))
+        return status, payload
+
+    status, payload = timed("login", "POST", "/login", {'username': username, 'password': PASSWORD})
+    if status != 200:
+        return timings
+    client.token = payload['token']
+    _, payload = timed("courses", "GET", "/courses")
+    plan = list(dict.fromkeys(course['id'] for course in payload.get('courses', [])))
+    timed("validate", "POST", "/validate", {'course_ids': plan})
+    status, _ = timed("register", "POST", "/register", {'course_ids': plan})
+    if drop and status == 200:
+        _, payload = client.call("GET", "/timetable")
+        timed("drop", "POST", "/drop", {'registration_id': payload['registrations'][0]['registration_id']})
+    client.call("POST", "/logout")
+    client.token = None
+    return timings
+
+
+def run_http(db_name: str, sessions, clients: int):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = subprocess.Popen([sys.executable, "-m", "server", "--db", db_name, "--port", str(port)],
+                              stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                _Client(port).call("GET", "/health")
+                break
+            except OSError:
+                if time.time() > deadline or server.poll() is not None:
+                    raise RuntimeError("Server did not start")
+                time.sleep(0.1)
+
+        local = threading.local()
+
+        def visit(session):
+            if not hasattr(local, 'client'):
+                local.client = _Client(port)
+            return http_session(local.client, *session)
+
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            results = list(pool.map(visit, sessions))
+        _, health = _Client(port).call("GET", "/health")
+    finally:
+        server.terminate()
+        server.wait()
+    return [timing for result in results for timing in result], health['transactions']
+
+
+# Reporting
+def percentile(ordered, fraction: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def summarize(timings):
+    """Latency percentiles and failure counts per step"""
+    steps = {}
+    for step in STEPS:
+        values = sorted(seconds for name, seconds, _ in timings if name == step)
+        if not values:
+            continue
+        steps[step] = {
+            'count': len(values),
+            'failed': sum(1 for name, _, ok in timings if name == step and not ok),
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p95_ms': percentile(values, 0.95) * 1000,
+            'p99_ms': percentile(values, 0.99) * 1000,
+            'max_ms': values[-1] * 1000,
+        }
+    return steps
+
+
+def violations(db_name: str):
+    """Courses over capacity and enrollment counter mismatches"""
+    db = Database(db_name)
+    with db.connection() as conn:
+        over = [dict(row) for row in conn.execute("""
+            SELECT c.course_code, c.max_capacity, COUNT(*) AS enrolled FROM registrations r
+            JOIN courses c ON c.id = r.course_id
+            WHERE r.semester_year = ? AND r.status != 'Dropped'
+            GROUP BY r.course_id HAVING COUNT(*) > c.max_capacity
+        """, (SEMESTER,))]
+    mismatches = db.reconcile_enrollment_counts(repair=False)
+    db.close()
+    return over, mismatches
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_comparison(results, previous_path: str):
+    with open(previous_path) as f:
+        previous = json.load(f)
+    print(f"\nCompared with {previous_path} (commit {previous.get('commit', '?')}, "
+          f"mode {previous['parameters']['mode']}):")
+    for step, stats in results['steps'].items():
+        before = previous['steps'].get(step)
+        if before:
+            print(f"  {step:9s} p50 {_delta(before['p50_ms'], stats['p50_ms'])}  "
+                  f"p95 {_delta(before['p95_ms'], stats['p95_ms'])}  "
+                  f"p99 {_delta(before['p99_ms'], stats['p99_ms'])}")
+    print(f"  throughput {_delta(previous['sessions_per_second'], results['sessions_per_second'])} "
+          f"sessions/s")
+
+
+def _delta(before: float, after: float) -> str:
+    change = (after - before) / before * 100 if before else 0.0
+    return f"{before:8.1f} -> {after:8.1f} ({change:+.0f}%)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated registration day against one database file")
+    parser.add_argument("--students", type=int, default=400)
+    parser.add_argument("--courses", type=int, default=80)
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent simulated students")
+    parser.add_argument("--mode", choices=["threads", "processes", "http"], default="threads")
+    parser.add_argument("--drop-rate", type=float, default=0.2,
+                        help="Share of registered students who drop a course again")
+    parser.add_argument("--capacity-ratio", type=float, default=0.9,
+                        help="Seats per course relative to its expected demand")
+    parser.add_argument("--bcrypt-rounds", type=int, default=6,
+                        help="bcrypt cost of the seeded passwords (accounts made by the app use 12)")
+    parser.add_argument("--profile", default=None, help="Storage profile of the seeded database")
+    parser.add_argument("--seed", type=int, default=20)
+    parser.add_argument("--output", help="Save the results as JSON")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare with")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "registration_day.db")
+        db = Database(db_name, profile=args.profile)
+        capacity = seed(db, args.students, args.courses, args.capacity_ratio, args.bcrypt_rounds, rng)
+        db.close()
+        print(f"Seeded {args.students} students, {args.courses} courses ({capacity} seats each); "
+              f"{args.clients} {args.mode} clients")
+
+        sessions = [(f"S{i:06d}", rng.random() < args.drop_rate) for i in range(args.students)]
+        runner = {'threads': run_threads, 'processes': run_processes, 'http': run_http}[args.mode]
+        start = time.perf_counter()
+        timings, transactions = runner(db_name, sessions, args.clients)
+        elapsed = time.perf_counter() - start
+        over, mismatches = violations(db_name)
+
+    steps = summarize(timings)
+    results = {
+        'commit': git_commit(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'parameters': vars(args),
+        'seconds': elapsed,
+        'sessions_per_second': args.students / elapsed,
+        'operations_per_second': len(timings) / elapsed,
+        'steps': steps,
+        'transactions': transactions,
+        'capacity_violations': over,
+        'counter_mismatches': len(mismatches),
+    }
+
+    print(f"\n{'step':9s} {'count':>6s} {'failed':>6s} "
+          f"{'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'max ms':>8s}")
+    for step, stats in steps.items():
+        print(f"{step:9s} {stats['count']:6d} {stats['failed']:6d} {stats['p50_ms']:8.1f} "
+              f"{stats['p95_ms']:8.1f} {stats['p99_ms']:8.1f} {stats['max_ms']:8.1f}")
+    print(f"\n{args.students} sessions in {elapsed:.2f} s: {results['sessions_per_second']:.1f} sessions/s, "
+          f"{results['operations_per_second']:.1f} operations/s")
+    print(f"Write lock: {transactions['transactions']} transactions, "
+          f"{transactions['lock_wait_seconds'] * 1000:.0f} ms waiting in total "
+          f"(max {transactions['max_lock_wait_seconds'] * 1000:.1f} ms), "
+          f"{transactions['busy_retries']} busy retries")
+    print(f"Capacity violations: {len(over)}, counter mismatches: {len(mismatches)}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+    if args.compare:
+        print_comparison(results, args.compare)
+
+    if over or mismatches:
+        for row in over[:20]:
+            print(f"FAIL: {row['course_code']} has {row['enrolled']}/{row['max_capacity']} students")
+        if mismatches:
+            print(f"FAIL: {len(mismatches)} enrollment counters disagree with registrations")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
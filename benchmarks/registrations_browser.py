@@ -0,0 +1,199 @@
+"""
+Admin registrations browser benchmark
+
+Seeds a semester with a large number of registrations (500k by default)
+and times what the admin Registrations tab asks of the database: the first
+page and a page deep into the list for every sort order and filter, and
+the per-course summary. For comparison it also times the deep page read
+with LIMIT/OFFSET, which is what a naive pager would do.
+
+Every page walk is checked against the same rows sorted in Python, and
+the summary against counts made in Python. Exits with status 1 if any
+result differs or a page read exceeds the budget.
+
+Usage:
+    python -m benchmarks.registrations_browser [--students 50000] [--per-student 10]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from database import REGISTRATION_SORTS, Database
+
+SEMESTER = "Fall 2025"
+PROGRAMS = ["Computer", "Communications", "Power", "Biomedical"]
+STATUSES = ["Pending", "Pending", "Approved", "Dropped"]
+PAGE_SIZE = 200
+
+# Python equivalents of the REGISTRATION_SORTS keys
+SORT_KEYS = {
+    'course': lambda row: (row['course_code'], row['id']),
+    'student': lambda row: (row['student_id'], row['id']),
+    'program': lambda row: (row['program'], row['student_id'], row['id']),
+    'status': lambda row: (row['status'], row['id']),
+}
+
+
+def seed(db: Database, students: int, per_student: int, courses: int, rng: random.Random):
+    """Insert courses, students and their registrations in one transaction"""
+    def work(cursor):
+        cursor.executemany("""
+            INSERT INTO courses (course_code, name, credits, lecture_hours, lab_hours, max_capacity)
+            VALUES (?, ?, 3, 3, 0, ?)
+        """, [(f"ECE{i:03d}", f"Course {i}", students * per_student // courses) for i in range(courses)])
+        cursor.executemany("""
+            INSERT INTO students (student_id, name, email, program, level) VALUES (?, ?, ?, ?, ?)
+        """, [(f"S{i:07d}", f"Student {i}", f"s{i}@example.com", rng.choice(PROGRAMS),
+               rng.randint(1, 4)) for i in range(students)])
+        cursor.executemany("""
+            INSERT INTO registrations (student_id, course_id, semester_year, status) VALUES (?, ?, ?, ?)
+        """, ((student_id, course_id, SEMESTER, rng.choice(STATUSES))
+              for student_id in range(1, students + 1)
+              for course_id in rng.sample(range(1, courses + 1), per_student)))
+    db.run_in_transaction(work)
+
+
+def reference_rows(db: Database):
+    """Every registration of the semester with the columns the sorts use"""
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT r.id, r.course_id, r.status, s.student_id, s.program, c.course_code
+            FROM registrations r
+            JOIN students s ON s.id = r.student_id
+            JOIN courses c ON c.id = r.course_id
+            WHERE r.semester_year = ?
+        """, (SEMESTER,))
+        return [dict(row) for row in cursor.fetchall()]
+
+
+def offset_page(db: Database, sort: str, offset: int) -> float:
+    """Seconds to read a page at `offset` with LIMIT/OFFSET"""
+    _, keys = REGISTRATION_SORTS[sort]
+    start = time.perf_counter()
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT r.id, r.status, s.student_id, s.name, c.course_code, c.name
+            FROM registrations r
+            JOIN students s ON s.id = r.student_id
+            JOIN courses c ON c.id = r.course_id
+            WHERE r.semester_year = ?
+            ORDER BY {', '.join(keys)}, r.id
+            LIMIT ? OFFSET ?
+        """, (SEMESTER, PAGE_SIZE, offset))
+        cursor.fetchall()
+    return time.perf_counter() - start
+
+
+def timed_page(db: Database, after, sort: str, filters) -> tuple:
+    """(seconds, rows) of one get_registrations_page call"""
+    start = time.perf_counter()
+    rows = db.get_registrations_page(SEMESTER, after, PAGE_SIZE, sort=sort, **filters)
+    return time.perf_counter() - start, rows
+
+
+def walk(db: Database, sort: str, filters) -> list:
+    """IDs of every page of a filtered listing, in page order"""
+    ids, after = [], None
+    while True:
+        rows = db.get_registrations_page(SEMESTER, after, PAGE_SIZE, sort=sort, **filters)
+        ids += [row['id'] for row in rows]
+        if len(rows) < PAGE_SIZE:
+            return ids
+        after = rows[-1]['sort_key']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Admin registrations paging and summary on a large semester")
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--per-student", type=int, default=10, help="Registrations per student")
+    parser.add_argument("--courses", type=int, default=100)
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Slowest acceptable page read")
+    parser.add_argument("--seed", type=int, default=21)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "registrations.db"), profile='bulk-load')
+        rng = random.Random(args.seed)
+        start = time.perf_counter()
+        seed(db, args.students, args.per_student, args.courses, rng)
+        print(f"Seeded {args.students * args.per_student} registrations in {time.perf_counter() - start:.1f} s")
+
+        rows = reference_rows(db)
+        course_id = rng.randint(1, args.courses)
+        filter_sets = {
+            'none': {},
+            'course': {'course_id': course_id},
+            'program': {'program': "Power"},
+            'status': {'status': "Dropped"},
+            'all': {'course_id': course_id, 'program': "Power", 'status': "Dropped"},
+        }
+        column = {'course_id': 'course_id', 'program': 'program', 'status': 'status'}
+
+        print(f"\n{'sort':8s} {'filter':8s} {'rows':>8s} {'first page':>11s} {'deep page':>10s}")
+        slowest = 0.0
+        for sort, sort_key in SORT_KEYS.items():
+            for name, filters in filter_sets.items():
+                expected = sorted((row for row in rows
+                                   if all(row[column[key]] == value for key, value in filters.items())),
+                                  key=sort_key)
+                first_time, first = timed_page(db, None, sort, filters)
+                deep_time = 0.0
+                if len(expected) > PAGE_SIZE:
+                    # A page 80% of the way down, resumed from the key before it
+                    position = len(expected) * 4 // 5
+                    deep_time, deep = timed_page(db, sort_key(expected[position - 1]), sort, filters)
+                    if [row['id'] for row in deep] != [row['id'] for row in
+                                                        expected[position:position + PAGE_SIZE]]:
+                        failures.append(f"deep page differs ({sort}, {name})")
+                if [row['id'] for row in first] != [row['id'] for row in expected[:PAGE_SIZE]]:
+                    failures.append(f"first page differs ({sort}, {name})")
+                slowest = max(slowest, first_time, deep_time)
+                print(f"{sort:8s} {name:8s} {len(expected):8d} {first_time * 1000:8.1f} ms "
+                      f"{deep_time * 1000:7.1f} ms")
+
+            # The complete walk of one filtered listing must be exactly the reference
+            filters = filter_sets['status']
+            expected = sorted((row for row in rows if row['status'] == filters['status']), key=sort_key)
+            if walk(db, sort, filters) != [row['id'] for row in expected]:
+                failures.append(f"full walk differs ({sort}, status)")
+
+        deep_offset = len(rows) * 4 // 5
+        print(f"\nLIMIT/OFFSET page at row {deep_offset}: "
+              + ", ".join(f"{sort} {offset_page(db, sort, deep_offset) * 1000:.0f} ms" for sort in SORT_KEYS))
+
+        start = time.perf_counter()
+        summary = db.get_registration_summary(SEMESTER)
+        summary_time = time.perf_counter() - start
+        counts = Counter((row['course_id'], row['status']) for row in rows)
+        for course in summary:
+            active = counts[course['id'], 'Pending'] + counts[course['id'], 'Approved']
+            if (course['active'], course['pending'], course['approved'], course['dropped']) != (
+                    active, counts[course['id'], 'Pending'], counts[course['id'], 'Approved'],
+                    counts[course['id'], 'Dropped']):
+                failures.append(f"summary counts differ for {course['course_code']}")
+            if course['percent_full'] != round(100.0 * active / max(course['max_capacity'], 1), 1):
+                failures.append(f"summary percent full differs for {course['course_code']}")
+        if len(summary) != len({row['course_id'] for row in rows}):
+            failures.append("summary course count differs")
+        print(f"Course summary: {summary_time * 1000:.0f} ms for {len(summary)} courses")
+        db.close()
+
+    if slowest * 1000 > args.budget_ms:
+        failures.append(f"slowest page took {slowest * 1000:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print(f"OK: every page matches the reference order, slowest page {slowest * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Schedule conflict detection benchmark
+
+Compares the old all-pairs conflict check (re-parsing HH:MM strings for
+every pair) with the sort-and-sweep engine behind
+RegistrationSystem._check_schedule_conflicts, on synthetic data:
+
+- a cohort: many students, each validating a 5-8 course selection
+  from a catalog of courses with 2-4 weekly meetings
+- single large selections of n meetings, as when a whole cohort's
+  meetings are checked together, with a small fraction overlapping
+
+Both implementations must produce identical messages.
+
+It also times the "hide conflicting courses" filter: checking every
+catalog course against each student's timetable by sweeping the meetings
+versus one AND of precomputed weekly slot bitmasks.
+
+Usage:
+    python -m benchmarks.schedule_conflicts [--students 5000] [--sizes 500 2000 5000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from database import Database
+from models import RegistrationSystem
+from schedule_conflicts import find_overlaps, meeting_interval, schedule_mask
+
+DAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday"]
+
+
+def pairwise_conflicts(system: RegistrationSystem, courses, schedules_by_course):
+    """The previous O(n^2) implementation, kept here as the baseline"""
+    errors = []
+    schedules = [{'course': course, 'schedule': sched}
+                 for course in courses for sched in schedules_by_course.get(course['id'], [])]
+    for i, entry1 in enumerate(schedules):
+        for entry2 in schedules[i+1:]:
+            if system._schedules_overlap(entry1['schedule'], entry2['schedule']):
+                errors.append(
+                    f"Schedule conflict: {entry1['course']['course_code']} "
+                    f"{'Lab' if entry1['schedule']['is_lab'] else 'Lecture'} "
+                    f"overlaps with {entry2['course']['course_code']} "
+                    f"{'Lab' if entry2['schedule']['is_lab'] else 'Lecture'} "
+                    f"on {entry1['schedule']['day']}"
+                )
+    return errors
+
+
+def hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def catalog(rng: random.Random, count: int):
+    """Courses with 2-4 meetings each between 08:00 and 18:00"""
+    courses, schedules = [], {}
+    for course_id in range(1, count + 1):
+        courses.append({'id': course_id, 'course_code': f"C{course_id:04d}"})
+        meetings = []
+        for _ in range(rng.randint(2, 4)):
+            start = rng.randrange(8 * 60, 16 * 60, 30)
+            length = rng.choice([50, 80, 110, 170])
+            meetings.append({'day': rng.choice(DAYS), 'start_time': hhmm(start),
+                             'end_time': hhmm(start + length), 'is_lab': length == 170})
+        schedules[course_id] = meetings
+    return courses, schedules
+
+
+def large_selection(rng: random.Random, meetings: int, overlap_rate: float = 0.02):
+    """One course per meeting; mostly back-to-back 5-minute slots, a few overlapping"""
+    courses, schedules = [], {}
+    slots = [(day, minute) for day in DAYS for minute in range(0, 24 * 60, 5)]
+    rng.shuffle(slots)
+    for course_id in range(1, meetings + 1):
+        day, start = slots[course_id % len(slots)]
+        length = 5
+        if rng.random() < overlap_rate:
+            length = 15  # Runs into the next two slots
+        courses.append({'id': course_id, 'course_code': f"X{course_id:05d}"})
+        schedules[course_id] = [{'day': day, 'start_time': hhmm(start),
+                                 'end_time': hhmm(start + length), 'is_lab': False}]
+    return courses, schedules
+
+
+def compare(system: RegistrationSystem, selections, schedules_by_course):
+    """Time both implementations over the selections and check they agree"""
+    start = time.perf_counter()
+    old = [pairwise_conflicts(system, courses, schedules_by_course) for courses in selections]
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = [system._check_schedule_conflicts(courses, "", schedules_by_course) for courses in selections]
+    new_time = time.perf_counter() - start
+
+    if old != new:
+        raise AssertionError("Sweep and pairwise conflict messages differ")
+    return old_time, new_time, sum(len(errors) for errors in new)
+
+
+def clashes(busy, candidate) -> bool:
+    """Whether any candidate meeting overlaps a busy one"""
+    return any(i < len(busy) <= j for i, j in find_overlaps(busy + candidate))
+
+
+def compare_filters(courses, schedules, timetables):
+    """Time listing the non-conflicting catalog courses for each timetable"""
+    intervals = {course['id']: [meeting_interval(sched) for sched in schedules[course['id']]]
+                 for course in courses}
+    start = time.perf_counter()
+    swept = []
+    for timetable in timetables:
+        busy = [interval for course in timetable for interval in intervals[course['id']]]
+        swept.append([course['id'] for course in courses
+                      if not clashes(busy, intervals[course['id']])])
+    sweep_time = time.perf_counter() - start
+
+    # Masks are computed once per course, as stored in course_schedules.slot_mask
+    masks = {course['id']: schedule_mask(schedules[course['id']]) for course in courses}
+    start = time.perf_counter()
+    masked = []
+    for timetable in timetables:
+        busy = 0
+        for course in timetable:
+            busy |= masks[course['id']]
+        masked.append([course['id'] for course in courses if not masks[course['id']] & busy])
+    mask_time = time.perf_counter() - start
+
+    if swept != masked:
+        raise AssertionError("Bitmask and sweep filters disagree")
+    return sweep_time, mask_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pairwise vs. sweep schedule conflict checks")
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--courses", type=int, default=300)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 5000])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "conflicts.db"))
+        system = RegistrationSystem(db)
+
+        courses, schedules = catalog(rng, args.courses)
+        selections = [rng.sample(courses, rng.randint(5, 8)) for _ in range(args.students)]
+        old_time, new_time, conflicts = compare(system, selections, schedules)
+        print(f"Cohort of {args.students} selections ({conflicts} conflicts): "
+              f"pairwise {old_time * 1000:8.1f} ms, sweep {new_time * 1000:8.1f} ms "
+              f"({old_time / new_time:.1f}x)")
+
+        timetables = selections[:200]
+        sweep_time, mask_time = compare_filters(courses, schedules, timetables)
+        print(f"Filter {args.courses} courses for {len(timetables)} timetables: "
+              f"sweep {sweep_time * 1000:8.1f} ms, bitmask {mask_time * 1000:8.1f} ms "
+              f"({sweep_time / mask_time:.1f}x)")
+
+        for size in args.sizes:
+            courses, schedules = large_selection(rng, size)
+            old_time, new_time, conflicts = compare(system, [courses], schedules)
+            print(f"One selection of {size:5d} meetings ({conflicts} conflicts): "
+                  f"pairwise {old_time * 1000:8.1f} ms, sweep {new_time * 1000:8.1f} ms "
+                  f"({old_time / new_time:.1f}x)")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
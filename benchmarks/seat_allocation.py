@@ -0,0 +1,144 @@
+"""
+Seat allocation benchmark
+
+Seeds a database with a cohort whose ranked seat requests oversubscribe
+many courses, then times seat_allocation.allocate_seats over all of them
+in one run, followed by a series of drops that promote students from the
+waitlists. Exits with status 1 if any course ends up over capacity, any
+student over MAX_CREDITS, any request is left pending, or the enrollment
+counters disagree with the registrations.
+
+Usage:
+    python -m benchmarks.seat_allocation [--students 20000] [--requests 6] [--drops 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from database import Database, MAX_CREDITS
+from seat_allocation import allocate_seats
+
+SEMESTER = "Fall 2025"
+PROGRAMS = ["Computer", "Communications", "Power", "Biomedical"]
+
+
+def seed(db: Database, students: int, courses: int, requests: int, rng: random.Random):
+    """Insert courses, plans, students and their ranked requests in one transaction"""
+    def work(cursor):
+        cursor.executemany("""
+            INSERT INTO courses (course_code, name, credits, lecture_hours, lab_hours, max_capacity)
+            VALUES (?, ?, ?, 3, 0, ?)
+        """, [(f"ECE{i:03d}", f"Course {i}", rng.choice([3, 3, 4]), rng.choice([30, 60, 120]))
+              for i in range(courses)])
+        course_ids = list(range(1, courses + 1))
+        cursor.executemany("""
+            INSERT INTO program_plans (program, level, semester, course_id) VALUES (?, ?, 1, ?)
+        """, [(program, level, course_id) for program in PROGRAMS for level in range(1, 5)
+              for course_id in rng.sample(course_ids, 8)])
+        cursor.executemany("""
+            INSERT INTO students (student_id, name, email, program, level) VALUES (?, ?, ?, ?, ?)
+        """, [(f"S{i:06d}", f"Student {i}", f"s{i}@ece.edu", rng.choice(PROGRAMS), rng.randint(1, 4))
+              for i in range(students)])
+
+        # Popular courses draw most of the requests
+        weights = [1 / (rank + 1) for rank in range(courses)]
+        rows = []
+        for student_id in range(1, students + 1):
+            chosen = []
+            while len(chosen) < requests:
+                course_id = rng.choices(course_ids, weights)[0]
+                if course_id not in chosen:
+                    chosen.append(course_id)
+            rows.extend((student_id, course_id, SEMESTER, preference)
+                        for preference, course_id in enumerate(chosen))
+        cursor.executemany("""
+            INSERT INTO registration_requests (student_id, course_id, semester_year, preference)
+            VALUES (?, ?, ?, ?)
+        """, rows)
+        return len(rows)
+
+    return db.run_in_transaction(work)
+
+
+def violations(db: Database):
+    """Capacity, credit cap, pending request and counter inconsistencies"""
+    problems = []
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT c.course_code, c.max_capacity, e.active_count FROM course_enrollment e
+            JOIN courses c ON c.id = e.course_id
+            WHERE e.semester_year = ? AND e.active_count > c.max_capacity
+        """, (SEMESTER,))
+        problems += [f"{row['course_code']} over capacity ({row['active_count']}/{row['max_capacity']})"
+                     for row in cursor.fetchall()]
+        cursor.execute("""
+            SELECT r.student_id, SUM(c.credits) AS credits FROM registrations r
+            JOIN courses c ON c.id = r.course_id
+            WHERE r.semester_year = ? AND r.status != 'Dropped'
+            GROUP BY r.student_id HAVING SUM(c.credits) > ?
+        """, (SEMESTER, MAX_CREDITS))
+        problems += [f"Student {row['student_id']} has {row['credits']} credits" for row in cursor.fetchall()]
+        cursor.execute("""
+            SELECT COUNT(*) AS count FROM registration_requests
+            WHERE semester_year = ? AND status = 'Pending'
+        """, (SEMESTER,))
+        pending = cursor.fetchone()['count']
+        if pending:
+            problems.append(f"{pending} requests still pending")
+    problems += [f"Enrollment counter mismatch: {row}" for row in db.reconcile_enrollment_counts(repair=False)]
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch seat allocation and waitlist promotion")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--courses", type=int, default=150)
+    parser.add_argument("--requests", type=int, default=6, help="Ranked requests per student")
+    parser.add_argument("--drops", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "allocation.db"))
+        count = seed(db, args.students, args.courses, args.requests, rng)
+        print(f"Seeded {args.students} students with {count} requests for {args.courses} courses")
+
+        summary = allocate_seats(db, SEMESTER, seed=args.seed)
+        print(f"Allocation: {summary['seconds']:.2f} s "
+              f"({summary['requests'] / summary['seconds']:,.0f} requests/s): "
+              f"{summary['allocated']} allocated, {summary['waitlisted']} waitlisted, "
+              f"{summary['rejected']} rejected")
+
+        with db.connection() as conn:
+            registration_ids = [row['id'] for row in conn.execute(
+                "SELECT id FROM registrations WHERE semester_year = ?", (SEMESTER,))]
+            waitlisted = conn.execute("SELECT COUNT(*) FROM waitlist").fetchone()[0]
+
+        drops = rng.sample(registration_ids, min(args.drops, len(registration_ids)))
+        start = time.perf_counter()
+        for registration_id in drops:
+            db.drop_registration(registration_id)
+        drop_time = time.perf_counter() - start
+        with db.connection() as conn:
+            promoted = waitlisted - conn.execute("SELECT COUNT(*) FROM waitlist").fetchone()[0]
+        print(f"{len(drops)} drops: {drop_time / len(drops) * 1000:.2f} ms each, "
+              f"{promoted} students promoted from waitlists")
+
+        problems = violations(db)
+        db.close()
+
+    if problems:
+        for problem in problems[:20]:
+            print(f"FAIL: {problem}")
+        sys.exit(1)
+    print("OK: no course over capacity, no student over the credit cap, counters consistent")
+
+
+if __name__ == "__main__":
+    main()
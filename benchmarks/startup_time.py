@@ -0,0 +1,89 @@
+"""
+Startup time measurement
+
+Launches `python main.py` repeatedly and measures the wall time until the
+login dialog is on screen. Each run goes through probe(), which patches
+LoginDialog.showEvent to report the first show and close the dialog, then
+runs main.py as __main__; the application itself has no probe code. The first run uses a fresh database (schema
+creation and admin seeding); the rest reuse it, which is what users see
+on every normal start.
+
+Usage:
+    python -m benchmarks.startup_time [--runs 5]
+
+Without a display, Qt's offscreen platform is used.
+"""
+
+import argparse
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(ROOT, "main.py")
+
+# Printed by the probe once the login dialog is on screen
+SHOWN_MARKER = "login-dialog-shown"
+PROBE_COMMAND = "from benchmarks.startup_time import probe; probe()"
+
+
+def probe():
+    """Run main.py with a login dialog that reports its first show and closes"""
+    from PyQt6.QtCore import QTimer
+    from login_dialog import LoginDialog
+
+    show_event = LoginDialog.showEvent
+
+    def report_shown(self, event):
+        show_event(self, event)
+        print(SHOWN_MARKER, flush=True)
+        QTimer.singleShot(0, self.reject)
+
+    LoginDialog.showEvent = report_shown
+    sys.argv = [MAIN_SCRIPT]
+    runpy.run_path(MAIN_SCRIPT, run_name="__main__")
+
+
+def time_startup(workdir: str) -> float:
+    """Seconds from process launch until the login dialog is shown"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    if not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", PROBE_COMMAND], cwd=workdir, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    for line in proc.stdout:
+        if line.strip() == SHOWN_MARKER:
+            elapsed = time.perf_counter() - start
+            break
+    else:
+        proc.wait()
+        raise RuntimeError(f"main.py exited ({proc.returncode}) before the login dialog showed")
+    proc.wait()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time from `python main.py` to login dialog")
+    parser.add_argument("--runs", type=int, default=5, help="Warm runs after the first start")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first = time_startup(tmp)
+        warm = [time_startup(tmp) for _ in range(args.runs)]
+
+    print(f"First start (new database): {first * 1000:8.1f} ms")
+    print(f"Warm start median:          {statistics.median(warm) * 1000:8.1f} ms")
+    print(f"Warm start min / max:       {min(warm) * 1000:8.1f} / {max(warm) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
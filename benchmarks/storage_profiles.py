@@ -0,0 +1,111 @@
+"""
+Storage profile benchmark
+
+Runs reader threads (validation-style lookups) alongside writer threads
+(atomic registrations) against a fresh database for each storage profile
+and reports read and write throughput plus writes that gave up on the lock.
+
+Usage:
+    python -m benchmarks.storage_profiles [--seconds 3] [--readers 4] [--writers 2]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from database import Database, STORAGE_PROFILES
+
+SEMESTER = "Fall 2025"
+
+
+def seed(db: Database, courses: int, students: int):
+    """Bulk-insert courses, schedules and students for the run"""
+    def insert_all(cursor):
+        cursor.executemany("""
+            INSERT INTO courses (course_code, name, credits, lecture_hours, lab_hours, max_capacity)
+            VALUES (?, ?, 3, 3, 0, 100000)
+        """, [(f"PRF{i:03d}", f"Profile Course {i}") for i in range(courses)])
+        cursor.execute("""
+            INSERT INTO course_schedules (course_id, day, start_time, end_time, room, is_lab, semester_year)
+            SELECT id, 'Sunday', '08:00', '10:00', 'A101', 0, ? FROM courses
+        """, (SEMESTER,))
+        cursor.executemany("""
+            INSERT INTO students (student_id, name, email, program, level)
+            VALUES (?, ?, ?, 'Computer', 2)
+        """, [(f"P{i:06d}", f"Student {i}", f"p{i}@ece.edu") for i in range(students)])
+
+    db.run_in_transaction(insert_all)
+    course_ids = [c['id'] for c in db.get_all_courses()]
+    student_ids = [s['id'] for s in db.get_all_students()]
+    return course_ids, student_ids
+
+
+def run_profile(profile: str, seconds: float, readers: int, writers: int) -> dict:
+    """Benchmark one profile on its own database file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, f"{profile}.db"), pool_size=readers + writers,
+                      profile=profile)
+        course_ids, student_ids = seed(db, courses=50, students=20000)
+
+        deadline = time.perf_counter() + seconds
+        reads = [0] * readers
+        writes = [0] * writers
+        failed = [0] * writers
+
+        def reader(index):
+            window = course_ids[index % 10:][:6]
+            while time.perf_counter() < deadline:
+                db.get_enrollment_counts(window, SEMESTER)
+                db.get_schedules_for_courses(window, SEMESTER)
+                reads[index] += 2
+
+        def writer(index):
+            for student_id in student_ids[index::writers]:
+                if time.perf_counter() >= deadline:
+                    break
+                course_id = course_ids[student_id % len(course_ids)]
+                ok, _ = db.register_student_for_courses(student_id, [course_id], SEMESTER)
+                if ok:
+                    writes[index] += 1
+                else:
+                    failed[index] += 1
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        db.close()
+
+    return {
+        'profile': profile,
+        'reads_per_sec': sum(reads) / elapsed,
+        'writes_per_sec': sum(writes) / elapsed,
+        'failed_writes': sum(failed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent throughput per storage profile")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--profiles", nargs="+", default=list(STORAGE_PROFILES),
+                        choices=list(STORAGE_PROFILES))
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per profile\n")
+    print(f"{'profile':<14}{'reads/s':>12}{'writes/s':>12}{'failed':>8}")
+    for profile in args.profiles:
+        result = run_profile(profile, args.seconds, args.readers, args.writers)
+        print(f"{result['profile']:<14}{result['reads_per_sec']:>12,.0f}"
+              f"{result['writes_per_sec']:>12,.0f}{result['failed_writes']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Student search latency benchmark
+
+Seeds a database with 100k students and times Database.search_students for
+the kinds of input the admin search box sends while someone types: name
+prefixes of growing length, student ID prefixes and email fragments.
+Exits with status 1 if the p95 lookup exceeds --max-ms.
+
+Usage:
+    python -m benchmarks.student_search [--students 100000] [--limit 100] [--max-ms 10]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from database import Database
+
+FIRST_NAMES = ["Ahmed", "Fatima", "Sara", "Omar", "Layla", "Yusuf", "Mariam", "Khalid",
+               "Noor", "Hassan", "Aisha", "Ali", "Zainab", "Ibrahim", "Huda", "Tariq"]
+LAST_NAMES = ["Hassan", "Ali", "Ahmed", "Mahmoud", "Saleh", "Nasser", "Khalil", "Haddad",
+              "Mansour", "Farouk", "Aziz", "Rahman", "Qasim", "Jaber", "Salem", "Younis"]
+
+
+def seed(db: Database, count: int, rng: random.Random):
+    """Insert `count` students in one transaction"""
+    def rows():
+        for i in range(count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield (f"S{i:06d}", f"{first} {last}", f"{first.lower()}.{last.lower()}{i}@ece.edu",
+                   "Computer", i % 4 + 1)
+
+    def work(cursor):
+        cursor.executemany(
+            "INSERT INTO students (student_id, name, email, program, level) VALUES (?, ?, ?, ?, ?)",
+            rows()
+        )
+    db.run_in_transaction(work)
+
+
+def typed_queries(rng: random.Random, count: int):
+    """Queries as they are sent while typing, one per keystroke"""
+    queries = []
+    while len(queries) < count:
+        kind = rng.choice(["name", "full name", "id", "email"])
+        if kind == "name":
+            text = rng.choice(LAST_NAMES + FIRST_NAMES)
+        elif kind == "full name":
+            text = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        elif kind == "id":
+            text = f"S{rng.randrange(100000):06d}"
+        else:
+            text = f"{rng.choice(FIRST_NAMES).lower()}.{rng.choice(LAST_NAMES).lower()}"
+        # Two characters is the shortest query the search box sends
+        queries.extend(text[:n] for n in range(2, len(text) + 1))
+    return queries[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database.search_students latency")
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=100, help="Rows returned per search")
+    parser.add_argument("--max-ms", type=float, default=10.0, help="p95 latency limit")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "search.db"))
+        print(f"Seeding {args.students} students...")
+        seed(db, args.students, rng)
+        queries = typed_queries(rng, args.queries)
+
+        with db.connection():  # Keep one pooled connection checked out, as the GUI worker does
+            db.search_students("warm up", args.limit)
+            timings = []
+            for query in queries:
+                start = time.perf_counter()
+                db.search_students(query, args.limit)
+                timings.append((time.perf_counter() - start) * 1000)
+        db.close()
+
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{len(timings)} searches, up to {args.limit} rows each")
+    print(f"median {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms, "
+          f"max {timings[-1]:.2f} ms (limit {args.max_ms:.0f} ms)")
+    if p95 > args.max_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Synthetic data benchmark
+
+Generates a 100k-student database with SyntheticDataGenerator and times
+it end to end (generation plus bulk import), then checks the result:
+
+- the same seed gives identical tables (on a small database, twice)
+- every transcript row's prerequisites were passed in an earlier term
+- each program plan term of the current semester has no timetable clash
+  and its core courses fit the credit limits
+- every course the plans offer this semester has meetings
+
+Exits with status 1 if a check fails or the build exceeds the budget.
+
+Usage:
+    python -m benchmarks.synthetic_data [--students 100000] [--budget 60]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from database import Database, MAX_CREDITS, MIN_CREDITS
+from schedule_conflicts import find_overlaps, meeting_interval
+from synthetic_data import SyntheticDataGenerator
+
+SEMESTER = "Fall 2025"
+
+# Columns compared between two builds (no IDs or timestamps)
+TABLE_DUMPS = {
+    'courses': "SELECT course_code, name, credits, lab_hours, max_capacity FROM courses ORDER BY course_code",
+    'prerequisites': """
+        SELECT c.course_code, p.course_code FROM prerequisites pr
+        JOIN courses c ON c.id = pr.course_id JOIN courses p ON p.id = pr.prerequisite_course_id
+        ORDER BY 1, 2
+    """,
+    'program_plans': """
+        SELECT program, level, semester, c.course_code, is_elective FROM program_plans pp
+        JOIN courses c ON c.id = pp.course_id ORDER BY 1, 2, 3, 4
+    """,
+    'course_schedules': """
+        SELECT c.course_code, day, start_time, end_time, room, is_lab FROM course_schedules cs
+        JOIN courses c ON c.id = cs.course_id ORDER BY 1, 2, 3
+    """,
+    'students': "SELECT student_id, name, email, program, level FROM students ORDER BY student_id",
+    'transcripts': """
+        SELECT s.student_id, c.course_code, t.grade, t.semester_year, t.passed FROM transcripts t
+        JOIN students s ON s.id = t.student_id JOIN courses c ON c.id = t.course_id ORDER BY 1, 2, 4
+    """,
+}
+
+
+def build(path: str, students: int, seed: int) -> float:
+    """Seconds to generate and import a database"""
+    start = time.perf_counter()
+    db = Database(path, profile='bulk-load')
+    results = SyntheticDataGenerator(students, seed, SEMESTER).write(db)
+    db.close()
+    rejected = sum(stats['rejected'] for stats in results)
+    if rejected:
+        raise RuntimeError(f"{rejected} generated rows were rejected")
+    return time.perf_counter() - start
+
+
+def dump(path: str, table: str) -> list:
+    """Rows of one TABLE_DUMPS query"""
+    db = Database(path)
+    with db.connection() as conn:
+        rows = [tuple(row) for row in conn.execute(TABLE_DUMPS[table])]
+    db.close()
+    return rows
+
+
+def term_order(label: str) -> tuple:
+    """Sort key of a "Fall 2024" style label"""
+    season, year = label.split()
+    return int(year), 0 if season == "Spring" else 1
+
+
+def check_transcripts(db: Database) -> list:
+    """Transcript rows whose prerequisites were not passed in an earlier term"""
+    with db.connection() as conn:
+        prerequisites = defaultdict(set)
+        for course_id, prerequisite_id in conn.execute(
+                "SELECT course_id, prerequisite_course_id FROM prerequisites"):
+            prerequisites[course_id].add(prerequisite_id)
+        # Earliest term each student passed each course
+        passed_in = {}
+        rows = conn.execute("SELECT student_id, course_id, semester_year, passed FROM transcripts").fetchall()
+    for student_id, course_id, semester, passed in rows:
+        if passed:
+            key = (student_id, course_id)
+            term = term_order(semester)
+            passed_in[key] = min(passed_in.get(key, term), term)
+    bad = []
+    for student_id, course_id, semester, _ in rows:
+        term = term_order(semester)
+        for prerequisite_id in prerequisites.get(course_id, ()):
+            if passed_in.get((student_id, prerequisite_id), term) >= term:
+                bad.append((student_id, course_id, semester))
+                break
+    return bad
+
+
+def check_plans(db: Database) -> list:
+    """Clashes, credit problems and unscheduled courses in this semester's plan terms"""
+    failures = []
+    with db.connection() as conn:
+        plans = conn.execute("""
+            SELECT pp.program, pp.level, c.id, c.course_code, c.credits FROM program_plans pp
+            JOIN courses c ON c.id = pp.course_id
+            WHERE pp.semester = 1 AND pp.is_elective = 0
+        """).fetchall()
+        meetings = defaultdict(list)
+        for row in conn.execute("SELECT * FROM course_schedules WHERE semester_year = ?", (SEMESTER,)):
+            meetings[row['course_id']].append(dict(row))
+    terms = defaultdict(list)
+    for program, level, course_id, code, credits in plans:
+        terms[program, level].append((course_id, code, credits))
+        if not meetings[course_id]:
+            failures.append(f"{code} is in the {program} level {level} plan but has no meetings")
+    for (program, level), courses in terms.items():
+        intervals = [meeting_interval(meeting) for course_id, _, _ in courses for meeting in meetings[course_id]]
+        if find_overlaps(intervals):
+            failures.append(f"{program} level {level}: plan courses clash")
+        credits = sum(credits for _, _, credits in courses)
+        if not MIN_CREDITS <= credits <= MAX_CREDITS:
+            failures.append(f"{program} level {level}: {credits} core credits")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic database build time and consistency")
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--budget", type=float, default=60.0, help="Slowest acceptable build, in seconds")
+    parser.add_argument("--seed", type=int, default=24)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Same seed, same data
+        small = [os.path.join(tmp, f"small{i}.db") for i in range(2)]
+        for path in small:
+            build(path, 2000, args.seed)
+        for table in TABLE_DUMPS:
+            if dump(small[0], table) != dump(small[1], table):
+                failures.append(f"{table} differs between two builds with the same seed")
+
+        path = os.path.join(tmp, "synthetic.db")
+        elapsed = build(path, args.students, args.seed)
+        db = Database(path)
+        with db.connection() as conn:
+            counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                      for table in TABLE_DUMPS}
+        print(f"Built {args.students} students in {elapsed:.1f} s: "
+              + ", ".join(f"{count} {table}" for table, count in counts.items()))
+
+        start = time.perf_counter()
+        bad = check_transcripts(db)
+        if bad:
+            failures.append(f"{len(bad)} transcript rows lack a passed prerequisite, e.g. {bad[0]}")
+        failures += check_plans(db)
+        print(f"Checked {counts['transcripts']} transcript rows in {time.perf_counter() - start:.1f} s")
+        db.close()
+
+    if elapsed > args.budget:
+        failures.append(f"build took {elapsed:.1f} s (budget {args.budget:.0f} s)")
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: deterministic, transcripts follow the prerequisites, plan terms clash-free")
+
+
+if __name__ == "__main__":
+    main()
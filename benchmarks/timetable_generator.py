@@ -0,0 +1,124 @@
+"""
+Timetable generator benchmark
+
+Builds synthetic course catalogs (random credits and one to three meetings
+a week per course) and checks timetable_generator.generate_timetables:
+
+- on small catalogs, the top selections must match an exhaustive search
+  over every subset, score for score
+- on plan-sized and larger catalogs, the search time, node count and
+  whether it finished within the time budget are reported
+
+Exits with status 1 if any result differs from the exhaustive search or a
+returned timetable has a clash or is outside the credit range.
+
+Usage:
+    python -m benchmarks.timetable_generator [--cases 300] [--courses 20 40 80] [--budget 2.0]
+"""
+
+import argparse
+import itertools
+import random
+import sys
+
+from database import MAX_CREDITS, MIN_CREDITS
+from schedule_conflicts import WEEK_DAYS, meeting_mask
+from timetable_generator import generate_timetables, teaching_days
+
+
+def hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def catalog(size: int, rng: random.Random):
+    """Course rows and weekly slot masks for a synthetic catalog"""
+    courses = []
+    masks = {}
+    for course_id in range(1, size + 1):
+        courses.append({'id': course_id, 'credits': rng.choice([2, 3, 3, 3, 4])})
+        mask = 0
+        for _ in range(rng.randint(1, 3)):
+            start = rng.randrange(8 * 60, 17 * 60, 30)
+            mask |= meeting_mask(rng.choice(WEEK_DAYS), hhmm(start), hhmm(start + rng.choice([50, 80, 110])))
+        masks[course_id] = mask
+    return courses, masks
+
+
+def exhaustive(courses, masks, top_k):
+    """(score, days) of the top-K maximal selections, by trying every subset"""
+    found = []
+    for size in range(1, len(courses) + 1):
+        for subset in itertools.combinations(courses, size):
+            slots = 0
+            clash = False
+            for course in subset:
+                if slots & masks[course['id']]:
+                    clash = True
+                    break
+                slots |= masks[course['id']]
+            credits = sum(course['credits'] for course in subset)
+            if clash or not MIN_CREDITS <= credits <= MAX_CREDITS:
+                continue
+            chosen = {course['id'] for course in subset}
+            if any(course['id'] not in chosen and not slots & masks[course['id']]
+                   and credits + course['credits'] <= MAX_CREDITS for course in courses):
+                continue  # Not maximal
+            found.append((credits, teaching_days(slots)))
+    found.sort(key=lambda entry: (-entry[0], entry[1]))
+    return found[:top_k]
+
+
+def problems_with(result, masks):
+    """Clashing or out-of-range timetables in a result"""
+    problems = []
+    for timetable in result['timetables']:
+        slots = 0
+        for course_id in timetable['course_ids']:
+            if slots & masks[course_id]:
+                problems.append(f"clash in {timetable['course_ids']}")
+            slots |= masks[course_id]
+        if not MIN_CREDITS <= timetable['credits'] <= MAX_CREDITS:
+            problems.append(f"{timetable['credits']} credits in {timetable['course_ids']}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timetable generator correctness and search time")
+    parser.add_argument("--cases", type=int, default=300, help="Small catalogs checked exhaustively")
+    parser.add_argument("--courses", type=int, nargs="+", default=[20, 40, 80],
+                        help="Catalog sizes to time")
+    parser.add_argument("--budget", type=float, default=2.0, help="Time budget per search (seconds)")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=17)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures = []
+    for case in range(args.cases):
+        courses, masks = catalog(rng.randint(4, 12), rng)
+        result = generate_timetables(courses, masks, top_k=args.top_k, time_budget=60)
+        got = [(timetable['credits'], timetable['days']) for timetable in result['timetables']]
+        expected = exhaustive(courses, masks, args.top_k)
+        if got != expected:
+            failures.append(f"case {case}: got {got}, expected {expected}")
+        failures += [f"case {case}: {problem}" for problem in problems_with(result, masks)]
+    print(f"{args.cases} small catalogs checked against exhaustive search")
+
+    for size in args.courses:
+        courses, masks = catalog(size, rng)
+        result = generate_timetables(courses, masks, top_k=args.top_k, time_budget=args.budget)
+        failures += [f"{size} courses: {problem}" for problem in problems_with(result, masks)]
+        best = result['timetables'][0] if result['timetables'] else None
+        print(f"{size:4d} courses: {result['seconds'] * 1000:8.1f} ms, {result['nodes']:8d} nodes, "
+              f"{'complete' if result['complete'] else 'time budget reached'}"
+              + (f", best {best['credits']} credits on {best['days']} days" if best else ", none found"))
+
+    if failures:
+        for failure in failures[:20]:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: generated timetables match exhaustive search and are conflict-free")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""
+ECE Department Course Registration System - Bulk Import
+Streams registrar CSV/JSONL dumps into the database in large transactions
+
+Rows are read lazily from the file, validated a chunk at a time and
+inserted with executemany, one transaction per chunk. Course codes and
+student IDs are resolved through in-memory maps loaded once per import
+rather than a query per row. Rows that fail validation or a database
+constraint are written to the reject file with the reason; the rest of
+their chunk is still imported.
+
+Import the catalog before the rows that refer to it: courses, then
+prerequisites, program_plans and course_schedules; students before
+transcripts.
+
+Usage:
+    python bulk_import.py KIND FILE [--format csv|jsonl] [--db FILE]
+                          [--rejects rejects.csv] [--chunk-size 10000] [--profile bulk-load]
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from database import Database, DEFAULT_DB_NAME
+from schedule_conflicts import WEEK_DAYS, mask_to_bytes, meeting_mask
+
+# Rows validated and inserted per transaction
+CHUNK_SIZE = 10000
+
+# Seconds between progress reports
+PROGRESS_INTERVAL = 1.0
+
+PROGRAMS = ("Computer", "Communications", "Power", "Biomedical")
+
+_TIME = re.compile(r"^([01]?\d|2[0-3]):([0-5]\d)$")
+_TRUE = {"1", "true", "yes", "y"}
+_FALSE = {"", "0", "false", "no", "n"}
+
+# Kind -> (INSERT statement, required input fields, whether it is catalog data)
+IMPORT_KINDS = {
+    'students': ("""
+        INSERT INTO students (student_id, name, email, program, level) VALUES (?, ?, ?, ?, ?)
+    """, ('student_id', 'name', 'email', 'program', 'level'), False),
+    'courses': ("""
+        INSERT INTO courses (course_code, name, credits, lecture_hours, lab_hours, max_capacity, description)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, ('course_code', 'name', 'credits', 'max_capacity'), True),
+    'prerequisites': ("""
+        INSERT INTO prerequisites (course_id, prerequisite_course_id) VALUES (?, ?)
+    """, ('course_code', 'prerequisite_code'), True),
+    'program_plans': ("""
+        INSERT INTO program_plans (program, level, semester, course_id, is_elective) VALUES (?, ?, ?, ?, ?)
+    """, ('program', 'level', 'semester', 'course_code'), True),
+    'course_schedules': ("""
+        INSERT INTO course_schedules
+            (course_id, day, start_time, end_time, room, is_lab, semester_year, slot_mask)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, ('course_code', 'day', 'start_time', 'end_time', 'semester_year'), True),
+    'transcripts': ("""
+        INSERT INTO transcripts (student_id, course_id, grade, semester_year, passed) VALUES (?, ?, ?, ?, ?)
+    """, ('student_id', 'course_code', 'semester_year'), False),
+}
+
+
+def read_rows(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, object]]:
+    """
+    Stream records from a CSV (with a header row) or JSONL file
+
+    Args:
+        path: File to read; '-' reads standard input
+        fmt: 'csv' or 'jsonl' (default: from the file extension, else csv)
+
+    Yields:
+        (line number, record); a JSONL line that does not parse to an object
+        is yielded as its raw text, for the importer to reject
+    """
+    fmt = fmt or ('jsonl' if path.lower().endswith(('.jsonl', '.ndjson')) else 'csv')
+    handle = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+    try:
+        if fmt == 'csv':
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                yield line_number, record if isinstance(record, dict) else line.rstrip('\n')
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+class BulkImporter:
+    """
+    Chunked, validated bulk loader for one Database
+
+    Attributes:
+        db: Database to load into (open it with the 'bulk-load' profile for speed)
+        chunk_size: Rows validated and inserted per transaction
+        progress: Optional callback receiving the running stats dict about
+            once every PROGRESS_INTERVAL seconds
+    """
+
+    def __init__(self, db: Database, chunk_size: int = CHUNK_SIZE,
+                 progress: Optional[Callable[[Dict], None]] = None):
+        self.db = db
+        self.chunk_size = max(1, chunk_size)
+        self.progress = progress
+        self._course_ids = None   # Course code -> course ID
+        self._student_ids = None  # University student ID -> student DB ID
+        self._prerequisites = None  # Course ID -> set of direct prerequisite IDs, as inserted so far
+
+    def import_file(self, kind: str, path: str, fmt: Optional[str] = None,
+                    rejects_path: Optional[str] = None) -> Dict:
+        """
+        Import a CSV/JSONL file
+
+        Args:
+            kind: Key of IMPORT_KINDS
+            path: File to read ('-' for standard input)
+            fmt: 'csv' or 'jsonl' (default: from the file extension)
+            rejects_path: CSV file receiving rejected rows (line, error, record)
+
+        Returns:
+            Stats as returned by import_rows
+        """
+        if rejects_path is None:
+            return self.import_rows(kind, read_rows(path, fmt))
+        with open(rejects_path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['line', 'error', 'record'])
+            return self.import_rows(kind, read_rows(path, fmt),
+                                    lambda line, error, record: writer.writerow(
+                                        [line, error, json.dumps(record) if isinstance(record, dict) else record]))
+
+    def import_rows(self, kind: str, rows: Iterable[Tuple[int, object]],
+                    reject: Optional[Callable[[int, str, object], None]] = None) -> Dict:
+        """
+        Validate and insert records of one kind
+
+        Args:
+            kind: Key of IMPORT_KINDS
+            rows: (line number, record dict) pairs, e.g. from read_rows
+            reject: Called with (line number, reason, record) for every
+                rejected row
+
+        Returns:
+            Dict with 'kind', 'read', 'imported', 'rejected', 'seconds' and
+            'rows_per_second'
+        """
+        if kind not in IMPORT_KINDS:
+            raise ValueError(f"Unknown import kind '{kind}' (expected one of: {', '.join(IMPORT_KINDS)})")
+        sql, required, catalog = IMPORT_KINDS[kind]
+        parse = getattr(self, f"_parse_{kind}")
+
+        stats = {'kind': kind, 'read': 0, 'imported': 0, 'rejected': 0,
+                 'seconds': 0.0, 'rows_per_second': 0.0}
+        start = time.perf_counter()
+        reported = start
+        chunk = []
+
+        def flush():
+            batch = []
+            for line, record in chunk:
+                try:
+                    batch.append((line, record, parse(_required(record, required))))
+                except ValueError as e:
+                    self._reject(stats, reject, line, str(e), record)
+            if batch:
+                failed = _insert_chunk(self.db, sql, batch)
+                for line, record, error in failed:
+                    self._reject(stats, reject, line, error, record)
+                stats['imported'] += len(batch) - len(failed)
+                if failed and kind == 'prerequisites':
+                    # Parsing added the rejected rows' edges too; reload from the table
+                    self._prerequisites = None
+            chunk.clear()
+
+        try:
+            for line, record in rows:
+                stats['read'] += 1
+                chunk.append((line, record))
+                if len(chunk) >= self.chunk_size:
+                    flush()
+                    now = time.perf_counter()
+                    if self.progress is not None and now - reported >= PROGRESS_INTERVAL:
+                        reported = now
+                        self.progress(_timed(stats, now - start))
+            flush()
+        finally:
+            # New courses and students change the lookup maps
+            if kind == 'courses':
+                self._course_ids = None
+            elif kind == 'students':
+                self._student_ids = None
+            if catalog and stats['imported']:
+                self.db.notify_catalog_changed()
+        return _timed(stats, time.perf_counter() - start)
+
+    @staticmethod
+    def _reject(stats: Dict, reject, line: int, error: str, record):
+        stats['rejected'] += 1
+        if reject is not None:
+            reject(line, error, record)
+
+    # Lookup maps, loaded on first use
+    def _course_id(self, code: str) -> int:
+        if self._course_ids is None:
+            self._course_ids = {course['course_code']: course['id'] for course in self.db.get_all_courses()}
+        course_id = self._course_ids.get(code)
+        if course_id is None:
+            raise ValueError(f"unknown course '{code}'")
+        return course_id
+
+    def _student_id(self, student_id: str) -> int:
+        if self._student_ids is None:
+            self._student_ids = {student['student_id']: student['id']
+                                 for student in self.db.get_all_students()}
+        db_id = self._student_ids.get(student_id)
+        if db_id is None:
+            raise ValueError(f"unknown student '{student_id}'")
+        return db_id
+
+    # Row parsers: record dict -> INSERT parameters, or ValueError with the reason
+    def _parse_students(self, row: Dict) -> Tuple:
+        return (row['student_id'], row['name'], row['email'],
+                _choice(row, 'program', PROGRAMS), _integer(row, 'level', 1, 4))
+
+    def _parse_courses(self, row: Dict) -> Tuple:
+        return (row['course_code'], row['name'], _integer(row, 'credits', 1),
+                _integer(row, 'lecture_hours', 0, default=0), _integer(row, 'lab_hours', 0, default=0),
+                _integer(row, 'max_capacity', 1), row.get('description') or "")
+
+    def _parse_prerequisites(self, row: Dict) -> Tuple:
+        course_id = self._course_id(row['course_code'])
+        prereq_id = self._course_id(row['prerequisite_code'])
+        if self._prerequisites is None:
+            self._prerequisites = {}
+            for edge in self.db.get_prerequisite_edges()[0]:
+                if edge['prerequisite_course_id'] is not None:
+                    self._prerequisites.setdefault(edge['id'], set()).add(edge['prerequisite_course_id'])
+        # Same rule as Database.add_prerequisite: the prerequisite must not
+        # already require the course, directly or not
+        pending, seen = [prereq_id], set()
+        while pending:
+            current = pending.pop()
+            if current == course_id:
+                raise ValueError(f"{row['prerequisite_code']} already requires {row['course_code']}; "
+                                 f"adding this prerequisite would create a cycle")
+            if current not in seen:
+                seen.add(current)
+                pending.extend(self._prerequisites.get(current, ()))
+        self._prerequisites.setdefault(course_id, set()).add(prereq_id)
+        return course_id, prereq_id
+
+    def _parse_program_plans(self, row: Dict) -> Tuple:
+        return (_choice(row, 'program', PROGRAMS), _integer(row, 'level', 1, 4),
+                _integer(row, 'semester', 1, 2), self._course_id(row['course_code']),
+                _boolean(row, 'is_elective'))
+
+    def _parse_course_schedules(self, row: Dict) -> Tuple:
+        day = _choice(row, 'day', WEEK_DAYS)
+        start, end = _time(row, 'start_time'), _time(row, 'end_time')
+        if end <= start:
+            raise ValueError("end_time must be after start_time")
+        return (self._course_id(row['course_code']), day, start, end, row.get('room') or None,
+                _boolean(row, 'is_lab'), row['semester_year'],
+                mask_to_bytes(meeting_mask(day, start, end)))
+
+    def _parse_transcripts(self, row: Dict) -> Tuple:
+        return (self._student_id(row['student_id']), self._course_id(row['course_code']),
+                row.get('grade') or None, row['semester_year'], _boolean(row, 'passed'))
+
+
+def _insert_chunk(db: Database, sql: str, batch: List[Tuple]) -> List[Tuple[int, object, str]]:
+    """
+    Insert a validated chunk with executemany, in one transaction
+
+    If a row breaks a constraint (e.g. a duplicate key) the transaction is
+    rolled back and the chunk inserted again row by row, so only the
+    offending rows are rejected. A savepoint would avoid the second pass,
+    but FTS5 flushes its pending index data at every savepoint, which
+    made student imports several times slower.
+
+    Returns:
+        (line, record, error) of every row the database rejected
+    """
+    try:
+        db.run_in_transaction(lambda cursor: cursor.executemany(sql, [params for _, _, params in batch]))
+        return []
+    except sqlite3.IntegrityError:
+        pass
+
+    def row_by_row(cursor):
+        failed = []
+        for line, record, params in batch:
+            try:
+                cursor.execute(sql, params)
+            except sqlite3.IntegrityError as e:
+                failed.append((line, record, f"rejected by database: {e}"))
+        return failed
+    return db.run_in_transaction(row_by_row)
+
+
+def _required(record, fields) -> Dict:
+    """Check a record has every required field, with surrounding whitespace stripped"""
+    if not isinstance(record, dict):
+        raise ValueError("not a JSON object")
+    row = {key: value.strip() if isinstance(value, str) else value
+           for key, value in record.items() if key is not None}
+    missing = [field for field in fields if row.get(field) in (None, "")]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    return row
+
+
+def _integer(row: Dict, field: str, low: int, high: Optional[int] = None, default=None) -> int:
+    value = row.get(field)
+    if value in (None, "") and default is not None:
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an integer, got {value!r}")
+    if number < low or (high is not None and number > high):
+        bounds = f"between {low} and {high}" if high is not None else f"at least {low}"
+        raise ValueError(f"{field} must be {bounds}, got {number}")
+    return number
+
+
+def _choice(row: Dict, field: str, choices) -> str:
+    value = row.get(field)
+    if value not in choices:
+        raise ValueError(f"{field} must be one of {', '.join(choices)}, got {value!r}")
+    return value
+
+
+def _boolean(row: Dict, field: str) -> bool:
+    value = row.get(field)
+    if isinstance(value, bool):
+        return value
+    text = str(value if value is not None else "").lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"{field} must be true or false, got {value!r}")
+
+
+def _time(row: Dict, field: str) -> str:
+    match = _TIME.match(str(row.get(field)))
+    if not match:
+        raise ValueError(f"{field} must be HH:MM, got {row.get(field)!r}")
+    return f"{int(match.group(1)):02d}:{match.group(2)}"
+
+
+def _timed(stats: Dict, seconds: float) -> Dict:
+    stats['seconds'] = seconds
+    stats['rows_per_second'] = stats['read'] / seconds if seconds > 0 else 0.0
+    return dict(stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a CSV/JSONL dump into the database")
+    parser.add_argument("kind", choices=list(IMPORT_KINDS), help="What the file contains")
+    parser.add_argument("file", help="CSV (with header) or JSONL file; '-' for standard input")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Default: from the file extension")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="Database file")
+    parser.add_argument("--rejects", help="Write rejected rows and reasons to this CSV file")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per transaction")
+    parser.add_argument("--profile", default="bulk-load", help="Storage profile (see database.STORAGE_PROFILES)")
+    args = parser.parse_args()
+
+    def progress(stats):
+        print(f"  {stats['read']} rows read, {stats['imported']} imported, {stats['rejected']} rejected "
+              f"({stats['rows_per_second']:,.0f} rows/s)", file=sys.stderr)
+
+    db = Database(args.db, profile=args.profile)
+    importer = BulkImporter(db, chunk_size=args.chunk_size, progress=progress)
+    stats = importer.import_file(args.kind, args.file, args.format, args.rejects)
+    db.close()
+
+    print(f"Imported {stats['imported']} of {stats['read']} {args.kind} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:,.0f} rows/s), {stats['rejected']} rejected")
+    if stats['rejected'] and args.rejects:
+        print(f"Rejected rows written to {os.path.abspath(args.rejects)}")
+    sys.exit(1 if stats['rejected'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+ECE Department Course Registration System - Catalog Cache
+Read-through cache for courses, prerequisites, program plans and schedules
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List
+
+from database import Database
+
+# Cached query results kept per database, least recently used dropped first
+CACHE_MAX_ENTRIES = 4096
+
+# Seconds an entry is served before it is reloaded regardless of changes
+CACHE_TTL = 300.0
+
+# Seconds between checks of schema_info.catalog_version for writes made by
+# other processes (writes through the same Database invalidate at once)
+VERSION_CHECK_INTERVAL = 1.0
+
+
+class CatalogCache:
+    """
+    Bounded LRU/TTL cache of catalog queries in front of a Database
+
+    Catalog data changes rarely but is read on every course list refresh
+    and schedule validation. Results are cached per query and per course,
+    so a batch lookup only loads the courses it has not seen yet. The cache
+    is cleared when:
+
+    - a catalog write goes through the Database (add_catalog_listener)
+    - schema_info.catalog_version, bumped by triggers on the catalog
+      tables, differs from the one the entries were loaded at; this is
+      checked at most every `check_interval` seconds
+    - an entry is older than `ttl` seconds (that entry only)
+
+    Enrollment counts are not catalog data and are never cached. Returned
+    rows are copies, so callers may modify them.
+
+    Attributes:
+        db: Database the catalog is read from
+        max_entries: Maximum number of cached entries
+        ttl: Seconds an entry stays valid
+        check_interval: Seconds between catalog_version checks
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db: Database, max_entries: int = CACHE_MAX_ENTRIES,
+                 ttl: float = CACHE_TTL, check_interval: float = VERSION_CHECK_INTERVAL):
+        self.db = db
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # Key -> (expiry time, value)
+        self._generation = 0           # Bumped on every invalidation
+        self._version = None           # catalog_version the entries were loaded at
+        self._checked_at = float('-inf')
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0,
+                       'invalidations': 0}
+        db.add_catalog_listener(self.invalidate)
+
+    @classmethod
+    def shared(cls, db: Database) -> 'CatalogCache':
+        """Get the process-wide CatalogCache for a Database"""
+        with cls._shared_lock:
+            cache = cls._shared.get(db.db_name)
+            if cache is None:
+                cache = cls(db)
+                cls._shared[db.db_name] = cache
+            return cache
+
+    def invalidate(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        """Drop every entry (caller holds _lock)"""
+        self._entries.clear()
+        self._generation += 1
+        self._stats['invalidations'] += 1
+
+    def _check_version(self):
+        """Clear the cache if another process changed the catalog"""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        version = self.db.get_schema_info('catalog_version') or '0'
+        with self._lock:
+            self._checked_at = now
+            if version != self._version:
+                if self._version is not None:
+                    self._clear()
+                self._version = version
+
+    def _lookup(self, keys: List) -> Dict:
+        """Cached values of the keys that have a live entry"""
+        found = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._stats['misses'] += 1
+                elif entry[0] < now:
+                    del self._entries[key]
+                    self._stats['expirations'] += 1
+                    self._stats['misses'] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    found[key] = entry[1]
+        return found
+
+    def _store(self, values: Dict, generation: int):
+        """Cache loaded values unless the cache was invalidated while they loaded"""
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            if generation != self._generation:
+                return
+            for key, value in values.items():
+                self._entries[key] = (expires, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _get_many(self, keys: List, load) -> Dict:
+        """
+        Get several entries, loading the missing ones with a single call
+
+        Args:
+            keys: Cache keys
+            load: Called with the missing keys; returns {key: value} for all of them
+
+        Returns:
+            {key: value} for every key
+        """
+        self._check_version()
+        generation = self._generation
+        values = self._lookup(keys)
+        missing = [key for key in keys if key not in values]
+        if missing:
+            loaded = load(missing)
+            self._store(loaded, generation)
+            values.update(loaded)
+        return values
+
+    def _get(self, key, load):
+        """Get one entry, loading it with `load()` on a miss"""
+        return self._get_many([key], lambda keys: {key: load()})[key]
+
+    def get_course_prerequisites(self, course_id: int) -> List[Dict]:
+        """Cached Database.get_course_prerequisites"""
+        prereqs = self._get(('prerequisites', course_id),
+                            lambda: self.db.get_course_prerequisites(course_id))
+        return [dict(row) for row in prereqs]
+
+    def get_program_plan_courses(self, program: str, level: int, semester: int) -> List[Dict]:
+        """Cached Database.get_program_plan_courses"""
+        courses = self._get(('plan_courses', program, level, semester),
+                            lambda: self.db.get_program_plan_courses(program, level, semester))
+        return [dict(row) for row in courses]
+
+    def get_program_plan_codes(self, program: str, level: int) -> Dict[int, set]:
+        """Cached Database.get_program_plan_codes"""
+        plan_codes = self._get(('plan_codes', program, level),
+                               lambda: self.db.get_program_plan_codes(program, level))
+        return {semester: set(codes) for semester, codes in plan_codes.items()}
+
+    def get_course_schedule(self, course_id: int, semester_year: str) -> List[Dict]:
+        """Cached Database.get_course_schedule"""
+        return self.get_schedules_for_courses([course_id], semester_year)[course_id]
+
+    def get_schedules_for_courses(self, course_ids: List[int], semester_year: str) -> Dict[int, List[Dict]]:
+        """Cached Database.get_schedules_for_courses; only uncached courses are queried"""
+        ids = list(dict.fromkeys(course_ids))
+
+        def load(keys):
+            schedules = self.db.get_schedules_for_courses([key[1] for key in keys], semester_year)
+            return {('schedule', course_id, semester_year): meetings
+                    for course_id, meetings in schedules.items()}
+
+        values = self._get_many([('schedule', course_id, semester_year) for course_id in ids], load)
+        return {course_id: [dict(row) for row in values[('schedule', course_id, semester_year)]]
+                for course_id in ids}
+
+    def get_slot_masks(self, course_ids: List[int], semester_year: str) -> Dict[int, int]:
+        """Cached Database.get_slot_masks; only uncached courses are queried"""
+        ids = list(dict.fromkeys(course_ids))
+
+        def load(keys):
+            masks = self.db.get_slot_masks([key[1] for key in keys], semester_year)
+            return {('slot_mask', course_id, semester_year): mask for course_id, mask in masks.items()}
+
+        values = self._get_many([('slot_mask', course_id, semester_year) for course_id in ids], load)
+        return {course_id: values[('slot_mask', course_id, semester_year)] for course_id in ids}
+
+    def stats(self) -> Dict:
+        """Hit, miss, eviction, expiration and invalidation counts, entries and hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
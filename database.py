@@ -3,485 +3,1818 @@ ECE Department Course Registration System - Database Module
 Handles all database operations using SQLite3
 """
 
+import os
+import random
+import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from typing import List, Tuple, Optional, Dict
 import bcrypt
 
+from instrumentation import RECORDER, TimedConnection, instrument_methods
+from schedule_conflicts import mask_to_bytes, meeting_mask, schedule_mask
+
+# Keep IN (...) lists well under SQLite's bound-parameter limit
+IN_CLAUSE_CHUNK = 500
+
+
+# SQLite storage profiles. Pick one with Database(profile=...) or the
+# COURSE_REG_DB_PROFILE environment variable; a dict of pragma overrides
+# on top of the default profile is accepted too.
+STORAGE_PROFILE_ENV = "COURSE_REG_DB_PROFILE"
+DEFAULT_STORAGE_PROFILE = "interactive"
+STORAGE_PROFILES = {
+    # GUI clients and the registration window: readers never wait for the writer
+    'interactive': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,          # KiB, i.e. ~16 MB
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,          # Milliseconds
+    },
+    # Imports and data generation: durability traded for write speed
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -131072,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+    },
+    # Reporting and exports: large cache and memory-mapped reads
+    'read-mostly': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    # SQLite defaults as the application originally ran (rollback journal)
+    'legacy': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,
+    },
+}
+
+
+def resolve_storage_profile(profile=None) -> Dict:
+    """
+    Resolve a storage profile to its pragma settings
+
+    Args:
+        profile: Profile name, dict of pragma overrides, or None to use the
+            COURSE_REG_DB_PROFILE environment variable (default "interactive")
+
+    Returns:
+        Dict of pragma name to value
+    """
+    if profile is None:
+        profile = os.environ.get(STORAGE_PROFILE_ENV) or DEFAULT_STORAGE_PROFILE
+    if isinstance(profile, dict):
+        return {**STORAGE_PROFILES[DEFAULT_STORAGE_PROFILE], **profile}
+    if profile not in STORAGE_PROFILES:
+        raise ValueError(
+            f"Unknown storage profile '{profile}' "
+            f"(expected one of: {', '.join(STORAGE_PROFILES)})"
+        )
+    return dict(STORAGE_PROFILES[profile])
+
+
+# Bump SCHEMA_VERSION whenever create_tables() changes so existing
+# databases re-run the (idempotent) DDL once on their next start
+SCHEMA_VERSION = 6
+DEFAULT_DB_NAME = "ece_course_registration.db"
+
+# Credit limits of a semester's course load; MAX_CREDITS is also the cap
+# applied when seats are allocated and waitlists promoted
+MIN_CREDITS = 12
+MAX_CREDITS = 18
+
+# Retry policy for write transactions that hit SQLITE_BUSY
+BUSY_RETRIES = 5
+BUSY_BACKOFF = 0.05  # Seconds, doubled on every retry
+
+# Secondary indexes for the hot lookup paths. Bump INDEX_VERSION whenever
+# this mapping changes so existing databases pick up the new set.
+# prerequisites(course_id) and program_plans(program, level, semester) are
+# already served by the leading columns of their UNIQUE constraints.
+INDEX_VERSION = 2
+SECONDARY_INDEXES = {
+    'idx_registrations_course_semester_status':
+        "registrations(course_id, semester_year, status)",
+    'idx_course_schedules_course_semester':
+        "course_schedules(course_id, semester_year)",
+    'idx_prerequisites_prerequisite':
+        "prerequisites(prerequisite_course_id)",
+    'idx_program_plans_course':
+        "program_plans(course_id)",
+    'idx_transcripts_course':
+        "transcripts(course_id)",
+    'idx_registrations_semester_status':
+        "registrations(semester_year, status)",
+    'idx_students_program':
+        "students(program, student_id)",
+}
+
+# Sort orders of the admin registrations browser: the joins, in the order
+# SQLite must walk them (CROSS JOIN pins the outer table), and the columns
+# each page is ordered and keyset-paginated by, with the registration ID as
+# tie-breaker. Walking the outer table along the index of its sort column
+# lets a page stop after `limit` rows instead of sorting the whole semester.
+REGISTRATION_SORTS = {
+    'course': ("courses c CROSS JOIN registrations r ON r.course_id = c.id "
+               "JOIN students s ON s.id = r.student_id",
+               ('c.course_code',)),
+    'student': ("students s CROSS JOIN registrations r ON r.student_id = s.id "
+                "JOIN courses c ON c.id = r.course_id",
+                ('s.student_id',)),
+    'program': ("students s CROSS JOIN registrations r ON r.student_id = s.id "
+                "JOIN courses c ON c.id = r.course_id",
+                ('s.program', 's.student_id')),
+    'status': ("registrations r JOIN students s ON s.id = r.student_id "
+               "JOIN courses c ON c.id = r.course_id",
+               ('r.status',)),
+}
+
+
+def _chunks(values: List, size: int = IN_CLAUSE_CHUNK):
+    """Yield successive slices of at most `size` values"""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class TransactionAborted(Exception):
+    """Raised inside a write transaction to roll it back with a user-facing message"""
+
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    """Check whether an error means another connection holds the write lock"""
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of persistent SQLite connections
+
+    Each thread checks out at most one connection at a time; nested checkouts
+    from the same thread reuse it. Idle connections stay open between calls
+    and are health-checked before being handed out again.
+
+    Attributes:
+        db_name: Path to the SQLite database file
+        size: Maximum number of connections checked out at once
+        timeout: Seconds to wait for a free connection before giving up
+        health_check_interval: Idle seconds after which a connection is pinged
+        pragmas: Pragma settings applied to every new connection
+    """
+
+    def __init__(self, db_name: str, size: int = 5, timeout: float = 30.0,
+                 health_check_interval: float = 30.0, pragmas: Optional[Dict] = None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.db_name = db_name
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.pragmas = dict(pragmas or {})
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = []  # Stack of (connection, last_used) tuples
+        self._local = threading.local()
+        self._closed = False
+        self._trace_callback = None
+        self._stats = {
+            'created': 0,
+            'checkouts': 0,
+            'health_check_failures': 0,
+            'discarded': 0,
+        }
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        start = time.perf_counter()
+        # Pooled connections move between threads, but only one thread
+        # ever uses a given connection at a time.
+        conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # busy_timeout first so the remaining pragmas wait out a busy writer
+        pragmas = sorted(self.pragmas.items(), key=lambda item: item[0] != 'busy_timeout')
+        for name, value in pragmas:
+            conn.execute(f"PRAGMA {name} = {value}")
+        # Enable foreign keys
+        conn.execute("PRAGMA foreign_keys = ON")
+        with self._lock:
+            self._stats['created'] += 1
+        RECORDER.record('connection', 'connect', time.perf_counter() - start)
+        return conn
+
+    @staticmethod
+    def _close(conn: sqlite3.Connection):
+        """Close a connection, timing it for the instrumentation"""
+        start = time.perf_counter()
+        conn.close()
+        RECORDER.record('connection', 'close', time.perf_counter() - start)
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Ping a connection to make sure it is still usable"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection):
+        """Close a connection that is no longer trusted"""
+        try:
+            self._close(conn)
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._stats['discarded'] += 1
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take a connection from the idle stack or open a new one"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeoutError(
+                f"No database connection available after {self.timeout}s "
+                f"(pool size {self.size})"
+            )
+
+        try:
+            while True:
+                with self._lock:
+                    self._stats['checkouts'] += 1
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    return self._open()
+
+                conn, last_used = entry
+                if time.monotonic() - last_used < self.health_check_interval:
+                    return conn
+                if self._is_healthy(conn):
+                    return conn
+
+                with self._lock:
+                    self._stats['health_check_failures'] += 1
+                self._discard(conn)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: sqlite3.Connection):
+        """Return a connection to the idle stack"""
+        try:
+            if conn.in_transaction:
+                # Never hand a half-finished transaction to the next caller
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+        else:
+            if self._closed:
+                self._close(conn)
+            else:
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out the calling thread's connection
+
+        Nested use within the same thread yields the same connection and
+        only the outermost block returns it to the pool. While the
+        instrumentation is recording, the connection is wrapped so its
+        statements are timed.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.depth += 1
+            try:
+                yield TimedConnection(conn) if RECORDER.enabled else conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        start = time.perf_counter()
+        conn = self._acquire()
+        RECORDER.record('connection', 'checkout', time.perf_counter() - start)
+        conn.set_trace_callback(self._trace_callback)
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield TimedConnection(conn) if RECORDER.enabled else conn
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self._release(conn)
+
+    def set_trace_callback(self, callback):
+        """Install a sqlite3 trace callback on every connection handed out"""
+        self._trace_callback = callback
+
+    def stats(self) -> Dict:
+        """Get pool usage counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['idle'] = len(self._idle)
+        stats['size'] = self.size
+        return stats
+
+    def close_all(self):
+        """Close idle connections and refuse further checkouts"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
 
 class Database:
     """Database handler for the course registration system"""
-    
-    def __init__(self, db_name: str = "ece_course_registration.db"):
-        """Initialize database connection"""
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_name: str = DEFAULT_DB_NAME, pool_size: int = 5,
+                 profile=None):
+        """
+        Initialize database connection pool
+
+        Args:
+            db_name: Database file
+            pool_size: Maximum number of concurrently checked-out connections
+            profile: Storage profile name or pragma overrides (see STORAGE_PROFILES)
+        """
         self.db_name = db_name
-        self.conn = None
+        self.storage_profile = resolve_storage_profile(profile)
+        self.pool = ConnectionPool(db_name, size=pool_size, pragmas=self.storage_profile)
+        self._student_search_fts = None  # Whether students_fts exists; checked on first search
+        self._catalog_listeners = []
+        self._transaction_lock = threading.Lock()
+        self._transaction_stats = {
+            'transactions': 0,
+            'busy_retries': 0,
+            'lock_wait_seconds': 0.0,   # Time spent obtaining the write lock
+            'max_lock_wait_seconds': 0.0,
+        }
+        self.ensure_schema()
+
+    @classmethod
+    def shared(cls, db_name: str = DEFAULT_DB_NAME) -> 'Database':
+        """
+        Get the process-wide Database for a file
+
+        The first call opens the pool and checks the schema; later calls
+        return the same instance, so windows and dialogs share one pool.
+        """
+        with cls._shared_lock:
+            db = cls._shared.get(db_name)
+            if db is None:
+                db = cls(db_name)
+                cls._shared[db_name] = db
+            return db
+
+    def ensure_schema(self):
+        """Create or upgrade the schema unless it is already current"""
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT key, value FROM schema_info
+                    WHERE key IN ('schema_version', 'index_version')
+                """)
+                versions = {row['key']: row['value'] for row in cursor.fetchall()}
+        except sqlite3.OperationalError:
+            versions = {}  # Fresh database, or one from before schema_info existed
+
+        if (versions.get('schema_version') == str(SCHEMA_VERSION)
+                and versions.get('index_version') == str(INDEX_VERSION)):
+            return
+
         self.create_tables()
+        self.create_indexes()
         self.insert_default_admin()
-    
-    def connect(self):
-        """Establish database connection"""
-        self.conn = sqlite3.connect(self.db_name)
-        self.conn.row_factory = sqlite3.Row
-        # Enable foreign keys
-        self.conn.execute("PRAGMA foreign_keys = ON")
-        return self.conn
-    
+        with self.connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO schema_info (key, value) VALUES ('schema_version', ?)
+            """, (str(SCHEMA_VERSION),))
+            conn.commit()
+
+    def connection(self):
+        """Check out a pooled connection for the calling thread"""
+        return self.pool.connection()
+
     def close(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
-    
+        """Close all pooled database connections"""
+        self.pool.close_all()
+
+    def add_catalog_listener(self, callback):
+        """
+        Call `callback()` after every catalog write made through this instance
+
+        Catalog writes are add_course, add_prerequisite, add_to_program_plan
+        and add_course_schedule, plus bulk imports (which call
+        notify_catalog_changed). Writes by other processes are not reported;
+        they show up as a new schema_info.catalog_version instead.
+        """
+        self._catalog_listeners.append(callback)
+
+    def notify_catalog_changed(self):
+        """Call the catalog listeners after catalog rows were written"""
+        for callback in self._catalog_listeners:
+            callback()
+
+    def run_in_transaction(self, work, retries: int = BUSY_RETRIES):
+        """
+        Run work(cursor) inside a BEGIN IMMEDIATE transaction
+
+        The write lock is taken up front, so reads made by `work` cannot be
+        invalidated by another writer before it commits. Any exception rolls
+        the whole transaction back. If the lock cannot be obtained the
+        transaction is retried with jittered exponential backoff.
+
+        Args:
+            work: Callable taking a cursor; its return value is returned
+            retries: Number of retries after SQLITE_BUSY
+
+        Returns:
+            Whatever `work` returns
+        """
+        attempt = 0
+        with self.connection() as conn:
+            started = time.perf_counter()
+            while True:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    self._record_lock_wait(time.perf_counter() - started, attempt)
+                    try:
+                        result = work(conn.cursor())
+                        conn.commit()
+                        return result
+                    except BaseException:
+                        conn.rollback()
+                        raise
+                except sqlite3.OperationalError as e:
+                    if not _is_busy(e) or attempt >= retries:
+                        raise
+                    attempt += 1
+                    time.sleep(BUSY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+    def _record_lock_wait(self, seconds: float, retries: int):
+        with self._transaction_lock:
+            stats = self._transaction_stats
+            stats['transactions'] += 1
+            stats['busy_retries'] += retries
+            stats['lock_wait_seconds'] += seconds
+            stats['max_lock_wait_seconds'] = max(stats['max_lock_wait_seconds'], seconds)
+
+    def transaction_stats(self) -> Dict:
+        """
+        Get write transaction counters for run_in_transaction
+
+        Returns:
+            Dict with 'transactions', 'busy_retries', 'lock_wait_seconds'
+            (total time spent waiting for the write lock, including
+            busy_timeout waits and retry backoff) and 'max_lock_wait_seconds'
+        """
+        with self._transaction_lock:
+            return dict(self._transaction_stats)
+
     def create_tables(self):
         """Create all database tables if they don't exist"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        # Users table for authentication
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                role TEXT NOT NULL CHECK(role IN ('Student', 'Admin')),
-                student_id INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students(id)
-            )
-        """)
-        
-        # Students table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id TEXT UNIQUE NOT NULL,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                program TEXT NOT NULL CHECK(program IN ('Computer', 'Communications', 'Power', 'Biomedical')),
-                level INTEGER NOT NULL CHECK(level >= 1 AND level <= 4)
-            )
-        """)
-        
-        # Courses table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS courses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                course_code TEXT UNIQUE NOT NULL,
-                name TEXT NOT NULL,
-                credits INTEGER NOT NULL CHECK(credits > 0),
-                lecture_hours INTEGER NOT NULL DEFAULT 0,
-                lab_hours INTEGER NOT NULL DEFAULT 0,
-                max_capacity INTEGER NOT NULL CHECK(max_capacity > 0),
-                description TEXT
-            )
-        """)
-        
-        # Prerequisites table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS prerequisites (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                course_id INTEGER NOT NULL,
-                prerequisite_course_id INTEGER NOT NULL,
-                FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
-                FOREIGN KEY (prerequisite_course_id) REFERENCES courses(id) ON DELETE CASCADE,
-                UNIQUE(course_id, prerequisite_course_id)
-            )
-        """)
-        
-        # Program plans table (maps courses to programs and levels)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS program_plans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                program TEXT NOT NULL CHECK(program IN ('Computer', 'Communications', 'Power', 'Biomedical')),
-                level INTEGER NOT NULL CHECK(level >= 1 AND level <= 4),
-                semester INTEGER NOT NULL CHECK(semester IN (1, 2)),
-                course_id INTEGER NOT NULL,
-                is_elective BOOLEAN DEFAULT 0,
-                FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
-                UNIQUE(program, level, semester, course_id)
-            )
-        """)
-        
-        # Course schedules table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS course_schedules (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                course_id INTEGER NOT NULL,
-                day TEXT NOT NULL CHECK(day IN ('Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday')),
-                start_time TEXT NOT NULL,
-                end_time TEXT NOT NULL,
-                room TEXT,
-                is_lab BOOLEAN DEFAULT 0,
-                semester_year TEXT NOT NULL,
-                FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Transcripts table (student completed courses)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS transcripts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                course_id INTEGER NOT NULL,
-                grade TEXT,
-                semester_year TEXT NOT NULL,
-                passed BOOLEAN DEFAULT 0,
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
-                UNIQUE(student_id, course_id, semester_year)
-            )
-        """)
-        
-        # Registrations table (current semester registrations)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+
+            # Users table for authentication
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    role TEXT NOT NULL CHECK(role IN ('Student', 'Admin')),
+                    student_id INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (student_id) REFERENCES students(id)
+                )
+            """)
+
+            # Students table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS students (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_id TEXT UNIQUE NOT NULL,
+                    name TEXT NOT NULL,
+                    email TEXT UNIQUE NOT NULL,
+                    program TEXT NOT NULL CHECK(program IN ('Computer', 'Communications', 'Power', 'Biomedical')),
+                    level INTEGER NOT NULL CHECK(level >= 1 AND level <= 4)
+                )
+            """)
+
+            # Courses table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS courses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    course_code TEXT UNIQUE NOT NULL,
+                    name TEXT NOT NULL,
+                    credits INTEGER NOT NULL CHECK(credits > 0),
+                    lecture_hours INTEGER NOT NULL DEFAULT 0,
+                    lab_hours INTEGER NOT NULL DEFAULT 0,
+                    max_capacity INTEGER NOT NULL CHECK(max_capacity > 0),
+                    description TEXT
+                )
+            """)
+
+            # Prerequisites table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS prerequisites (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    course_id INTEGER NOT NULL,
+                    prerequisite_course_id INTEGER NOT NULL,
+                    FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
+                    FOREIGN KEY (prerequisite_course_id) REFERENCES courses(id) ON DELETE CASCADE,
+                    UNIQUE(course_id, prerequisite_course_id)
+                )
+            """)
+
+            # Program plans table (maps courses to programs and levels)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS program_plans (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    program TEXT NOT NULL CHECK(program IN ('Computer', 'Communications', 'Power', 'Biomedical')),
+                    level INTEGER NOT NULL CHECK(level >= 1 AND level <= 4),
+                    semester INTEGER NOT NULL CHECK(semester IN (1, 2)),
+                    course_id INTEGER NOT NULL,
+                    is_elective BOOLEAN DEFAULT 0,
+                    FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
+                    UNIQUE(program, level, semester, course_id)
+                )
+            """)
+
+            # Course schedules table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS course_schedules (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    course_id INTEGER NOT NULL,
+                    day TEXT NOT NULL CHECK(day IN ('Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday')),
+                    start_time TEXT NOT NULL,
+                    end_time TEXT NOT NULL,
+                    room TEXT,
+                    is_lab BOOLEAN DEFAULT 0,
+                    semester_year TEXT NOT NULL,
+                    slot_mask BLOB,
+                    FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE
+                )
+            """)
+
+            # Weekly 5-minute slot bitmask of each meeting (see schedule_conflicts);
+            # added to older databases and filled in for rows that lack it
+            cursor.execute("PRAGMA table_info(course_schedules)")
+            if 'slot_mask' not in {row['name'] for row in cursor.fetchall()}:
+                cursor.execute("ALTER TABLE course_schedules ADD COLUMN slot_mask BLOB")
+            self._fill_slot_masks(cursor)
+
+            # Transcripts table (student completed courses)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_id INTEGER NOT NULL,
+                    course_id INTEGER NOT NULL,
+                    grade TEXT,
+                    semester_year TEXT NOT NULL,
+                    passed BOOLEAN DEFAULT 0,
+                    FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+                    FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
+                    UNIQUE(student_id, course_id, semester_year)
+                )
+            """)
+
+            # Registrations table (current semester registrations)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS registrations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_id INTEGER NOT NULL,
+                    course_id INTEGER NOT NULL,
+                    semester_year TEXT NOT NULL,
+                    status TEXT DEFAULT 'Pending' CHECK(status IN ('Pending', 'Approved', 'Dropped')),
+                    registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+                    FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
+                    UNIQUE(student_id, course_id, semester_year)
+                )
+            """)
+
+            # Seat requests collected before a batch allocation run (see
+            # seat_allocation); preference is the student's ranking, 0 first
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS registration_requests (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_id INTEGER NOT NULL,
+                    course_id INTEGER NOT NULL,
+                    semester_year TEXT NOT NULL,
+                    preference INTEGER NOT NULL DEFAULT 0,
+                    status TEXT DEFAULT 'Pending'
+                        CHECK(status IN ('Pending', 'Allocated', 'Waitlisted', 'Rejected')),
+                    note TEXT,
+                    requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+                    FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
+                    UNIQUE(semester_year, student_id, course_id)
+                )
+            """)
+
+            # Waitlists for full courses, served in position order when seats free up
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waitlist (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_id INTEGER NOT NULL,
+                    course_id INTEGER NOT NULL,
+                    semester_year TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+                    FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
+                    UNIQUE(course_id, semester_year, position),
+                    UNIQUE(student_id, course_id, semester_year)
+                )
+            """)
+
+            # Materialized enrollment counters, kept in step with registrations
+            # by the triggers below so capacity checks are a keyed lookup
+            cursor.execute("""
+                SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'course_enrollment'
+            """)
+            counters_existed = cursor.fetchone() is not None
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS course_enrollment (
+                    course_id INTEGER NOT NULL,
+                    semester_year TEXT NOT NULL,
+                    active_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (course_id, semester_year),
+                    FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_registrations_enrollment_insert
+                AFTER INSERT ON registrations
+                WHEN NEW.status != 'Dropped'
+                BEGIN
+                    INSERT INTO course_enrollment (course_id, semester_year, active_count)
+                    VALUES (NEW.course_id, NEW.semester_year, 1)
+                    ON CONFLICT(course_id, semester_year) DO UPDATE SET active_count = active_count + 1;
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_registrations_enrollment_update
+                AFTER UPDATE OF status, course_id, semester_year ON registrations
+                BEGIN
+                    UPDATE course_enrollment SET active_count = active_count - 1
+                    WHERE OLD.status != 'Dropped'
+                      AND course_id = OLD.course_id AND semester_year = OLD.semester_year;
+                    INSERT INTO course_enrollment (course_id, semester_year, active_count)
+                    SELECT NEW.course_id, NEW.semester_year, 1 WHERE NEW.status != 'Dropped'
+                    ON CONFLICT(course_id, semester_year) DO UPDATE SET active_count = active_count + 1;
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_registrations_enrollment_delete
+                AFTER DELETE ON registrations
+                WHEN OLD.status != 'Dropped'
+                BEGIN
+                    UPDATE course_enrollment SET active_count = active_count - 1
+                    WHERE course_id = OLD.course_id AND semester_year = OLD.semester_year;
+                END
+            """)
+            if not counters_existed:
+                # Upgrading a database that already has registrations
+                self._rebuild_enrollment_counts(cursor)
+
+            # Full-text index over student ID, name and email for the admin
+            # search box; an external-content table, so rows live only in
+            # students and the triggers below keep the index in step
+            cursor.execute("""
+                SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students_fts'
+            """)
+            search_index_existed = cursor.fetchone() is not None
+            try:
+                cursor.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+                        student_id, name, email,
+                        content='students', content_rowid='id', prefix='2 3'
+                    )
+                """)
+            except sqlite3.OperationalError:
+                pass  # SQLite built without FTS5; search_students falls back to LIKE
+            else:
+                cursor.execute("""
+                    CREATE TRIGGER IF NOT EXISTS trg_students_fts_insert
+                    AFTER INSERT ON students
+                    BEGIN
+                        INSERT INTO students_fts (rowid, student_id, name, email)
+                        VALUES (NEW.id, NEW.student_id, NEW.name, NEW.email);
+                    END
+                """)
+                cursor.execute("""
+                    CREATE TRIGGER IF NOT EXISTS trg_students_fts_delete
+                    AFTER DELETE ON students
+                    BEGIN
+                        INSERT INTO students_fts (students_fts, rowid, student_id, name, email)
+                        VALUES ('delete', OLD.id, OLD.student_id, OLD.name, OLD.email);
+                    END
+                """)
+                cursor.execute("""
+                    CREATE TRIGGER IF NOT EXISTS trg_students_fts_update
+                    AFTER UPDATE OF student_id, name, email ON students
+                    BEGIN
+                        INSERT INTO students_fts (students_fts, rowid, student_id, name, email)
+                        VALUES ('delete', OLD.id, OLD.student_id, OLD.name, OLD.email);
+                        INSERT INTO students_fts (rowid, student_id, name, email)
+                        VALUES (NEW.id, NEW.student_id, NEW.name, NEW.email);
+                    END
+                """)
+                if not search_index_existed:
+                    # Index the students already in an upgraded database
+                    cursor.execute("INSERT INTO students_fts (students_fts) VALUES ('rebuild')")
+
+            # Schema bookkeeping (index set version, ...)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_info (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+
+            # Bump schema_info.prerequisite_version on every prerequisite
+            # change (including cascades from deleted courses) so cached
+            # prerequisite graphs in any process can tell they are stale
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_prerequisites_version_{event.lower()}
+                    AFTER {event} ON prerequisites
+                    BEGIN
+                        INSERT INTO schema_info (key, value) VALUES ('prerequisite_version', '1')
+                        ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1;
+                    END
+                """)
+
+            # Likewise schema_info.catalog_version for every catalog table, so
+            # catalog caches notice writes made by other processes
+            for table in ('courses', 'prerequisites', 'program_plans', 'course_schedules'):
+                for event in ('INSERT', 'UPDATE', 'DELETE'):
+                    cursor.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS trg_{table}_catalog_version_{event.lower()}
+                        AFTER {event} ON {table}
+                        BEGIN
+                            INSERT INTO schema_info (key, value) VALUES ('catalog_version', '1')
+                            ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1;
+                        END
+                    """)
+
+            conn.commit()
+
+    def _fill_slot_masks(self, cursor):
+        """Compute slot_mask for course_schedules rows that do not have one"""
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS registrations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                course_id INTEGER NOT NULL,
-                semester_year TEXT NOT NULL,
-                status TEXT DEFAULT 'Pending' CHECK(status IN ('Pending', 'Approved', 'Dropped')),
-                registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
-                UNIQUE(student_id, course_id, semester_year)
-            )
+            SELECT id, day, start_time, end_time FROM course_schedules
+            WHERE slot_mask IS NULL  -- audit: full scan intended: one-off backfill after the schema upgrade
         """)
-        
-        conn.commit()
-        self.close()
-    
+        cursor.executemany(
+            "UPDATE course_schedules SET slot_mask = ? WHERE id = ?",
+            [(mask_to_bytes(meeting_mask(row['day'], row['start_time'], row['end_time'])), row['id'])
+             for row in cursor.fetchall()]
+        )
+
+    def get_schema_info(self, key: str) -> Optional[str]:
+        """Get a schema bookkeeping value"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT value FROM schema_info WHERE key = ?", (key,))
+            row = cursor.fetchone()
+        return row['value'] if row else None
+
+    def create_indexes(self):
+        """Create the secondary index set if the database has an older version"""
+        if self.get_schema_info('index_version') == str(INDEX_VERSION):
+            return
+
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT name FROM sqlite_master
+                WHERE type = 'index' AND name LIKE 'idx\\_%' ESCAPE '\\'
+            """)
+            existing = {row['name'] for row in cursor.fetchall()}
+
+            # Drop indexes from earlier versions of the set
+            for name in existing - SECONDARY_INDEXES.keys():
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+            for name, target in SECONDARY_INDEXES.items():
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+            cursor.execute("""
+                INSERT OR REPLACE INTO schema_info (key, value) VALUES ('index_version', ?)
+            """, (str(INDEX_VERSION),))
+            conn.commit()
+            # Refresh planner statistics for the new indexes
+            cursor.execute("PRAGMA optimize")
+
     def insert_default_admin(self):
         """Insert default admin user if not exists"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        # Check if admin exists
-        cursor.execute("SELECT * FROM users WHERE username = ?", ('admin',))
-        if cursor.fetchone() is None:
-            # Create default admin (username: admin, password: admin123)
-            password_hash = bcrypt.hashpw('admin123'.encode('utf-8'), bcrypt.gensalt())
-            cursor.execute("""
-                INSERT INTO users (username, password_hash, role)
-                VALUES (?, ?, ?)
-            """, ('admin', password_hash, 'Admin'))
-            conn.commit()
-        
-        self.close()
-    
+        with self.connection() as conn:
+            cursor = conn.cursor()
+
+            # Check if admin exists
+            cursor.execute("SELECT * FROM users WHERE username = ?", ('admin',))
+            if cursor.fetchone() is None:
+                # Create default admin (username: admin, password: admin123)
+                password_hash = bcrypt.hashpw('admin123'.encode('utf-8'), bcrypt.gensalt())
+                try:
+                    cursor.execute("""
+                        INSERT INTO users (username, password_hash, role)
+                        VALUES (?, ?, ?)
+                    """, ('admin', password_hash, 'Admin'))
+                    conn.commit()
+                except sqlite3.IntegrityError:
+                    pass  # Another process created it first
+
     # User Authentication Methods
     def authenticate_user(self, username: str, password: str) -> Optional[Dict]:
         """Authenticate user and return user info"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-        user = cursor.fetchone()
-        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
+            user = cursor.fetchone()
+
+        # Hash check happens after the connection is back in the pool
         if user and bcrypt.checkpw(password.encode('utf-8'), user['password_hash']):
-            self.close()
             return {
                 'id': user['id'],
                 'username': user['username'],
                 'role': user['role'],
                 'student_id': user['student_id']
             }
-        
-        self.close()
+
         return None
-    
+
     def register_user(self, username: str, password: str, role: str, student_id: Optional[int] = None) -> Tuple[bool, str]:
         """Register a new user"""
+        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            
-            password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-            cursor.execute("""
-                INSERT INTO users (username, password_hash, role, student_id)
-                VALUES (?, ?, ?, ?)
-            """, (username, password_hash, role, student_id))
-            
-            conn.commit()
-            self.close()
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO users (username, password_hash, role, student_id)
+                    VALUES (?, ?, ?, ?)
+                """, (username, password_hash, role, student_id))
+                conn.commit()
             return True, "User registered successfully"
         except sqlite3.IntegrityError:
-            self.close()
             return False, "Username already exists"
-    
+
     # Student Methods
     def add_student(self, student_id: str, name: str, email: str, program: str, level: int) -> Tuple[bool, str]:
         """Add a new student"""
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO students (student_id, name, email, program, level)
-                VALUES (?, ?, ?, ?, ?)
-            """, (student_id, name, email, program, level))
-            conn.commit()
-            self.close()
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO students (student_id, name, email, program, level)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (student_id, name, email, program, level))
+                conn.commit()
             return True, "Student added successfully"
         except sqlite3.IntegrityError as e:
-            self.close()
             return False, f"Error: {str(e)}"
-    
+
     def get_student_by_id(self, db_id: int) -> Optional[Dict]:
         """Get student by database ID"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM students WHERE id = ?", (db_id,))
-        student = cursor.fetchone()
-        self.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM students WHERE id = ?", (db_id,))
+            student = cursor.fetchone()
         return dict(student) if student else None
-    
+
+    def get_student_by_student_id(self, student_id: str) -> Optional[Dict]:
+        """Get student by university student ID"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM students WHERE student_id = ?", (student_id,))
+            student = cursor.fetchone()
+        return dict(student) if student else None
+
     def get_all_students(self) -> List[Dict]:
         """Get all students"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM students")
-        students = cursor.fetchall()
-        self.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM students  -- audit: full scan intended: every student is listed")
+            students = cursor.fetchall()
+        return [dict(row) for row in students]
+
+    def search_students(self, query: str, limit: int = 50) -> List[Dict]:
+        """
+        Search students by student ID, name or email
+
+        Every word in the query must match the start of a word in one of
+        those fields, e.g. "ali s0" finds "Alice Smith" with ID "S0042".
+
+        Args:
+            query: Text typed into the search box
+            limit: Maximum number of rows
+
+        Returns:
+            Matching students in ID order; FTS5 returns matches in rowid
+            order, so the LIMIT stops the lookup early instead of ranking
+            every match of a short prefix
+        """
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            if self._student_search_fts is None:
+                cursor.execute("""
+                    SELECT 1 FROM sqlite_master
+                    WHERE type = 'table' AND name = 'students_fts'  -- audit: full scan intended: sqlite_master has no index
+                """)
+                self._student_search_fts = cursor.fetchone() is not None
+
+            if self._student_search_fts:
+                match = " ".join(f'"{term}"*' for term in terms)
+                cursor.execute("""
+                    SELECT s.* FROM students_fts
+                    JOIN students s ON s.id = students_fts.rowid
+                    WHERE students_fts MATCH ?
+                    ORDER BY students_fts.rowid
+                    LIMIT ?
+                """, (match, limit))
+            else:
+                conditions = []
+                params = []
+                for term in terms:
+                    conditions.append("(student_id LIKE ? OR name LIKE ? OR name LIKE ? OR email LIKE ?)")
+                    params.extend([f"{term}%", f"{term}%", f"% {term}%", f"{term}%"])
+                cursor.execute(f"""
+                    SELECT * FROM students WHERE {' AND '.join(conditions)}
+                    ORDER BY id LIMIT ?  -- audit: full scan intended: LIKE fallback without FTS5
+                """, (*params, limit))
+            students = cursor.fetchall()
+        return [dict(row) for row in students]
+
+    def get_students_page(self, after_id: int = 0, limit: int = 200) -> List[Dict]:
+        """
+        Get the next page of students in ID order (keyset pagination)
+
+        Args:
+            after_id: Last ID of the previous page (0 for the first page)
+            limit: Maximum number of rows
+
+        Returns:
+            Up to `limit` students with id > after_id
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM students WHERE id > ? ORDER BY id LIMIT ?",
+                           (after_id, limit))
+            students = cursor.fetchall()
         return [dict(row) for row in students]
-    
+
     # Course Methods
-    def add_course(self, course_code: str, name: str, credits: int, lecture_hours: int, 
+    def add_course(self, course_code: str, name: str, credits: int, lecture_hours: int,
                    lab_hours: int, max_capacity: int, description: str = "") -> Tuple[bool, str]:
         """Add a new course"""
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO courses (course_code, name, credits, lecture_hours, lab_hours, max_capacity, description)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (course_code, name, credits, lecture_hours, lab_hours, max_capacity, description))
-            conn.commit()
-            self.close()
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO courses (course_code, name, credits, lecture_hours, lab_hours, max_capacity, description)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (course_code, name, credits, lecture_hours, lab_hours, max_capacity, description))
+                conn.commit()
+            self.notify_catalog_changed()
             return True, "Course added successfully"
         except sqlite3.IntegrityError:
-            self.close()
             return False, f"Course code '{course_code}' already exists"
-    
+
     def get_all_courses(self) -> List[Dict]:
         """Get all courses"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM courses")
-        courses = cursor.fetchall()
-        self.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM courses  -- audit: full scan intended: every course is listed")
+            courses = cursor.fetchall()
+        return [dict(row) for row in courses]
+
+    def get_courses_page(self, after_id: int = 0, limit: int = 200) -> List[Dict]:
+        """
+        Get the next page of courses in ID order (keyset pagination)
+
+        Args:
+            after_id: Last ID of the previous page (0 for the first page)
+            limit: Maximum number of rows
+
+        Returns:
+            Up to `limit` courses with id > after_id
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM courses WHERE id > ? ORDER BY id LIMIT ?",
+                           (after_id, limit))
+            courses = cursor.fetchall()
         return [dict(row) for row in courses]
-    
+
     def get_course_by_id(self, course_id: int) -> Optional[Dict]:
         """Get course by ID"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM courses WHERE id = ?", (course_id,))
-        course = cursor.fetchone()
-        self.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM courses WHERE id = ?", (course_id,))
+            course = cursor.fetchone()
         return dict(course) if course else None
-    
+
     # Prerequisite Methods
     def add_prerequisite(self, course_code: str, prerequisite_code: str) -> Tuple[bool, str]:
-        """Add a prerequisite for a course"""
-        try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            
+        """
+        Add a prerequisite for a course
+
+        Edges that would make a course (transitively) its own prerequisite
+        are rejected; the check runs in the same write transaction as the
+        insert, so concurrent additions cannot close a cycle either.
+        """
+        def add(cursor):
             # Get course IDs
             cursor.execute("SELECT id FROM courses WHERE course_code = ?", (course_code,))
             course = cursor.fetchone()
             cursor.execute("SELECT id FROM courses WHERE course_code = ?", (prerequisite_code,))
             prereq = cursor.fetchone()
-            
+
             if not course:
-                self.close()
-                return False, f"Course '{course_code}' does not exist"
+                raise TransactionAborted(f"Course '{course_code}' does not exist")
             if not prereq:
-                self.close()
-                return False, f"Prerequisite course '{prerequisite_code}' is not a valid course"
-            
+                raise TransactionAborted(f"Prerequisite course '{prerequisite_code}' is not a valid course")
+            if course['id'] == prereq['id']:
+                raise TransactionAborted("A course cannot be its own prerequisite")
+
+            # Does the prerequisite already require the course, directly or not?
+            cursor.execute("""
+                WITH RECURSIVE required(id) AS (
+                    SELECT prerequisite_course_id FROM prerequisites WHERE course_id = ?
+                    UNION
+                    SELECT p.prerequisite_course_id FROM prerequisites p
+                    JOIN required r ON p.course_id = r.id
+                )
+                SELECT 1 FROM required WHERE id = ? LIMIT 1
+            """, (prereq['id'], course['id']))
+            if cursor.fetchone():
+                raise TransactionAborted(
+                    f"{prerequisite_code} already requires {course_code}; "
+                    f"adding this prerequisite would create a cycle"
+                )
+
             cursor.execute("""
                 INSERT INTO prerequisites (course_id, prerequisite_course_id)
                 VALUES (?, ?)
             """, (course['id'], prereq['id']))
-            
-            conn.commit()
-            self.close()
-            return True, "Prerequisite added successfully"
+
+        try:
+            self.run_in_transaction(add)
+        except TransactionAborted as e:
+            return False, str(e)
         except sqlite3.IntegrityError:
-            self.close()
             return False, "Prerequisite already exists"
-    
+        self.notify_catalog_changed()
+        return True, "Prerequisite added successfully"
+
+    def get_prerequisite_edges(self) -> Tuple[List[Dict], str]:
+        """
+        Load every course and prerequisite edge in one query
+
+        Returns:
+            (rows of id, course_code and prerequisite_course_id (None for
+            courses without prerequisites), prerequisite_version the rows
+            were read at)
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            # One snapshot for the version and the edges. Inside a caller's
+            # transaction (the pool hands back the same connection) that
+            # transaction already is one, and must not be ended here.
+            snapshot = not conn.in_transaction
+            if snapshot:
+                cursor.execute("BEGIN")
+            try:
+                cursor.execute("SELECT value FROM schema_info WHERE key = 'prerequisite_version'")
+                row = cursor.fetchone()
+                version = row['value'] if row else '0'
+                cursor.execute("""
+                    SELECT c.id, c.course_code, p.prerequisite_course_id
+                    FROM courses c
+                    LEFT JOIN prerequisites p ON p.course_id = c.id
+                    ORDER BY c.id, p.prerequisite_course_id  -- audit: full scan intended: the whole prerequisite graph
+                """)
+                edges = [dict(row) for row in cursor.fetchall()]
+            finally:
+                if snapshot:
+                    conn.rollback()
+        return edges, version
+
     def get_course_prerequisites(self, course_id: int) -> List[Dict]:
         """Get all prerequisites for a course"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT c.* FROM courses c
-            JOIN prerequisites p ON c.id = p.prerequisite_course_id
-            WHERE p.course_id = ?
-        """, (course_id,))
-        prereqs = cursor.fetchall()
-        self.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT c.* FROM courses c
+                JOIN prerequisites p ON c.id = p.prerequisite_course_id
+                WHERE p.course_id = ?
+            """, (course_id,))
+            prereqs = cursor.fetchall()
         return [dict(row) for row in prereqs]
-    
+
+    def get_prerequisites_for_courses(self, course_ids: List[int]) -> Dict[int, List[Dict]]:
+        """Get prerequisites for several courses, keyed by course ID"""
+        ids = list(dict.fromkeys(course_ids))
+        prereqs = {course_id: [] for course_id in ids}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(ids):
+                cursor.execute(f"""
+                    SELECT p.course_id AS required_by, c.* FROM courses c
+                    JOIN prerequisites p ON c.id = p.prerequisite_course_id
+                    WHERE p.course_id IN ({', '.join('?' * len(chunk))})
+                    ORDER BY p.course_id, p.prerequisite_course_id
+                """, chunk)
+                for row in cursor.fetchall():
+                    prereq = dict(row)
+                    prereqs[prereq.pop('required_by')].append(prereq)
+        return prereqs
+
     # Program Plan Methods
-    def add_to_program_plan(self, program: str, level: int, semester: int, 
+    def add_to_program_plan(self, program: str, level: int, semester: int,
                             course_code: str, is_elective: bool = False) -> Tuple[bool, str]:
         """Add a course to a program plan"""
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT id FROM courses WHERE course_code = ?", (course_code,))
-            course = cursor.fetchone()
-            
-            if not course:
-                self.close()
-                return False, f"Course '{course_code}' does not exist"
-            
-            cursor.execute("""
-                INSERT INTO program_plans (program, level, semester, course_id, is_elective)
-                VALUES (?, ?, ?, ?, ?)
-            """, (program, level, semester, course['id'], is_elective))
-            
-            conn.commit()
-            self.close()
+            with self.connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute("SELECT id FROM courses WHERE course_code = ?", (course_code,))
+                course = cursor.fetchone()
+
+                if not course:
+                    return False, f"Course '{course_code}' does not exist"
+
+                cursor.execute("""
+                    INSERT INTO program_plans (program, level, semester, course_id, is_elective)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (program, level, semester, course['id'], is_elective))
+
+                conn.commit()
+            self.notify_catalog_changed()
             return True, "Course added to program plan"
         except sqlite3.IntegrityError:
-            self.close()
             return False, "Course already in program plan"
-    
+
     def get_program_plan_courses(self, program: str, level: int, semester: int) -> List[Dict]:
         """Get courses for a specific program, level, and semester"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT c.*, pp.is_elective FROM courses c
-            JOIN program_plans pp ON c.id = pp.course_id
-            WHERE pp.program = ? AND pp.level = ? AND pp.semester = ?
-        """, (program, level, semester))
-        courses = cursor.fetchall()
-        self.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT c.*, pp.is_elective FROM courses c
+                JOIN program_plans pp ON c.id = pp.course_id
+                WHERE pp.program = ? AND pp.level = ? AND pp.semester = ?
+            """, (program, level, semester))
+            courses = cursor.fetchall()
         return [dict(row) for row in courses]
-    
+
+    def get_program_plan_codes(self, program: str, level: int) -> Dict[int, set]:
+        """Get course codes in a program plan for both semesters of a level"""
+        plan_codes = {1: set(), 2: set()}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT pp.semester, c.course_code FROM program_plans pp
+                JOIN courses c ON c.id = pp.course_id
+                WHERE pp.program = ? AND pp.level = ?
+            """, (program, level))
+            for row in cursor.fetchall():
+                plan_codes[row['semester']].add(row['course_code'])
+        return plan_codes
+
+    def get_all_program_plan_codes(self) -> Dict[Tuple[str, int], Dict[int, set]]:
+        """Get plan course codes for every program and level, keyed by (program, level)"""
+        plans = {}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT pp.program, pp.level, pp.semester, c.course_code FROM program_plans pp
+                JOIN courses c ON c.id = pp.course_id
+            """)
+            for row in cursor.fetchall():
+                plan = plans.setdefault((row['program'], row['level']), {1: set(), 2: set()})
+                plan.setdefault(row['semester'], set()).add(row['course_code'])
+        return plans
+
     # Transcript Methods
-    def add_to_transcript(self, student_id: int, course_id: int, grade: str, 
+    def add_to_transcript(self, student_id: int, course_id: int, grade: str,
                          semester_year: str, passed: bool) -> Tuple[bool, str]:
         """Add a course to student's transcript"""
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO transcripts (student_id, course_id, grade, semester_year, passed)
-                VALUES (?, ?, ?, ?, ?)
-            """, (student_id, course_id, grade, semester_year, passed))
-            conn.commit()
-            self.close()
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO transcripts (student_id, course_id, grade, semester_year, passed)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (student_id, course_id, grade, semester_year, passed))
+                conn.commit()
             return True, "Added to transcript"
         except sqlite3.IntegrityError:
-            self.close()
             return False, "Course already in transcript"
-    
+
     def get_student_transcript(self, student_id: int) -> List[Dict]:
         """Get student's complete transcript"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT c.*, t.grade, t.semester_year, t.passed
-            FROM transcripts t
-            JOIN courses c ON t.course_id = c.id
-            WHERE t.student_id = ?
-        """, (student_id,))
-        transcript = cursor.fetchall()
-        self.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT c.*, t.grade, t.semester_year, t.passed
+                FROM transcripts t
+                JOIN courses c ON t.course_id = c.id
+                WHERE t.student_id = ?
+            """, (student_id,))
+            transcript = cursor.fetchall()
         return [dict(row) for row in transcript]
-    
+
+    def get_passed_course_codes(self) -> Dict[int, List[str]]:
+        """Get the codes of every student's passed courses, keyed by student DB ID"""
+        passed = {}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT t.student_id, c.course_code FROM transcripts t
+                JOIN courses c ON c.id = t.course_id
+                WHERE t.passed  -- audit: full scan intended: every student's passed courses
+            """)
+            for row in cursor.fetchall():
+                passed.setdefault(row['student_id'], []).append(row['course_code'])
+        return passed
+
     # Registration Methods
-    def register_student_for_course(self, student_id: int, course_id: int, 
+    def register_student_for_course(self, student_id: int, course_id: int,
                                    semester_year: str) -> Tuple[bool, str]:
         """Register a student for a course"""
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO registrations (student_id, course_id, semester_year, status)
-                VALUES (?, ?, ?, 'Pending')
-            """, (student_id, course_id, semester_year))
-            conn.commit()
-            self.close()
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO registrations (student_id, course_id, semester_year, status)
+                    VALUES (?, ?, ?, 'Pending')
+                """, (student_id, course_id, semester_year))
+                conn.commit()
             return True, "Registration successful"
         except sqlite3.IntegrityError:
-            self.close()
             return False, "Student already registered for this course"
-    
+
+    def register_student_for_courses(self, student_id: int, course_ids: List[int],
+                                     semester_year: str) -> Tuple[bool, str]:
+        """
+        Register a student for several courses atomically
+
+        Capacity is checked and every registration inserted inside one write
+        transaction, so concurrent registrations cannot overfill a course and
+        either all courses are registered or none are.
+        """
+        def register_all(cursor):
+            for course_id in course_ids:
+                cursor.execute("SELECT course_code, max_capacity FROM courses WHERE id = ?", (course_id,))
+                course = cursor.fetchone()
+                if not course:
+                    raise TransactionAborted(f"Course with ID {course_id} does not exist")
+
+                cursor.execute("""
+                    SELECT active_count FROM course_enrollment
+                    WHERE course_id = ? AND semester_year = ?
+                """, (course_id, semester_year))
+                counter = cursor.fetchone()
+                enrollment = counter['active_count'] if counter else 0
+                if enrollment >= course['max_capacity']:
+                    raise TransactionAborted(
+                        f"Course {course['course_code']} is full ({enrollment}/{course['max_capacity']})"
+                    )
+
+                try:
+                    cursor.execute("""
+                        INSERT INTO registrations (student_id, course_id, semester_year, status)
+                        VALUES (?, ?, ?, 'Pending')
+                    """, (student_id, course_id, semester_year))
+                except sqlite3.IntegrityError:
+                    raise TransactionAborted(
+                        f"Student already registered for {course['course_code']}"
+                    )
+
+        try:
+            self.run_in_transaction(register_all)
+        except TransactionAborted as e:
+            return False, str(e)
+        except sqlite3.OperationalError:
+            return False, "The registration system is busy, please try again"
+        return True, f"Successfully registered for {len(course_ids)} courses"
+
     def get_student_registrations(self, student_id: int, semester_year: str) -> List[Dict]:
         """Get student's current registrations"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT c.*, r.status, r.id as registration_id
-            FROM registrations r
-            JOIN courses c ON r.course_id = c.id
-            WHERE r.student_id = ? AND r.semester_year = ? AND r.status != 'Dropped'
-        """, (student_id, semester_year))
-        registrations = cursor.fetchall()
-        self.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT c.*, r.status, r.id as registration_id
+                FROM registrations r
+                JOIN courses c ON r.course_id = c.id
+                WHERE r.student_id = ? AND r.semester_year = ? AND r.status != 'Dropped'
+            """, (student_id, semester_year))
+            registrations = cursor.fetchall()
         return [dict(row) for row in registrations]
-    
-    def drop_registration(self, registration_id: int) -> Tuple[bool, str]:
-        """Drop a course registration"""
-        try:
-            conn = self.connect()
+
+    def get_semester_registrations(self, semester_year: str) -> Dict[int, List[int]]:
+        """
+        Get every student's active registrations for a semester
+
+        Returns:
+            {student DB ID: course IDs in registration order}
+        """
+        registrations = {}
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                UPDATE registrations 
+                SELECT student_id, course_id FROM registrations
+                WHERE semester_year = ? AND status != 'Dropped'
+                ORDER BY id
+            """, (semester_year,))
+            for row in cursor.fetchall():
+                registrations.setdefault(row['student_id'], []).append(row['course_id'])
+        return registrations
+
+    def drop_registration(self, registration_id: int) -> Tuple[bool, str]:
+        """
+        Drop a course registration
+
+        The freed seat goes to the first student on the course's waitlist
+        who stays within MAX_CREDITS, in the same transaction.
+        """
+        def drop(cursor):
+            cursor.execute("""
+                SELECT course_id, semester_year, status FROM registrations WHERE id = ?
+            """, (registration_id,))
+            registration = cursor.fetchone()
+            cursor.execute("""
+                UPDATE registrations
                 SET status = 'Dropped'
                 WHERE id = ?
             """, (registration_id,))
-            conn.commit()
-            self.close()
+            if registration and registration['status'] != 'Dropped':
+                self._promote_from_waitlist(cursor, registration['course_id'],
+                                            registration['semester_year'])
+
+        try:
+            self.run_in_transaction(drop)
             return True, "Course dropped successfully"
-        except:
-            self.close()
+        except sqlite3.Error:
             return False, "Failed to drop course"
-    
-    def get_course_enrollment_count(self, course_id: int, semester_year: str) -> int:
-        """Get current enrollment count for a course"""
-        conn = self.connect()
-        cursor = conn.cursor()
+
+    def _promote_from_waitlist(self, cursor, course_id: int, semester_year: str) -> Optional[int]:
+        """
+        Give a free seat to the first eligible waitlisted student
+
+        Students the course would take over MAX_CREDITS keep their place.
+        Must run inside a write transaction.
+
+        Returns:
+            Database ID of the promoted student, or None
+        """
         cursor.execute("""
-            SELECT COUNT(*) as count FROM registrations
-            WHERE course_id = ? AND semester_year = ? AND status != 'Dropped'
+            SELECT c.credits, c.max_capacity, COALESCE(e.active_count, 0) AS enrollment
+            FROM courses c
+            LEFT JOIN course_enrollment e ON e.course_id = c.id AND e.semester_year = ?
+            WHERE c.id = ?
+        """, (semester_year, course_id))
+        course = cursor.fetchone()
+        if not course or course['enrollment'] >= course['max_capacity']:
+            return None
+
+        # Read the queue lazily on its own cursor; usually the head is eligible
+        queue = cursor.connection.execute("""
+            SELECT id, student_id FROM waitlist
+            WHERE course_id = ? AND semester_year = ?
+            ORDER BY position
         """, (course_id, semester_year))
-        result = cursor.fetchone()
-        self.close()
+        for entry in queue:
+            cursor.execute("""
+                SELECT COALESCE(SUM(c.credits), 0) AS credits
+                FROM registrations r
+                JOIN courses c ON c.id = r.course_id
+                WHERE r.student_id = ? AND r.semester_year = ? AND r.status != 'Dropped'
+            """, (entry['student_id'], semester_year))
+            if cursor.fetchone()['credits'] + course['credits'] > MAX_CREDITS:
+                continue
+
+            cursor.execute("""
+                INSERT INTO registrations (student_id, course_id, semester_year, status)
+                VALUES (?, ?, ?, 'Pending')
+                ON CONFLICT(student_id, course_id, semester_year) DO UPDATE
+                SET status = 'Pending', registration_date = CURRENT_TIMESTAMP
+                WHERE status = 'Dropped'
+            """, (entry['student_id'], course_id, semester_year))
+            registered = cursor.rowcount > 0
+            cursor.execute("DELETE FROM waitlist WHERE id = ?", (entry['id'],))
+            cursor.execute("""
+                UPDATE registration_requests SET status = 'Allocated', note = ?
+                WHERE semester_year = ? AND student_id = ? AND course_id = ?
+            """, ("Promoted from waitlist" if registered else "Already registered",
+                  semester_year, entry['student_id'], course_id))
+            if registered:
+                return entry['student_id']
+            # Already held a seat, so the entry is simply removed
+        return None
+
+    def get_course_enrollment_count(self, course_id: int, semester_year: str) -> int:
+        """Get current enrollment count for a course"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT active_count as count FROM course_enrollment
+                WHERE course_id = ? AND semester_year = ?
+            """, (course_id, semester_year))
+            result = cursor.fetchone()
         return result['count'] if result else 0
-    
+
+    def get_enrollment_counts(self, course_ids: List[int], semester_year: str) -> Dict[int, int]:
+        """Get current enrollment counts for several courses, keyed by course ID"""
+        ids = list(dict.fromkeys(course_ids))
+        counts = {course_id: 0 for course_id in ids}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(ids):
+                cursor.execute(f"""
+                    SELECT course_id, active_count as count FROM course_enrollment
+                    WHERE course_id IN ({', '.join('?' * len(chunk))}) AND semester_year = ?
+                """, (*chunk, semester_year))
+                for row in cursor.fetchall():
+                    counts[row['course_id']] = row['count']
+        return counts
+
+    def _rebuild_enrollment_counts(self, cursor):
+        """Recompute every enrollment counter from the registrations table"""
+        cursor.execute("DELETE FROM course_enrollment")
+        cursor.execute("""
+            INSERT INTO course_enrollment (course_id, semester_year, active_count)
+            SELECT course_id, semester_year, COUNT(*) FROM registrations
+            WHERE status != 'Dropped'
+            GROUP BY course_id, semester_year
+        """)
+
+    def reconcile_enrollment_counts(self, repair: bool = True) -> List[Dict]:
+        """
+        Verify the enrollment counters against the registrations table
+
+        Args:
+            repair: Rebuild all counters if any mismatch is found
+
+        Returns:
+            List of mismatches with course_id, semester_year, stored and actual
+        """
+        def reconcile(cursor):
+            cursor.execute("""
+                SELECT course_id, semester_year,
+                       SUM(stored) AS stored, SUM(actual) AS actual
+                FROM (
+                    SELECT course_id, semester_year, active_count AS stored, 0 AS actual
+                    FROM course_enrollment
+                    UNION ALL
+                    SELECT course_id, semester_year, 0, COUNT(*)
+                    FROM registrations WHERE status != 'Dropped'
+                    GROUP BY course_id, semester_year
+                )
+                GROUP BY course_id, semester_year
+                HAVING SUM(stored) != SUM(actual)  -- audit: full scan intended: checks every enrollment counter
+            """)
+            mismatches = [dict(row) for row in cursor.fetchall()]
+            if mismatches and repair:
+                self._rebuild_enrollment_counts(cursor)
+            return mismatches
+
+        # Hold the write lock so no registration lands between check and rebuild
+        return self.run_in_transaction(reconcile)
+
+    def get_registrations_page(self, semester_year: str, after=None, limit: int = 200,
+                               sort: str = 'course', course_id: Optional[int] = None,
+                               program: Optional[str] = None,
+                               status: Optional[str] = None) -> List[Dict]:
+        """
+        Get the next page of a semester's registrations with student and course details
+
+        Pages are keyset-paginated on the sort columns plus the registration
+        ID, so any page costs the same however deep into the list it is.
+
+        Args:
+            semester_year: Semester to list
+            after: 'sort_key' of the last row of the previous page (None or 0
+                for the first page)
+            limit: Maximum number of rows
+            sort: Key of REGISTRATION_SORTS
+            course_id: Only registrations for this course
+            program: Only students of this program
+            status: Only registrations with this status
+
+        Returns:
+            Rows with id, status, registration_date, student_id, student_name,
+            program, level, course_code, course_name and sort_key
+        """
+        if sort not in REGISTRATION_SORTS:
+            raise ValueError(f"Unknown sort '{sort}'")
+        joins, keys = REGISTRATION_SORTS[sort]
+        keys += ('r.id',)
+
+        # Unless the page is sorted by status, keep the status filter off the
+        # (semester_year, status) index (unary +): otherwise SQLite reads the
+        # whole status range once per outer row instead of seeking by key
+        status_column = 'r.status' if sort == 'status' else '+r.status'
+        conditions = ["r.semester_year = ?"]
+        params = [semester_year]
+        filters = (('r.course_id', course_id), ('s.program', program), (status_column, status))
+        for column, value in filters:
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if after:
+            # Sort columns pinned by a filter are equal on every row, so they
+            # are left out of the bound; the leading-column bound lets the
+            # index skip straight to the page
+            pinned = {column.lstrip('+') for column, value in filters if value is not None}
+            bound = [(key, value) for key, value in zip(keys, after) if key not in pinned]
+            conditions.append(f"{bound[0][0]} >= ?")
+            conditions.append(f"({', '.join(key for key, _ in bound)}) > "
+                              f"({', '.join('?' * len(bound))})")
+            params += [bound[0][1], *(value for _, value in bound)]
+
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT r.id, r.status, r.registration_date,
+                       s.student_id, s.name AS student_name, s.program, s.level,
+                       c.course_code, c.name AS course_name
+                FROM {joins}
+                WHERE {' AND '.join(conditions)}
+                ORDER BY {', '.join(keys)}
+                LIMIT ?
+            """, (*params, limit))
+            rows = [dict(row) for row in cursor.fetchall()]
+
+        columns = [key.split('.')[1] for key in keys]
+        for row in rows:
+            row['sort_key'] = tuple(row[column] for column in columns)
+        return rows
+
+    def get_registration_summary(self, semester_year: str,
+                                 course_id: Optional[int] = None) -> List[Dict]:
+        """
+        Get per-course registration counts for a semester
+
+        Counted in SQL per course and status from the (course_id,
+        semester_year, status) index, without reading the registration rows.
+
+        Args:
+            semester_year: Semester to summarize
+            course_id: Only this course
+
+        Returns:
+            Rows with id, course_code, name, max_capacity, active, pending,
+            approved, dropped and percent_full (active seats / capacity), for
+            every course with registrations, in course code order
+        """
+        course_filter = "WHERE c.id = ?" if course_id is not None else ""
+        # Without a course filter every course of the catalog is summarized
+        scan_note = "" if course_id is not None else "  -- audit: full scan intended: one row per course"
+        params = (semester_year, course_id) if course_id is not None else (semester_year,)
+        active = "SUM(CASE WHEN t.status != 'Dropped' THEN t.count ELSE 0 END)"
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT c.id, c.course_code, c.name, c.max_capacity,
+                       {active} AS active,
+                       SUM(CASE WHEN t.status = 'Pending' THEN t.count ELSE 0 END) AS pending,
+                       SUM(CASE WHEN t.status = 'Approved' THEN t.count ELSE 0 END) AS approved,
+                       SUM(CASE WHEN t.status = 'Dropped' THEN t.count ELSE 0 END) AS dropped,
+                       ROUND(100.0 * {active} / MAX(c.max_capacity, 1), 1) AS percent_full
+                FROM (
+                    SELECT c.id AS course_id, r.status, COUNT(*) AS count
+                    FROM courses c
+                    CROSS JOIN registrations r ON r.course_id = c.id AND r.semester_year = ?
+                    {course_filter}
+                    GROUP BY c.id, r.status
+                ) t
+                JOIN courses c ON c.id = t.course_id
+                GROUP BY c.id
+                ORDER BY c.course_code{scan_note}
+            """, params)
+            summary = cursor.fetchall()
+        return [dict(row) for row in summary]
+
+    # Seat Request Methods
+    def submit_registration_requests(self, student_id: int, course_ids: List[int],
+                                     semester_year: str) -> Tuple[bool, str]:
+        """
+        Record a student's seat requests for the next allocation run
+
+        Replaces the student's still pending requests for the semester;
+        course_ids are in order of preference.
+        """
+        def submit(cursor):
+            cursor.execute("""
+                DELETE FROM registration_requests
+                WHERE semester_year = ? AND student_id = ? AND status = 'Pending'
+            """, (semester_year, student_id))
+            cursor.executemany("""
+                INSERT OR IGNORE INTO registration_requests
+                    (student_id, course_id, semester_year, preference)
+                VALUES (?, ?, ?, ?)
+            """, [(student_id, course_id, semester_year, preference)
+                  for preference, course_id in enumerate(dict.fromkeys(course_ids))])
+
+        try:
+            self.run_in_transaction(submit)
+        except sqlite3.IntegrityError:
+            return False, "One of the requested courses does not exist"
+        except sqlite3.OperationalError:
+            return False, "The registration system is busy, please try again"
+        return True, f"Submitted {len(set(course_ids))} seat requests for {semester_year}"
+
+    def get_student_requests(self, student_id: int, semester_year: str) -> List[Dict]:
+        """
+        Get a student's seat requests with their outcome
+
+        Returns:
+            Course rows with request status, note, preference and
+            waitlist_position (place in the queue, 1 first; 0 unless waitlisted)
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT c.*, q.status, q.note, q.preference,
+                       (SELECT COUNT(*) FROM waitlist ahead
+                        WHERE ahead.course_id = w.course_id AND ahead.semester_year = w.semester_year
+                          AND ahead.position <= w.position) AS waitlist_position
+                FROM registration_requests q
+                JOIN courses c ON c.id = q.course_id
+                LEFT JOIN waitlist w ON w.student_id = q.student_id
+                    AND w.course_id = q.course_id AND w.semester_year = q.semester_year
+                WHERE q.semester_year = ? AND q.student_id = ?
+                ORDER BY q.preference
+            """, (semester_year, student_id))
+            requests = cursor.fetchall()
+        return [dict(row) for row in requests]
+
+    def get_pending_requests(self, semester_year: str) -> List[Dict]:
+        """Get every pending seat request for a semester, by student and preference"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT student_id, course_id, preference FROM registration_requests
+                WHERE semester_year = ? AND status = 'Pending'
+                ORDER BY student_id, preference
+            """, (semester_year,))
+            requests = cursor.fetchall()
+        return [dict(row) for row in requests]
+
+    def get_waitlist_lengths(self, semester_year: str) -> Dict[int, int]:
+        """Get the last waitlist position of each course with a waitlist, keyed by course ID"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT course_id, MAX(position) AS last FROM waitlist
+                WHERE semester_year = ?
+                GROUP BY course_id
+            """, (semester_year,))
+            return {row['course_id']: row['last'] for row in cursor.fetchall()}
+
+    def record_allocation(self, cursor, semester_year: str,
+                          allocated: List[Tuple[int, int]],
+                          waitlisted: List[Tuple[int, int, int]],
+                          rejected: List[Tuple[int, int, str]]):
+        """
+        Write the outcome of an allocation run
+
+        Must be called with the cursor of the write transaction the
+        allocation was computed in (see Database.run_in_transaction).
+
+        Args:
+            cursor: Cursor of the open write transaction
+            semester_year: Semester allocated
+            allocated: (student ID, course ID) pairs given a seat
+            waitlisted: (student ID, course ID, position) waitlist entries
+            rejected: (student ID, course ID, reason) requests turned down
+        """
+        cursor.executemany("""
+            INSERT INTO registrations (student_id, course_id, semester_year, status)
+            VALUES (?, ?, ?, 'Pending')
+            ON CONFLICT(student_id, course_id, semester_year) DO UPDATE
+            SET status = 'Pending', registration_date = CURRENT_TIMESTAMP
+            WHERE status = 'Dropped'
+        """, [(student_id, course_id, semester_year) for student_id, course_id in allocated])
+        cursor.executemany("""
+            INSERT OR IGNORE INTO waitlist (student_id, course_id, semester_year, position)
+            VALUES (?, ?, ?, ?)
+        """, [(student_id, course_id, semester_year, position)
+              for student_id, course_id, position in waitlisted])
+
+        outcomes = [('Allocated', None, student_id, course_id) for student_id, course_id in allocated]
+        outcomes += [('Waitlisted', "Course is full", student_id, course_id)
+                     for student_id, course_id, _ in waitlisted]
+        outcomes += [('Rejected', reason, student_id, course_id)
+                     for student_id, course_id, reason in rejected]
+        cursor.executemany("""
+            UPDATE registration_requests SET status = ?, note = ?
+            WHERE semester_year = ? AND student_id = ? AND course_id = ?
+        """, [(status, note, semester_year, student_id, course_id)
+              for status, note, student_id, course_id in outcomes])
+
     # Schedule Methods
-    def add_course_schedule(self, course_id: int, day: str, start_time: str, 
+    def add_course_schedule(self, course_id: int, day: str, start_time: str,
                           end_time: str, room: str, is_lab: bool, semester_year: str) -> Tuple[bool, str]:
         """Add a schedule for a course"""
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO course_schedules (course_id, day, start_time, end_time, room, is_lab, semester_year)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (course_id, day, start_time, end_time, room, is_lab, semester_year))
-            conn.commit()
-            self.close()
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO course_schedules
+                        (course_id, day, start_time, end_time, room, is_lab, semester_year, slot_mask)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (course_id, day, start_time, end_time, room, is_lab, semester_year,
+                      mask_to_bytes(meeting_mask(day, start_time, end_time))))
+                conn.commit()
+            self.notify_catalog_changed()
             return True, "Schedule added"
         except Exception as e:
-            self.close()
             return False, str(e)
-    
+
     def get_course_schedule(self, course_id: int, semester_year: str) -> List[Dict]:
         """Get schedule for a course"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM course_schedules
-            WHERE course_id = ? AND semester_year = ?
-        """, (course_id, semester_year))
-        schedules = cursor.fetchall()
-        self.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM course_schedules
+                WHERE course_id = ? AND semester_year = ?
+            """, (course_id, semester_year))
+            schedules = cursor.fetchall()
         return [dict(row) for row in schedules]
+
+    def get_schedules_for_courses(self, course_ids: List[int], semester_year: str) -> Dict[int, List[Dict]]:
+        """Get schedules for several courses, keyed by course ID"""
+        ids = list(dict.fromkeys(course_ids))
+        schedules = {course_id: [] for course_id in ids}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(ids):
+                cursor.execute(f"""
+                    SELECT * FROM course_schedules
+                    WHERE course_id IN ({', '.join('?' * len(chunk))}) AND semester_year = ?
+                    ORDER BY id
+                """, (*chunk, semester_year))
+                for row in cursor.fetchall():
+                    schedules[row['course_id']].append(dict(row))
+        return schedules
+
+    def get_slot_masks(self, course_ids: List[int], semester_year: str) -> Dict[int, int]:
+        """
+        Get each course's weekly slot bitmask for a semester
+
+        Two courses conflict exactly when their masks share a bit.
+
+        Returns:
+            {course ID: bitmask}; 0 for courses without meetings
+        """
+        ids = list(dict.fromkeys(course_ids))
+        meetings = {course_id: [] for course_id in ids}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(ids):
+                cursor.execute(f"""
+                    SELECT course_id, day, start_time, end_time, slot_mask FROM course_schedules
+                    WHERE course_id IN ({', '.join('?' * len(chunk))}) AND semester_year = ?
+                """, (*chunk, semester_year))
+                for row in cursor.fetchall():
+                    meetings[row['course_id']].append(row)
+        return {course_id: schedule_mask(rows) for course_id, rows in meetings.items()}
+
+
+# Per-method latency for the instrumentation (a flag check while it is off)
+instrument_methods(Database, exclude=('connection',))
@@ -0,0 +1,397 @@
+"""
+ECE Department Course Registration System - Instrumentation
+Per-method, per-statement and per-phase latency recording for production diagnosis
+
+One process-wide Recorder (RECORDER) collects, for each series:
+call count, total and maximum latency, latency percentiles, and the
+rows returned. The series are:
+
+- method:     every public Database method (rows = length of a list result)
+- sql:        every statement run through a pooled connection, keyed by its
+              normalized text (rows fetched, plus time spent fetching them)
+- connection: opening and closing pooled connections, and waiting for one
+- phase:      the validate_schedule phases: loading the data for each check
+              (load.prereqs, load.capacity, load.conflicts, load.plan),
+              then the checks themselves (credits, prereqs, capacity,
+              conflicts, plan)
+
+Recording is off by default and switched at runtime with enable() and
+disable(), or at startup with COURSE_REG_INSTRUMENT=1. When off, timed
+methods cost one flag check and the pool hands out plain sqlite3
+connections, so statements are not touched at all.
+
+Latencies go into quarter-octave buckets (about 19% wide), so percentiles
+are estimates within that resolution and memory per series is bounded.
+A snapshot can be dumped as JSON or as a Prometheus text file (e.g. for
+node_exporter's textfile collector).
+"""
+
+import functools
+import inspect
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict
+
+INSTRUMENT_ENV = "COURSE_REG_INSTRUMENT"
+
+# Percentiles reported in snapshots
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+# Latency buckets: BUCKETS_PER_OCTAVE per doubling, starting at BUCKET_BASE seconds
+BUCKET_BASE = 1e-6
+BUCKETS_PER_OCTAVE = 4
+
+METRIC_PREFIX = "course_reg"
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_STATEMENT_NAMES = {}  # SQL text -> statement_name, bounded
+
+
+def statement_name(sql: str) -> str:
+    """
+    Series name of a SQL statement
+
+    Whitespace is collapsed and placeholder lists such as IN (?, ?, ?) are
+    folded to (?, ...), so chunked queries with varying list lengths share
+    one series.
+    """
+    name = _STATEMENT_NAMES.get(sql)
+    if name is None:
+        name = _PLACEHOLDER_LIST.sub("?, ...", _WHITESPACE.sub(" ", sql).strip())
+        if len(_STATEMENT_NAMES) < 10000:
+            _STATEMENT_NAMES[sql] = name
+    return name
+
+
+class _Series:
+    """Counters and latency buckets of one (kind, name)"""
+
+    __slots__ = ('calls', 'seconds', 'max_seconds', 'rows', 'fetch_seconds', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.fetch_seconds = 0.0
+        self.buckets = {}  # Bucket index -> calls
+
+    def add(self, seconds: float, rows: int):
+        self.calls += 1
+        self.seconds += seconds
+        self.rows += rows
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        index = _bucket(seconds)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, fraction: float) -> float:
+        """Latency below which `fraction` of the calls fall (bucket midpoint)"""
+        if not self.calls:
+            return 0.0
+        target = fraction * self.calls
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                low, high = _bucket_bounds(index)
+                return min(math.sqrt(low * high) if low else high, self.max_seconds)
+        return self.max_seconds
+
+
+def _bucket(seconds: float) -> int:
+    if seconds <= BUCKET_BASE:
+        return 0
+    return int(math.log2(seconds / BUCKET_BASE) * BUCKETS_PER_OCTAVE) + 1
+
+
+def _bucket_bounds(index: int):
+    if index == 0:
+        return 0.0, BUCKET_BASE
+    return (BUCKET_BASE * 2 ** ((index - 1) / BUCKETS_PER_OCTAVE),
+            BUCKET_BASE * 2 ** (index / BUCKETS_PER_OCTAVE))
+
+
+class _PhaseTimer:
+    """Records the time since the previous lap as the named phase"""
+
+    __slots__ = ('recorder', 'prefix', 'last')
+
+    def __init__(self, recorder: 'Recorder', prefix: str):
+        self.recorder = recorder
+        self.prefix = prefix
+        self.last = time.perf_counter()
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.recorder.record('phase', f"{self.prefix}.{phase}", now - self.last)
+        self.last = now
+
+
+class _NullPhaseTimer:
+    """Phase timer handed out while recording is off"""
+
+    __slots__ = ()
+
+    def lap(self, phase: str):
+        pass
+
+
+_NULL_PHASES = _NullPhaseTimer()
+
+
+class Recorder:
+    """
+    Thread-safe latency recorder
+
+    Attributes:
+        enabled: Whether calls are being recorded; read without a lock on
+            every timed call, so switching takes effect at once
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._series = {}  # (kind, name) -> _Series
+        self._since = time.time()
+
+    def enable(self):
+        """Start recording (existing series are kept)"""
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording (existing series are kept)"""
+        self.enabled = False
+
+    def reset(self):
+        """Drop every series"""
+        with self._lock:
+            self._series = {}
+            self._since = time.time()
+
+    def record(self, kind: str, name: str, seconds: float, rows: int = 0):
+        """Record one call of a series"""
+        if not self.enabled:
+            return
+        with self._lock:
+            series = self._series.get((kind, name))
+            if series is None:
+                series = self._series[kind, name] = _Series()
+            series.add(seconds, rows)
+
+    def record_fetch(self, kind: str, name: str, rows: int, seconds: float):
+        """Add rows fetched after a call to its series, without counting a call"""
+        if not self.enabled:
+            return
+        with self._lock:
+            series = self._series.get((kind, name))
+            if series is None:
+                series = self._series[kind, name] = _Series()
+            series.rows += rows
+            series.fetch_seconds += seconds
+
+    def phases(self, prefix: str):
+        """
+        Timer for consecutive phases of one operation
+
+        Call lap(phase) at the end of each phase; does nothing while
+        recording is off.
+        """
+        return _PhaseTimer(self, prefix) if self.enabled else _NULL_PHASES
+
+    def snapshot(self) -> Dict:
+        """
+        Current series, slowest total first
+
+        Returns:
+            Dict with 'enabled', 'since' (epoch seconds of the last reset),
+            'seconds' (since then) and 'series': one dict per series with
+            'kind', 'name', 'calls', 'total_seconds', 'mean_seconds',
+            'p50_seconds', 'p90_seconds', 'p95_seconds', 'p99_seconds',
+            'max_seconds', 'rows' and 'fetch_seconds'
+        """
+        with self._lock:
+            items = list(self._series.items())
+            since = self._since
+            series = []
+            for (kind, name), data in items:
+                entry = {'kind': kind, 'name': name, 'calls': data.calls,
+                         'total_seconds': data.seconds,
+                         'mean_seconds': data.seconds / data.calls if data.calls else 0.0}
+                for fraction in PERCENTILES:
+                    entry[f"p{round(fraction * 100)}_seconds"] = data.percentile(fraction)
+                entry.update(max_seconds=data.max_seconds, rows=data.rows, fetch_seconds=data.fetch_seconds)
+                series.append(entry)
+        series.sort(key=lambda entry: entry['total_seconds'] + entry['fetch_seconds'], reverse=True)
+        return {'enabled': self.enabled, 'since': since, 'seconds': time.time() - since, 'series': series}
+
+    def to_json(self) -> str:
+        """Snapshot as a JSON document"""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Snapshot in the Prometheus text exposition format"""
+        series = self.snapshot()['series']
+        lines = [
+            f"# HELP {METRIC_PREFIX}_seconds Latency of instrumented calls",
+            f"# TYPE {METRIC_PREFIX}_seconds summary",
+        ]
+        for entry in series:
+            labels = _labels(entry)
+            for fraction in PERCENTILES:
+                lines.append(f'{METRIC_PREFIX}_seconds{{{labels},quantile="{fraction}"}} '
+                             f'{entry[f"p{round(fraction * 100)}_seconds"]:.9g}')
+            lines.append(f"{METRIC_PREFIX}_seconds_sum{{{labels}}} {entry['total_seconds']:.9g}")
+            lines.append(f"{METRIC_PREFIX}_seconds_count{{{labels}}} {entry['calls']}")
+        for metric, key, kind, help_text in (
+                ('rows_total', 'rows', 'counter', "Rows returned by instrumented calls"),
+                ('fetch_seconds_total', 'fetch_seconds', 'counter', "Time spent fetching statement results"),
+                ('max_seconds', 'max_seconds', 'gauge', "Slowest instrumented call")):
+            lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{metric} {kind}")
+            lines.extend(f"{METRIC_PREFIX}_{metric}{{{_labels(entry)}}} {entry[key]:.9g}" for entry in series)
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str):
+        """Write a JSON snapshot, replacing the file atomically"""
+        _write_atomic(path, self.to_json())
+
+    def write_prometheus(self, path: str):
+        """Write a Prometheus text file, replacing it atomically"""
+        _write_atomic(path, self.to_prometheus())
+
+
+def _labels(entry: Dict) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'kind="{escape(entry["kind"])}",name="{escape(entry["name"])}"'
+
+
+def _write_atomic(path: str, text: str):
+    # Scrapers must never see a half-written file
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    os.replace(temporary, path)
+
+
+RECORDER = Recorder(enabled=bool(os.environ.get(INSTRUMENT_ENV)))
+
+
+def timed(kind: str, name: str):
+    """Decorator recording every call of a function while RECORDER is enabled"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not RECORDER.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            rows = 0
+            try:
+                result = function(*args, **kwargs)
+                if isinstance(result, list):
+                    rows = len(result)
+                return result
+            finally:
+                RECORDER.record(kind, name, time.perf_counter() - start, rows)
+        return wrapper
+    return decorate
+
+
+def instrument_methods(cls, kind: str = 'method', exclude=()):
+    """
+    Time every public method defined on a class
+
+    Static and class methods, names starting with '_' and names in
+    `exclude` are left alone. The original function stays reachable as
+    `__wrapped__`.
+    """
+    for name, value in list(vars(cls).items()):
+        if name.startswith('_') or name in exclude or not inspect.isfunction(value):
+            continue
+        setattr(cls, name, timed(kind, f"{cls.__name__}.{name}")(value))
+    return cls
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor recording each statement's execute time and the rows fetched from it"""
+
+    _statement = None
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._statement = statement_name(sql)
+            RECORDER.record('sql', self._statement, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._statement = statement_name(sql)
+            RECORDER.record('sql', self._statement, time.perf_counter() - start)
+
+    def _fetched(self, rows: int, start: float):
+        if self._statement is not None:
+            RECORDER.record_fetch('sql', self._statement, rows, time.perf_counter() - start)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(row is not None, start)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(len(rows), start)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(len(rows), start)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        row = super().__next__()
+        self._fetched(1, start)
+        return row
+
+
+class TimedConnection:
+    """
+    Wrapper around a pooled connection that hands out TimedCursor
+
+    The pool only yields it while RECORDER is enabled, so with recording
+    off callers get the plain sqlite3 connection and pay nothing per
+    statement. Everything but cursor(), execute() and executemany() is
+    passed through to the connection.
+    """
+
+    __slots__ = ('_conn',)
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def cursor(self, factory=TimedCursor):
+        return self._conn.cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
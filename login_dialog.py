@@ -5,11 +5,12 @@ Handles user authentication
 
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QLineEdit, QPushButton, QMessageBox, QGroupBox,
-                             QRadioButton, QButtonGroup)
+                             QRadioButton, QButtonGroup, QProgressBar)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from database import Database
-
+from auth_service import AuthService
+from qt_async import watch_future
 
 class LoginDialog(QDialog):
     """
@@ -20,7 +21,8 @@ class LoginDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.user_info = None
-        self.db = Database()
+        self.db = Database.shared()
+        self.auth = AuthService.shared(self.db)
         self.init_ui()
     
     def init_ui(self):
@@ -89,6 +91,14 @@ class LoginDialog(QDialog):
         
         layout.addLayout(button_layout)
         
+        # Progress feedback while the password check runs in the background
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # Busy indicator
+        self.progress_bar.setFormat("Signing in...")
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+        
         # Info label
         info_label = QLabel("Default Admin: username='admin', password='admin123'")
         info_label.setStyleSheet("color: gray; font-size: 10px;")
@@ -110,8 +120,24 @@ class LoginDialog(QDialog):
             QMessageBox.warning(self, "Login Error", "Please enter both username and password")
             return
         
-        # Authenticate user
-        user_info = self.db.authenticate_user(username, password)
+        # Authenticate user off the GUI thread; bcrypt is slow on purpose
+        self.set_busy(True)
+        watch_future(
+            self.auth.authenticate(username, password), self,
+            lambda user_info: self.on_login_finished(username, user_info),
+            self.on_login_error
+        )
+    
+    def set_busy(self, busy: bool):
+        """Show progress and block input while a login is in flight"""
+        self.progress_bar.setVisible(busy)
+        for widget in (self.username_input, self.password_input,
+                       self.login_button, self.register_button):
+            widget.setEnabled(not busy)
+    
+    def on_login_finished(self, username: str, user_info):
+        """Handle the authentication result"""
+        self.set_busy(False)
         
         if user_info:
             self.user_info = user_info
@@ -124,6 +150,11 @@ class LoginDialog(QDialog):
             self.password_input.clear()
             self.password_input.setFocus()
     
+    def on_login_error(self, error):
+        """Handle a failure inside the authentication worker"""
+        self.set_busy(False)
+        QMessageBox.critical(self, "Login Failed", f"Could not check credentials: {error}")
+    
     def show_register_dialog(self):
         """Show student registration dialog"""
         register_dialog = StudentRegisterDialog(self)
@@ -140,7 +171,8 @@ class StudentRegisterDialog(QDialog):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.db = Database()
+        self.db = Database.shared()
+        self.auth = AuthService.shared(self.db)
         self.init_ui()
     
     def init_ui(self):
@@ -273,17 +305,25 @@ class StudentRegisterDialog(QDialog):
         # Buttons
         button_layout = QHBoxLayout()
         
-        register_button = QPushButton("Register")
-        register_button.clicked.connect(self.handle_register)
+        self.register_button = QPushButton("Register")
+        self.register_button.clicked.connect(self.handle_register)
         
         cancel_button = QPushButton("Cancel")
         cancel_button.clicked.connect(self.reject)
         
-        button_layout.addWidget(register_button)
+        button_layout.addWidget(self.register_button)
         button_layout.addWidget(cancel_button)
         
         layout.addLayout(button_layout)
         
+        # Progress feedback while the password is hashed in the background
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # Busy indicator
+        self.progress_bar.setFormat("Creating account...")
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+        
         self.setLayout(layout)
     
     def handle_register(self):
@@ -322,28 +362,30 @@ class StudentRegisterDialog(QDialog):
                               "Password must be at least 6 characters")
             return
         
-        # Add student to database
-        success, message = self.db.add_student(student_id, name, email, program, level)
+        # Add student and create the user account off the GUI thread
+        self.progress_bar.show()
+        self.register_button.setEnabled(False)
+        watch_future(
+            self.auth.register_student(student_id, name, email, program, level,
+                                       username, password),
+            self, self.on_register_finished, self.on_register_error
+        )
+    
+    def on_register_finished(self, result):
+        """Handle the account creation result"""
+        self.progress_bar.hide()
+        self.register_button.setEnabled(True)
         
+        success, message = result
         if not success:
             QMessageBox.critical(self, "Registration Failed", message)
             return
         
-        # Get the created student's database ID
-        students = self.db.get_all_students()
-        student_db_id = None
-        for s in students:
-            if s['student_id'] == student_id:
-                student_db_id = s['id']
-                break
-        
-        # Create user account
-        success, message = self.db.register_user(username, password, 'Student', student_db_id)
-        
-        if not success:
-            QMessageBox.critical(self, "Registration Failed", 
-                               f"Student created but account failed: {message}")
-            return
-        
         self.accept()
+    
+    def on_register_error(self, error):
+        """Handle a failure inside the registration worker"""
+        self.progress_bar.hide()
+        self.register_button.setEnabled(True)
+        QMessageBox.critical(self, "Registration Failed", str(error))
 
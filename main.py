@@ -27,7 +27,7 @@ class MainApp(QApplication):
         self.setStyle('Fusion')  # Modern look
         
         # Initialize database
-        self.db = Database()
+        self.db = Database.shared()
         
         # Create and show main window
         self.main_window = MainWindow()
@@ -43,7 +43,7 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.current_user = None
-        self.db = Database()
+        self.db = Database.shared()
         
         self.init_ui()
         self.show_login()
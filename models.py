@@ -3,8 +3,13 @@ ECE Department Course Registration System - Core Models
 Contains Course, Student, and RegistrationSystem classes
 """
 
-from typing import List, Dict, Tuple, Optional
-from database import Database
+from typing import Callable, List, Dict, Tuple, Optional
+from catalog_cache import CatalogCache
+from database import Database, MAX_CREDITS, MIN_CREDITS
+from instrumentation import RECORDER
+from prerequisite_graph import PrerequisiteGraph
+from schedule_conflicts import find_overlaps, meeting_interval, time_to_minutes
+from timetable_generator import generate_timetables
 
 
 class Course:
@@ -103,6 +108,15 @@ class Student:
         """
         return sum(course['credits'] for course in self.transcript if course.get('passed', False))
     
+    def get_completed_course_codes(self) -> List[str]:
+        """
+        Get the codes of all passed courses
+        
+        Returns:
+            Course codes from passed transcript entries
+        """
+        return [course['course_code'] for course in self.transcript if course.get('passed', False)]
+    
     def add_to_transcript(self, course: Dict, grade: str, passed: bool):
         """
         Add a course to the student's transcript
@@ -169,12 +183,19 @@ class RegistrationSystem:
     Manages database connections and course validation logic
     """
     
-    def __init__(self):
-        """Initialize the registration system with database connection"""
-        self.db = Database()
+    def __init__(self, db: Optional[Database] = None):
+        """
+        Initialize the registration system with database connection
+        
+        Args:
+            db: Database to use; defaults to the process-wide shared one
+        """
+        self.db = db or Database.shared()
+        self.prereq_graph = PrerequisiteGraph.shared(self.db)
+        self.catalog = CatalogCache.shared(self.db)
     
     def validate_schedule(self, student: Student, selected_courses: List[Dict], 
-                         semester_year: str) -> Tuple[bool, List[str]]:
+                         semester_year: str, check_capacity: bool = True) -> Tuple[bool, List[str]]:
         """
         Validate a student's course selection against all constraints
         
@@ -182,84 +203,143 @@ class RegistrationSystem:
             student: Student object
             selected_courses: List of selected course dictionaries
             semester_year: Current semester/year
+            check_capacity: Reject full courses; seat requests skip this since
+                the allocation run decides who gets the seats
             
+        Returns:
+            Tuple of (is_valid: bool, error_messages: List[str])
+        """
+        # Load everything the checks need in a constant number of queries,
+        # all on one pooled connection; catalog data mostly comes from cache
+        phases = RECORDER.phases('validate_schedule')
+        course_ids = [course['id'] for course in selected_courses]
+        with self.db.connection():
+            blocked_courses = self.prereq_graph.blocked_courses(
+                course_ids, student.get_completed_course_codes()
+            )
+            phases.lap('load.prereqs')
+            enrollment_counts = (self.db.get_enrollment_counts(course_ids, semester_year)
+                                 if check_capacity else None)
+            phases.lap('load.capacity')
+            schedules_by_course = self.catalog.get_schedules_for_courses(course_ids, semester_year)
+            phases.lap('load.conflicts')
+            plan_codes = self.catalog.get_program_plan_codes(student.program, student.level)
+            phases.lap('load.plan')
+        
+        return self.check_selection(student, selected_courses, blocked_courses,
+                                    enrollment_counts, schedules_by_course, plan_codes)
+    
+    @staticmethod
+    def check_selection(student: Student, selected_courses: List[Dict],
+                        blocked_courses: Dict[int, List[str]], enrollment_counts: Dict[int, int],
+                        schedules_by_course: Dict[int, List[Dict]],
+                        plan_codes: Dict[int, set]) -> Tuple[bool, List[str]]:
+        """
+        Run the validate_schedule checks on preloaded data
+        
+        Needs no database access, so batch validation can run it in worker
+        processes.
+        
+        Args:
+            student: Student object (program and level are used)
+            selected_courses: List of selected course dictionaries
+            blocked_courses: Missing prerequisite codes keyed by course ID
+            enrollment_counts: Current enrollment keyed by course ID; None
+                skips the capacity check
+            schedules_by_course: Meetings keyed by course ID
+            plan_codes: Program plan course codes keyed by semester
+        
         Returns:
             Tuple of (is_valid: bool, error_messages: List[str])
         """
         errors = []
+        phases = RECORDER.phases('validate_schedule')
         
         # 1. Check credit hour limits (12-18 credits)
         total_credits = sum(course['credits'] for course in selected_courses)
-        if total_credits < 12:
-            errors.append(f"Total credits ({total_credits}) is below minimum of 12")
-        elif total_credits > 18:
-            errors.append(f"Total credits ({total_credits}) exceeds maximum of 18")
+        if total_credits < MIN_CREDITS:
+            errors.append(f"Total credits ({total_credits}) is below minimum of {MIN_CREDITS}")
+        elif total_credits > MAX_CREDITS:
+            errors.append(f"Total credits ({total_credits}) exceeds maximum of {MAX_CREDITS}")
+        phases.lap('credits')
         
         # 2. Check prerequisites for each course
         for course in selected_courses:
-            prereqs = self.db.get_course_prerequisites(course['id'])
-            if prereqs:
-                missing_prereqs = []
-                for prereq in prereqs:
-                    if not student.has_completed_course(prereq['course_code']):
-                        missing_prereqs.append(prereq['course_code'])
-                
-                if missing_prereqs:
-                    errors.append(
-                        f"Cannot register for {course['course_code']}: "
-                        f"Missing prerequisites: {', '.join(missing_prereqs)}"
-                    )
+            missing_prereqs = blocked_courses.get(course['id'])
+            if missing_prereqs:
+                errors.append(
+                    f"Cannot register for {course['course_code']}: "
+                    f"Missing prerequisites: {', '.join(missing_prereqs)}"
+                )
+        phases.lap('prereqs')
         
         # 3. Check course capacity
-        for course in selected_courses:
-            enrollment = self.db.get_course_enrollment_count(course['id'], semester_year)
-            if enrollment >= course['max_capacity']:
-                errors.append(f"Course {course['course_code']} is full ({enrollment}/{course['max_capacity']})")
+        if enrollment_counts is not None:
+            for course in selected_courses:
+                enrollment = enrollment_counts[course['id']]
+                if enrollment >= course['max_capacity']:
+                    errors.append(f"Course {course['course_code']} is full ({enrollment}/{course['max_capacity']})")
+        phases.lap('capacity')
         
         # 4. Check for schedule conflicts
-        schedule_conflicts = self._check_schedule_conflicts(selected_courses, semester_year)
+        schedule_conflicts = RegistrationSystem._schedule_conflict_messages(
+            selected_courses, schedules_by_course
+        )
         errors.extend(schedule_conflicts)
+        phases.lap('conflicts')
         
         # 5. Check program plan adherence
-        plan_errors = self._check_program_plan(student, selected_courses)
+        plan_errors = RegistrationSystem._program_plan_warnings(student, selected_courses, plan_codes)
         errors.extend(plan_errors)
+        phases.lap('plan')
         
         return len(errors) == 0, errors
     
-    def _check_schedule_conflicts(self, courses: List[Dict], semester_year: str) -> List[str]:
+    def _check_schedule_conflicts(self, courses: List[Dict], semester_year: str,
+                                  schedules_by_course: Optional[Dict[int, List[Dict]]] = None) -> List[str]:
         """
         Check for time conflicts between courses
         
         Args:
             courses: List of course dictionaries
             semester_year: Current semester/year
+            schedules_by_course: Preloaded schedules keyed by course ID
             
         Returns:
             List of conflict error messages
         """
+        if schedules_by_course is None:
+            schedules_by_course = self.catalog.get_schedules_for_courses(
+                [course['id'] for course in courses], semester_year
+            )
+        return self._schedule_conflict_messages(courses, schedules_by_course)
+    
+    @staticmethod
+    def _schedule_conflict_messages(courses: List[Dict],
+                                    schedules_by_course: Dict[int, List[Dict]]) -> List[str]:
+        """Conflict error messages for courses with preloaded schedules"""
         errors = []
         schedules = []
         
         # Gather all schedules
         for course in courses:
-            course_schedules = self.db.get_course_schedule(course['id'], semester_year)
-            for sched in course_schedules:
+            for sched in schedules_by_course.get(course['id'], []):
                 schedules.append({
                     'course': course,
                     'schedule': sched
                 })
         
-        # Check for overlaps
-        for i, entry1 in enumerate(schedules):
-            for entry2 in schedules[i+1:]:
-                if self._schedules_overlap(entry1['schedule'], entry2['schedule']):
-                    errors.append(
-                        f"Schedule conflict: {entry1['course']['course_code']} "
-                        f"{'Lab' if entry1['schedule']['is_lab'] else 'Lecture'} "
-                        f"overlaps with {entry2['course']['course_code']} "
-                        f"{'Lab' if entry2['schedule']['is_lab'] else 'Lecture'} "
-                        f"on {entry1['schedule']['day']}"
-                    )
+        # Check for overlaps (times are parsed once, then swept per day)
+        overlaps = find_overlaps([meeting_interval(entry['schedule']) for entry in schedules])
+        for i, j in overlaps:
+            entry1, entry2 = schedules[i], schedules[j]
+            errors.append(
+                f"Schedule conflict: {entry1['course']['course_code']} "
+                f"{'Lab' if entry1['schedule']['is_lab'] else 'Lecture'} "
+                f"overlaps with {entry2['course']['course_code']} "
+                f"{'Lab' if entry2['schedule']['is_lab'] else 'Lecture'} "
+                f"on {entry1['schedule']['day']}"
+            )
         
         return errors
     
@@ -279,32 +359,35 @@ class RegistrationSystem:
     
     def _time_to_minutes(self, time_str: str) -> int:
         """Convert time string (HH:MM) to minutes since midnight"""
-        try:
-            hours, minutes = map(int, time_str.split(':'))
-            return hours * 60 + minutes
-        except:
-            return 0
+        return time_to_minutes(time_str)
     
-    def _check_program_plan(self, student: Student, courses: List[Dict]) -> List[str]:
+    def _check_program_plan(self, student: Student, courses: List[Dict],
+                            plan_codes: Optional[Dict[int, set]] = None) -> List[str]:
         """
         Check if courses are part of student's program plan
         
         Args:
             student: Student object
             courses: List of course dictionaries
+            plan_codes: Preloaded plan course codes keyed by semester
             
         Returns:
             List of warning messages (not blocking)
         """
+        # Get program plan for student's level
+        if plan_codes is None:
+            plan_codes = self.catalog.get_program_plan_codes(student.program, student.level)
+        return self._program_plan_warnings(student, courses, plan_codes)
+    
+    @staticmethod
+    def _program_plan_warnings(student: Student, courses: List[Dict],
+                               plan_codes: Dict[int, set]) -> List[str]:
+        """Program plan warnings for courses against preloaded plan codes"""
         warnings = []
         
-        # Get program plan for student's level
         for semester in [1, 2]:  # Check both semesters
-            plan_courses = self.db.get_program_plan_courses(student.program, student.level, semester)
-            plan_codes = {c['course_code'] for c in plan_courses}
-            
             for course in courses:
-                if course['course_code'] not in plan_codes:
+                if course['course_code'] not in plan_codes[semester]:
                     # Check if it's in other programs (might be elective)
                     warnings.append(
                         f"Warning: {course['course_code']} is not in the standard "
@@ -332,19 +415,105 @@ class RegistrationSystem:
         if not is_valid:
             return False, "Registration failed:\n" + "\n".join(errors)
         
-        # Register for each course
-        success_count = 0
-        for course in course_list:
-            success, msg = self.db.register_student_for_course(
-                student.id, course['id'], semester_year
-            )
-            if success:
-                success_count += 1
+        # Register for all courses in one transaction; capacity is re-checked
+        # under the write lock since validation above ran without it
+        success, message = self.db.register_student_for_courses(
+            student.id, [course['id'] for course in course_list], semester_year
+        )
         
-        if success_count == len(course_list):
-            return True, f"Successfully registered for {success_count} courses"
+        if success:
+            return True, message
         else:
-            return False, f"Registered for {success_count}/{len(course_list)} courses"
+            return False, "Registration failed:\n" + message
+    
+    def request_seats(self, student: Student, course_list: List[Dict],
+                      semester_year: str) -> Tuple[bool, str]:
+        """
+        Submit a student's selection as seat requests for the allocation run
+        
+        The selection is validated like a registration, except that full
+        courses are accepted: seats are handed out later by seat_allocation.
+        
+        Args:
+            student: Student object
+            course_list: List of course dictionaries, most wanted first
+            semester_year: Current semester/year
+        
+        Returns:
+            Tuple of (success: bool, message: str)
+        """
+        is_valid, errors = self.validate_schedule(student, course_list, semester_year,
+                                                  check_capacity=False)
+        
+        if not is_valid:
+            return False, "Request failed:\n" + "\n".join(errors)
+        
+        return self.db.submit_registration_requests(
+            student.id, [course['id'] for course in course_list], semester_year
+        )
+    
+    def suggest_timetables(self, student: Student, semester_year: str, top_k: int = 5,
+                           time_budget: float = 2.0,
+                           on_found: Optional[Callable[[List[Dict]], None]] = None,
+                           cancelled: Optional[Callable[[], bool]] = None) -> Dict:
+        """
+        Generate the best conflict-free selections from the student's plan
+        
+        Candidates are the plan courses of the student's level (both
+        semesters) that the transcript qualifies for, that still have seats
+        and that the student is not registered for. Meetings of registered
+        courses are kept free, and their credits count toward the
+        semester's 12-18 credit limits. See
+        timetable_generator.generate_timetables for the search and ranking.
+        
+        Args:
+            student: Student object (id, program, level and transcript are used)
+            semester_year: Semester to plan
+            top_k: Number of selections to return
+            time_budget: Seconds the search may take
+            on_found: Called with the best selections so far as they improve
+                (on the calling thread)
+            cancelled: Polled during the search; returning True stops it
+        
+        Returns:
+            generate_timetables result; each timetable also has 'courses',
+            the course dictionaries in catalog order
+        """
+        with self.db.connection():
+            courses = {}
+            for semester in [1, 2]:
+                for course in self.catalog.get_program_plan_courses(student.program, student.level, semester):
+                    courses.setdefault(course['id'], course)
+            registrations = self.db.get_student_registrations(student.id, semester_year)
+            registered = [reg['id'] for reg in registrations]
+            blocked = self.prereq_graph.blocked_courses(list(courses), student.get_completed_course_codes())
+            enrollment = self.db.get_enrollment_counts(list(courses), semester_year)
+            masks = self.catalog.get_slot_masks(list(courses) + registered, semester_year)
+        
+        candidates = [course for course_id, course in courses.items()
+                      if course_id not in blocked and course_id not in registered
+                      and enrollment[course_id] < course['max_capacity']]
+        busy_mask = 0
+        for course_id in registered:
+            busy_mask |= masks[course_id]
+        # Registered credits use up part of the limits; a suggestion adds at least one course
+        registered_credits = sum(reg['credits'] for reg in registrations)
+        min_credits = max(MIN_CREDITS - registered_credits, 1)
+        max_credits = MAX_CREDITS - registered_credits
+        
+        def with_courses(timetables):
+            for timetable in timetables:
+                timetable['courses'] = [courses[course_id] for course_id in timetable['course_ids']]
+            return timetables
+        
+        result = generate_timetables(
+            candidates, masks, min_credits=min_credits, max_credits=max_credits,
+            top_k=top_k, time_budget=time_budget, busy_mask=busy_mask,
+            on_found=(lambda timetables: on_found(with_courses(timetables))) if on_found else None,
+            cancelled=cancelled
+        )
+        with_courses(result['timetables'])
+        return result
     
     def add_course(self, course: Course) -> Tuple[bool, str]:
         """
@@ -374,7 +543,7 @@ class RegistrationSystem:
         Returns:
             List of available courses
         """
-        return self.db.get_program_plan_courses(program, level, semester)
+        return self.catalog.get_program_plan_courses(program, level, semester)
     
     def get_student_info(self, student_id: int) -> Optional[Student]:
         """
@@ -0,0 +1,188 @@
+"""
+ECE Department Course Registration System - Paged Table Models
+Read-only Qt table models that load rows from the database a page at a time
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt, pyqtSignal
+
+from qt_async import watch_future
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Table model backed by keyset pagination
+
+    Pages are appended through canFetchMore/fetchMore as the view scrolls
+    towards the end. Only the most recently used pages are held in memory;
+    older ones are dropped and re-read by key when scrolled back into view.
+    Per page the model keeps just the key it starts after, so memory stays
+    flat however many rows the table has.
+
+    Attributes:
+        columns: (header, row key) for each column
+        fetch_page: Callable(after, limit) returning the rows after key `after`
+        row_key: Callable(row) giving the key the next page starts after
+        page_size: Rows per page
+        max_cached_pages: Pages kept in memory
+    """
+
+    loadFailed = pyqtSignal(object)  # Exception raised by a page fetch
+
+    def __init__(self, columns: List[Tuple[str, str]],
+                 fetch_page: Callable[[Any, int], List[Dict]],
+                 page_size: int = 200, max_cached_pages: int = 10,
+                 async_db=None, parent: Optional[QObject] = None,
+                 row_key: Optional[Callable[[Dict], Any]] = None):
+        """
+        Args:
+            columns: (header, row key) for each column
+            fetch_page: Callable(after, limit) returning the rows after key
+                `after` (0 for the first page), in key order
+            page_size: Rows per page
+            max_cached_pages: Pages kept in memory
+            async_db: Optional AsyncDatabase; when given, new pages are fetched
+                on its worker thread instead of the GUI thread
+            parent: Owning QObject
+            row_key: Key of a row (default: its 'id')
+        """
+        super().__init__(parent)
+        self.columns = columns
+        self.fetch_page = fetch_page
+        self.row_key = row_key or (lambda row: row['id'])
+        self.page_size = page_size
+        self.max_cached_pages = max(1, max_cached_pages)
+        self.async_db = async_db
+
+        self._page_after = []        # Page number -> key the page starts after
+        self._pages = OrderedDict()  # Page number -> rows, least recently used first
+        self._row_count = 0
+        self._next_after = 0
+        self._at_end = False
+        self._pending = None
+        self._generation = 0
+
+    def reset(self):
+        """Drop all rows and start loading again from the first page"""
+        self.beginResetModel()
+        self._page_after.clear()
+        self._pages.clear()
+        self._row_count = 0
+        self._next_after = 0
+        self._at_end = False
+        self._pending = None
+        self._generation += 1  # Results of in-flight fetches are discarded
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def set_fetch_page(self, fetch_page: Callable[[Any, int], List[Dict]],
+                       row_key: Optional[Callable[[Dict], Any]] = None):
+        """Switch the row source (e.g. to search results) and reload"""
+        self.fetch_page = fetch_page
+        if row_key is not None:
+            self.row_key = row_key
+        self.reset()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if (orientation == Qt.Orientation.Horizontal
+                and role == Qt.ItemDataRole.DisplayRole
+                and 0 <= section < len(self.columns)):
+            return self.columns[section][0]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        row = self.row(index.row())
+        if row is None:
+            return None
+        value = row.get(self.columns[index.column()][1])
+        return "" if value is None else str(value)
+
+    def row(self, row: int) -> Optional[Dict]:
+        """
+        Get the row dict at a model row
+
+        Returns:
+            Row dict, or None if the row no longer exists in the database
+        """
+        if not 0 <= row < self._row_count:
+            return None
+        page, offset = divmod(row, self.page_size)
+        rows = self._page(page)
+        return rows[offset] if offset < len(rows) else None
+
+    def cached_pages(self) -> int:
+        """Number of pages currently held in memory"""
+        return len(self._pages)
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and not self._at_end and self._pending is None
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        after = self._next_after
+        generation = self._generation
+        if self.async_db is None:
+            self._append_page(generation, after, self.fetch_page(after, self.page_size))
+            return
+
+        future = self.async_db.submit(self.fetch_page, after, self.page_size)
+        self._pending = future
+        watch_future(future, self,
+                     lambda rows: self._append_page(generation, after, rows),
+                     lambda error: self._fetch_failed(generation, error))
+
+    def _page(self, page: int) -> List[Dict]:
+        """Get a page from the cache, re-reading it if it was evicted"""
+        rows = self._pages.get(page)
+        if rows is None:
+            # A single indexed range read; cheap enough for the GUI thread
+            rows = self.fetch_page(self._page_after[page], self.page_size)
+            self._cache(page, rows)
+        else:
+            self._pages.move_to_end(page)
+        return rows
+
+    def _cache(self, page: int, rows: List[Dict]):
+        self._pages[page] = rows
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+
+    def _append_page(self, generation: int, after, rows: List[Dict]):
+        """Add a fetched page at the end of the table"""
+        if generation != self._generation:
+            return
+        self._pending = None
+        if len(rows) < self.page_size:
+            self._at_end = True
+        if not rows:
+            return
+
+        page = len(self._page_after)
+        first = self._row_count
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._page_after.append(after)
+        self._cache(page, rows)
+        self._next_after = self.row_key(rows[-1])
+        self._row_count += len(rows)
+        self.endInsertRows()
+
+    def _fetch_failed(self, generation: int, error: BaseException):
+        if generation != self._generation:
+            return
+        self._pending = None
+        self._at_end = True  # Stop retrying; reset() starts over
+        self.loadFailed.emit(error)
@@ -0,0 +1,262 @@
+"""
+ECE Department Course Registration System - Prerequisite Graph
+In-memory prerequisite DAG with bitset transitive closures
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from database import Database
+
+
+class PrerequisiteGraph:
+    """
+    Cached prerequisite graph for the whole course catalog
+
+    Each course gets a bit position (in course ID order) and every course's
+    direct and transitive prerequisites are held as Python int bitsets, so
+    checks against a transcript are a few AND/NOT operations per course.
+    The graph is loaded in one query and reloaded when the database's
+    prerequisite_version (bumped by triggers on `prerequisites`) changes.
+
+    Attributes:
+        db: Database the graph is loaded from
+        version: prerequisite_version of the loaded graph
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.version = None
+        self._lock = threading.Lock()
+        self._bit = {}      # Course ID -> bit position
+        self._ids = []      # Bit position -> course ID
+        self._codes = []    # Bit position -> course code
+        self._bit_by_code = {}
+        self._direct = []   # Bit position -> bitset of direct prerequisites
+        self._closure = []  # Bit position -> bitset of all (transitive) prerequisites
+
+    @classmethod
+    def shared(cls, db: Database) -> 'PrerequisiteGraph':
+        """Get the process-wide PrerequisiteGraph for a Database"""
+        with cls._shared_lock:
+            graph = cls._shared.get(db.db_name)
+            if graph is None:
+                graph = cls(db)
+                cls._shared[db.db_name] = graph
+            return graph
+
+    def invalidate(self):
+        """Drop the loaded graph; the next query reloads it"""
+        with self._lock:
+            self.version = None
+
+    def refresh(self):
+        """Reload the graph if prerequisites changed since it was loaded"""
+        current = self.db.get_schema_info('prerequisite_version') or '0'
+        with self._lock:
+            if self.version != current:
+                self._load()
+
+    def _load(self):
+        """Load all edges and rebuild the closures (caller holds _lock)"""
+        edges, version = self.db.get_prerequisite_edges()
+
+        bit, ids, codes = {}, [], []
+        prereq_ids = []
+        for row in edges:
+            if row['id'] not in bit:
+                bit[row['id']] = len(ids)
+                ids.append(row['id'])
+                codes.append(row['course_code'])
+                prereq_ids.append([])
+            if row['prerequisite_course_id'] is not None:
+                prereq_ids[bit[row['id']]].append(row['prerequisite_course_id'])
+
+        direct = [0] * len(ids)
+        for position, prereqs in enumerate(prereq_ids):
+            for prereq_id in prereqs:
+                direct[position] |= 1 << bit[prereq_id]
+
+        self._bit = bit
+        self._ids = ids
+        self._codes = codes
+        self._bit_by_code = {code: position for position, code in enumerate(codes)}
+        self._direct = direct
+        self._closure = self._transitive_closure(direct)
+        self.version = version
+
+    @staticmethod
+    def _transitive_closure(direct: List[int]) -> List[int]:
+        """
+        Compute each course's transitive prerequisites
+
+        Courses are closed in topological order (prerequisites first), so each
+        closure is its direct set ORed with its prerequisites' closures. Any
+        courses caught in a cycle (only possible in data written before cycle
+        checks existed) are closed by iterating to a fixpoint.
+        """
+        count = len(direct)
+        dependents = [[] for _ in range(count)]
+        pending = [0] * count
+        for position, mask in enumerate(direct):
+            for prereq in _bits(mask):
+                dependents[prereq].append(position)
+                pending[position] += 1
+
+        closure = list(direct)
+        ready = [position for position in range(count) if pending[position] == 0]
+        closed = 0
+        while ready:
+            position = ready.pop()
+            closed += 1
+            for prereq in _bits(direct[position]):
+                closure[position] |= closure[prereq]
+            for dependent in dependents[position]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+
+        if closed < count:
+            cyclic = [position for position in range(count) if pending[position] > 0]
+            changed = True
+            while changed:
+                changed = False
+                for position in cyclic:
+                    mask = closure[position]
+                    for prereq in _bits(mask):
+                        mask |= closure[prereq]
+                    if mask != closure[position]:
+                        closure[position] = mask
+                        changed = True
+        return closure
+
+    def _mask(self, course_codes: Iterable[str]) -> int:
+        """Bitset of the given course codes (unknown codes are ignored)"""
+        mask = 0
+        for code in course_codes:
+            position = self._bit_by_code.get(code)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+    def _codes_of(self, mask: int) -> List[str]:
+        return [self._codes[position] for position in _bits(mask)]
+
+    def prerequisites(self, course_id: int) -> List[str]:
+        """Codes of a course's direct prerequisites, in course ID order"""
+        self.refresh()
+        with self._lock:
+            position = self._bit.get(course_id)
+            return [] if position is None else self._codes_of(self._direct[position])
+
+    def all_prerequisites(self, course_id: int) -> List[str]:
+        """Codes of every course that must be completed before this one"""
+        self.refresh()
+        with self._lock:
+            position = self._bit.get(course_id)
+            return [] if position is None else self._codes_of(self._closure[position])
+
+    def blocked_courses(self, course_ids: Iterable[int],
+                        completed_codes: Iterable[str]) -> Dict[int, List[str]]:
+        """
+        Find which courses a transcript does not yet qualify for
+
+        Args:
+            course_ids: Selected course IDs
+            completed_codes: Codes of the courses the student has passed
+
+        Returns:
+            {course ID: missing direct prerequisite codes} for every blocked
+            course; courses that can be taken are left out
+        """
+        self.refresh()
+        with self._lock:
+            completed = self._mask(completed_codes)
+            blocked = {}
+            for course_id in course_ids:
+                position = self._bit.get(course_id)
+                if position is None:
+                    continue
+                missing = self._direct[position] & ~completed
+                if missing:
+                    blocked[course_id] = self._codes_of(missing)
+        return blocked
+
+    def find_cycle(self, course_code: str, prerequisite_code: str) -> Optional[List[str]]:
+        """
+        Check whether making `prerequisite_code` a prerequisite of
+        `course_code` would create a cycle
+
+        Returns:
+            The cycle as a list of codes (starting and ending with
+            course_code), or None if the edge is safe
+        """
+        self.refresh()
+        with self._lock:
+            course = self._bit_by_code.get(course_code)
+            prereq = self._bit_by_code.get(prerequisite_code)
+            if course is None or prereq is None:
+                return None
+            if course == prereq:
+                return [course_code, course_code]
+            if not self._closure[prereq] >> course & 1:
+                return None
+            return [course_code] + self._path(prereq, course)
+
+    def _path(self, start: int, target: int) -> List[str]:
+        """Codes along the shortest prerequisite chain from start to target"""
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            position = queue.popleft()
+            if position == target:
+                break
+            for prereq in _bits(self._direct[position]):
+                if prereq not in previous:
+                    previous[prereq] = position
+                    queue.append(prereq)
+
+        path = []
+        position = target
+        while position is not None:
+            path.append(self._codes[position])
+            position = previous[position]
+        return path[::-1]
+
+    def add_prerequisite(self, course_code: str, prerequisite_code: str) -> Tuple[bool, str]:
+        """
+        Add a prerequisite edge, rejecting it if it would create a cycle
+
+        Returns:
+            Tuple of (success: bool, message: str)
+        """
+        cycle = self.find_cycle(course_code, prerequisite_code)
+        if cycle:
+            return False, ("Adding this prerequisite would create a cycle: "
+                           + " -> ".join(cycle))
+        # Database.add_prerequisite repeats the check inside its transaction
+        return self.db.add_prerequisite(course_code, prerequisite_code)
+
+    def stats(self) -> Dict[str, int]:
+        """Courses, direct edges and transitive edges in the loaded graph"""
+        self.refresh()
+        with self._lock:
+            return {
+                'courses': len(self._ids),
+                'edges': sum(bin(mask).count("1") for mask in self._direct),
+                'closure_edges': sum(bin(mask).count("1") for mask in self._closure),
+            }
+
+
+def _bits(mask: int) -> List[int]:
+    """Set bit positions of a bitset, lowest first"""
+    positions = []
+    while mask:
+        low = mask & -mask
+        positions.append(low.bit_length() - 1)
+        mask ^= low
+    return positions
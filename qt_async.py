@@ -0,0 +1,168 @@
+"""
+ECE Department Course Registration System - Qt Async Helpers
+Delivers the outcome of background concurrent.futures work to the GUI thread
+"""
+
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtWidgets import QTableWidget, QTableWidgetItem
+
+
+class FutureWatcher(QObject):
+    """
+    Relays a Future's result or exception to the GUI thread as signals
+
+    The Future completes on a worker thread; emitting a signal from there
+    queues the connected slots onto the thread that owns the watcher.
+    """
+
+    finished = pyqtSignal(object)  # The future's result
+    failed = pyqtSignal(object)    # The exception it raised
+    cancelled = pyqtSignal()       # The future was cancelled before it ran
+
+    def watch(self, future: Future):
+        """Start relaying `future`; connect the signals before calling this"""
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: Future):
+        """Runs on whichever thread completed the future"""
+        try:
+            if future.cancelled():
+                self.cancelled.emit()
+                return
+            error = future.exception()
+            if error is not None:
+                self.failed.emit(error)
+            else:
+                self.finished.emit(future.result())
+        except RuntimeError:
+            pass  # The watcher was deleted along with its widget
+
+
+def watch_future(future: Future, parent: QObject, on_result: Callable,
+                 on_error: Optional[Callable] = None) -> FutureWatcher:
+    """
+    Call on_result(result) or on_error(exception) on the GUI thread once
+    `future` completes
+
+    Args:
+        future: Future running on a worker thread
+        parent: QObject that owns the watcher (usually the calling widget)
+        on_result: Slot receiving the result
+        on_error: Slot receiving an exception; unhandled errors are re-raised
+
+    Returns:
+        The FutureWatcher, owned by `parent`
+    """
+    watcher = FutureWatcher(parent)
+    watcher.finished.connect(on_result)
+    if on_error is not None:
+        watcher.failed.connect(on_error)
+    else:
+        watcher.failed.connect(_reraise)
+    # Clean up once delivered, or once there is nothing to deliver
+    watcher.finished.connect(watcher.deleteLater)
+    watcher.failed.connect(watcher.deleteLater)
+    watcher.cancelled.connect(watcher.deleteLater)
+    watcher.watch(future)
+    return watcher
+
+
+def _reraise(error: BaseException):
+    raise error
+
+
+class LatestRequestLoader(QObject):
+    """
+    Runs background loads and delivers only the newest result per key
+
+    Starting a load for a key cancels the previous one if it has not begun;
+    if it is already running, its result is dropped on arrival. This keeps
+    a slow, stale refresh from overwriting a newer one.
+    """
+
+    def __init__(self, async_db, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.async_db = async_db
+        self._latest = {}  # key -> Future, touched only on the GUI thread
+
+    def load(self, key: str, fn: Callable, *args, on_result: Callable,
+             on_error: Optional[Callable] = None) -> Future:
+        """
+        Run fn(*args) on the async_db worker and pass its result to on_result
+
+        Args:
+            key: Name of the view being loaded; a newer load for the same key
+                supersedes this one
+            fn: Blocking loader, run on the worker thread
+            on_result: GUI-thread slot receiving the result
+            on_error: GUI-thread slot receiving an exception
+
+        Returns:
+            The Future for this load
+        """
+        previous = self._latest.get(key)
+        if previous is not None:
+            previous.cancel()
+
+        future = self.async_db.submit(fn, *args)
+        self._latest[key] = future
+
+        def deliver(result):
+            if self._latest.get(key) is future:
+                del self._latest[key]
+                on_result(result)
+
+        def fail(error):
+            if self._latest.get(key) is future:
+                del self._latest[key]
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    raise error
+
+        watch_future(future, self, deliver, fail)
+        return future
+
+    def is_loading(self, key: str) -> bool:
+        """Check whether a load for `key` is still outstanding"""
+        return key in self._latest
+
+
+class ProgressRelay(QObject):
+    """
+    Relays partial results from a worker thread to GUI-thread slots
+
+    Pass `report` to the background function as its progress callback and
+    connect `progress` to the slot that displays partial results.
+    """
+
+    progress = pyqtSignal(object)
+
+    def report(self, value):
+        """Queue `value` for the connected slots; callable from any thread"""
+        try:
+            self.progress.emit(value)
+        except RuntimeError:
+            pass  # The relay was deleted along with its widget
+
+
+def show_loading_row(table: QTableWidget, text: str = "Loading..."):
+    """
+    Replace a table's rows with a single spanned placeholder row
+
+    Call table.clearSpans() before filling in the real rows.
+    """
+    table.clearSpans()
+    table.setRowCount(1)
+    for col in range(table.columnCount()):
+        table.removeCellWidget(0, col)
+        table.setItem(0, col, None)
+    item = QTableWidgetItem(text)
+    item.setFlags(Qt.ItemFlag.NoItemFlags)
+    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+    table.setItem(0, 0, item)
+    if table.columnCount() > 1:
+        table.setSpan(0, 0, 1, table.columnCount())
@@ -0,0 +1,266 @@
+"""
+ECE Department Course Registration System - Query Plan Audit
+Records every statement Database issues and flags full table scans
+found by EXPLAIN QUERY PLAN
+
+Run from the project root to audit all Database queries against a
+throwaway database; exits with status 1 if any unexpected scan is found:
+    python query_audit.py
+"""
+
+import io
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+from bulk_export import EXPORT_KINDS, export
+from database import REGISTRATION_SORTS, Database
+from seat_allocation import allocate_seats
+
+# Statements that read a whole table on purpose end with this SQL comment,
+# followed by a colon and the reason, e.g.
+#     -- audit: full scan intended: every course is listed
+FULL_SCAN_MARKER = "audit: full scan intended"
+
+_EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')
+_LITERALS = re.compile(r"[Xx]'[0-9A-Fa-f]*'|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"IN \((?:\?, )*\?\)")
+_MARKER_REASON = re.compile(re.escape(FULL_SCAN_MARKER) + r"(?::[ \t]*([^\n]*))?")
+_CTE_NAMES = re.compile(r"(?:\bWITH(?:\s+RECURSIVE)?|,)\s*(\w+)\s*(?:\([^)]*\))?\s*AS\s*\(", re.IGNORECASE)
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and replace literals so equivalent statements match"""
+    sql = " ".join(sql.split())
+    sql = _LITERALS.sub("?", sql)
+    return _IN_LISTS.sub("IN (...)", sql)
+
+
+def marker_reason(sql: str) -> Optional[str]:
+    """
+    Reason given by a statement's FULL_SCAN_MARKER
+
+    Returns:
+        The reason, "" if the marker gives none, or None without a marker
+    """
+    match = _MARKER_REASON.search(sql)
+    if match is None:
+        return None
+    return (match.group(1) or "").strip()
+
+
+def _cte_names(sql: str) -> set:
+    """Names of a statement's common table expressions, and their aliases"""
+    names = set(_CTE_NAMES.findall(sql))
+    for name in list(names):
+        names.update(re.findall(rf"\b(?:FROM|JOIN)\s+{name}\s+(?:AS\s+)?(\w+)", sql, re.IGNORECASE))
+    return names
+
+
+def _derived_names(plan: Iterable[str]) -> set:
+    """Names of the subqueries and CTEs a plan materializes or runs as co-routines"""
+    return {detail.split()[1] for detail in plan if detail.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+
+
+def is_full_scan(detail: str, cte_names: Iterable[str] = ()) -> bool:
+    """
+    Check whether an EXPLAIN QUERY PLAN detail line is an unindexed table scan
+
+    Args:
+        detail: Plan line
+        cte_names: Common table expressions and subqueries of the
+            statement; reading their own rows is not a table scan
+    """
+    if not detail.startswith("SCAN "):
+        return False
+    if detail.startswith("SCAN CONSTANT ROW"):
+        return False
+    if detail.split()[1] in cte_names or detail.startswith("SCAN (subquery-"):
+        return False
+    if " VIRTUAL TABLE INDEX " in detail:
+        # e.g. "INDEX 0:M3" for an FTS5 MATCH; nothing after the colon
+        # means the module was given no constraint to use
+        return detail.endswith(":")
+    return " USING " not in detail
+
+
+class QueryPlanAuditor:
+    """
+    Query plan auditor for a Database
+
+    Use as a context manager around a workload; every statement issued through
+    the Database's connection pool is captured, and report() explains each
+    distinct statement.
+
+    Attributes:
+        db: Database being audited
+        statements: Captured statements (literal values expanded)
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.statements: List[str] = []
+
+    def __enter__(self):
+        self.db.pool.set_trace_callback(self.statements.append)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.pool.set_trace_callback(None)
+        return False
+
+    def report(self) -> List[Dict]:
+        """
+        Explain every distinct captured statement
+
+        Returns:
+            List of dicts with 'sql', 'plan', 'full_scans' and 'problems'
+            for each statement. Scans are reported for every statement
+            not marked with FULL_SCAN_MARKER; reading a whole table on
+            purpose is fine, but the marker has to say why. 'problems'
+            holds the scans and any marker without a reason.
+        """
+        distinct = {}
+        for sql in self.statements:
+            if sql.lstrip().upper().startswith(_EXPLAINABLE):
+                distinct.setdefault(normalize_sql(sql), sql)
+
+        # Explain on a separate connection so the audit does not trace itself
+        conn = sqlite3.connect(self.db.db_name)
+        try:
+            results = []
+            for normalized, sql in distinct.items():
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+                reason = marker_reason(sql)
+                cte_names = _cte_names(sql) | _derived_names(plan)
+                full_scans = [d for d in plan if reason is None and is_full_scan(d, cte_names)]
+                problems = list(full_scans)
+                if reason == "":
+                    problems.append(f"'{FULL_SCAN_MARKER}' gives no reason")
+                results.append({
+                    'sql': normalized,
+                    'plan': plan,
+                    'full_scans': full_scans,
+                    'problems': problems,
+                })
+        finally:
+            conn.close()
+        return results
+
+
+def exercise_database(db: Database):
+    """Call every Database query method once with representative arguments"""
+    semester = "Fall 2025"
+    db.add_course("AUD100", "Audit Course A", 3, 3, 0, 30)
+    db.add_course("AUD200", "Audit Course B", 4, 3, 2, 30)
+    db.add_course("AUD300", "Audit Course C", 3, 3, 0, 1)
+    db.add_prerequisite("AUD200", "AUD100")
+    db.add_prerequisite("AUD100", "AUD200")  # Rejected: would create a cycle
+    db.add_to_program_plan("Computer", 2, 1, "AUD200")
+    db.add_student("A0001", "Audit Student", "audit@ece.edu", "Computer", 2)
+    db.add_student("A0002", "Audit Waitlister", "audit2@ece.edu", "Computer", 2)
+
+    courses = {c['course_code']: c for c in db.get_all_courses()}
+    course_ids = [c['id'] for c in courses.values()]
+    student, waitlister = db.get_all_students()
+    db.search_students("audit stu")
+    db.get_students_page(0, 50)
+    db.get_prerequisite_edges()
+    db.get_courses_page(0, 50)
+
+    db.add_course_schedule(courses['AUD100']['id'], "Sunday", "08:00", "10:00", "A101", False, semester)
+    db.add_to_transcript(student['id'], courses['AUD100']['id'], "A", "Past", True)
+    db.register_user("audit", "audit-pass", "Student", student['id'])
+    db.authenticate_user("audit", "audit-pass")
+    db.register_student_for_course(student['id'], courses['AUD200']['id'], semester)
+    db.register_student_for_courses(student['id'], [courses['AUD100']['id']], semester)
+
+    db.get_student_by_id(student['id'])
+    db.get_student_by_student_id(student['student_id'])
+    db.get_course_by_id(courses['AUD100']['id'])
+    db.get_course_prerequisites(courses['AUD200']['id'])
+    db.get_prerequisites_for_courses(course_ids)
+    db.get_program_plan_courses("Computer", 2, 1)
+    db.get_program_plan_codes("Computer", 2)
+    db.get_student_transcript(student['id'])
+    registrations = db.get_student_registrations(student['id'], semester)
+    db.get_course_enrollment_count(courses['AUD200']['id'], semester)
+    db.get_enrollment_counts(course_ids, semester)
+    db.get_course_schedule(courses['AUD100']['id'], semester)
+    db.get_schedules_for_courses(course_ids, semester)
+    db.get_slot_masks(course_ids, semester)
+    db.get_all_program_plan_codes()
+    db.get_passed_course_codes()
+    db.get_semester_registrations(semester)
+    for sort in REGISTRATION_SORTS:
+        page = db.get_registrations_page(semester, limit=1, sort=sort)
+        db.get_registrations_page(semester, page[0]['sort_key'], 1, sort=sort)
+        db.get_registrations_page(semester, page[0]['sort_key'], 1, sort=sort,
+                                  course_id=courses['AUD200']['id'], program="Computer",
+                                  status="Pending")
+    db.get_registration_summary(semester)
+    db.get_registration_summary(semester, courses['AUD200']['id'])
+    for kind in EXPORT_KINDS:
+        export(db, kind, io.StringIO())
+        export(db, kind, io.StringIO(), semester=semester, program="Computer", course="AUD200")
+
+    # One seat in AUD300: the lottery fills it and waitlists the other
+    # student, who is promoted when the seat is dropped
+    for requester in (student, waitlister):
+        db.submit_registration_requests(requester['id'], [courses['AUD300']['id']], semester)
+    allocate_seats(db, semester, seed=1)
+    for requester in (student, waitlister):
+        db.get_student_requests(requester['id'], semester)
+        for registration in db.get_student_registrations(requester['id'], semester):
+            if registration['course_code'] == 'AUD300':
+                db.drop_registration(registration['registration_id'])
+    db.drop_registration(registrations[0]['registration_id'])
+    db.reconcile_enrollment_counts()
+
+
+def run_audit(db_name: str = None) -> List[Dict]:
+    """
+    Audit every Database query against a database
+
+    Args:
+        db_name: Database file to use; a throwaway one is created if omitted
+
+    Returns:
+        Audit report as returned by QueryPlanAuditor.report()
+    """
+    if db_name is None:
+        with tempfile.TemporaryDirectory() as tmp:
+            return run_audit(os.path.join(tmp, "audit.db"))
+
+    db = Database(db_name)
+    try:
+        with QueryPlanAuditor(db) as auditor:
+            exercise_database(db)
+        return auditor.report()
+    finally:
+        db.close()
+
+
+def main():
+    report = run_audit()
+    flagged = [entry for entry in report if entry['problems']]
+
+    print(f"Audited {len(report)} distinct statements")
+    for entry in flagged:
+        print(f"\n[{'SCAN' if entry['full_scans'] else 'MARKER'}] {entry['sql']}")
+        for detail in entry['plan']:
+            print(f"    {detail}")
+        if not entry['full_scans']:
+            print(f"    {entry['problems'][0]}")
+
+    if flagged:
+        print(f"\n{len(flagged)} statement(s) perform unexpected full table scans or lack a reason")
+        sys.exit(1)
+    print("No unexpected full table scans")
+
+
+if __name__ == "__main__":
+    main()
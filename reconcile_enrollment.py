@@ -0,0 +1,52 @@
+"""
+Reconcile Enrollment Counters for ECE Course Registration System
+Run this script to verify the materialized per-course enrollment counters
+against the registrations table and rebuild them if they have drifted
+"""
+
+import argparse
+import sys
+
+from database import Database
+
+
+def reconcile_enrollment(db_name: str, repair: bool = True) -> int:
+    """
+    Verify (and optionally rebuild) enrollment counters
+
+    Args:
+        db_name: Database file
+        repair: Rebuild the counters when a mismatch is found
+
+    Returns:
+        Number of mismatched (course, semester) counters
+    """
+    db = Database(db_name)
+    mismatches = db.reconcile_enrollment_counts(repair=repair)
+
+    if not mismatches:
+        print("[+] All enrollment counters match the registrations table")
+    for row in mismatches:
+        print(f"   [-] Course {row['course_id']} ({row['semester_year']}): "
+              f"counter {row['stored']}, actual {row['actual']}")
+    if mismatches and repair:
+        print(f"[+] Rebuilt enrollment counters ({len(mismatches)} were wrong)")
+
+    db.close()
+    return len(mismatches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify and rebuild enrollment counters")
+    parser.add_argument("--db", default="ece_course_registration.db", help="Database file")
+    parser.add_argument("--check-only", action="store_true",
+                        help="Report mismatches without rebuilding; exit 1 if any")
+    args = parser.parse_args()
+
+    mismatched = reconcile_enrollment(args.db, repair=not args.check_only)
+    if mismatched and args.check_only:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
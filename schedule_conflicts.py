@@ -0,0 +1,130 @@
+"""
+ECE Department Course Registration System - Schedule Conflict Engine
+Finds overlapping meetings with a per-day sort-and-sweep, and represents
+weekly meeting patterns as slot bitmasks for constant-time conflict checks
+"""
+
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+# (day, start minute, end minute)
+Interval = Tuple[Hashable, int, int]
+
+# Weekly slot bitmasks: bit (day index * SLOTS_PER_DAY + slot) is set when a
+# meeting occupies that 5-minute slot. Masks are exact for times on the
+# 5-minute grid; other times are rounded outwards.
+WEEK_DAYS = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday")
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOT_MASK_BYTES = len(WEEK_DAYS) * SLOTS_PER_DAY // 8
+
+
+def time_to_minutes(time_str: str) -> int:
+    """Convert time string (HH:MM) to minutes since midnight; 0 if unparsable"""
+    try:
+        hours, minutes = map(int, time_str.split(':'))
+        return hours * 60 + minutes
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def meeting_interval(schedule: Dict) -> Interval:
+    """Convert a course_schedules row to a (day, start, end) interval"""
+    return (schedule['day'],
+            time_to_minutes(schedule['start_time']),
+            time_to_minutes(schedule['end_time']))
+
+
+def find_overlaps(intervals: Sequence[Interval]) -> List[Tuple[int, int]]:
+    """
+    Find every pair of overlapping intervals
+
+    Two intervals overlap when they are on the same day and
+    start1 < end2 and start2 < end1 (touching end-to-start is not a
+    conflict). Intervals are grouped by day and swept in start order,
+    keeping only those still running, so the cost is O(n log n) plus the
+    number of overlaps rather than O(n^2).
+
+    Args:
+        intervals: (day, start minute, end minute) tuples
+
+    Returns:
+        (i, j) index pairs with i < j, in the order a nested i/j loop
+        would produce them
+    """
+    by_day = defaultdict(list)
+    for index, (day, start, end) in enumerate(intervals):
+        by_day[day].append((start, end, index))
+
+    pairs = []
+    for meetings in by_day.values():
+        if len(meetings) < 2:
+            continue
+        meetings.sort()
+        active = []  # (start, end, index) of meetings that may still overlap
+        for start, end, index in meetings:
+            # Anything ending by this start cannot overlap a later-starting meeting
+            active = [meeting for meeting in active if meeting[1] > start]
+            for other_start, _, other in active:
+                if other_start < end:
+                    pairs.append((other, index) if other < index else (index, other))
+            active.append((start, end, index))
+
+    pairs.sort()
+    return pairs
+
+
+def meeting_mask(day: str, start_time: str, end_time: str) -> int:
+    """
+    Weekly slot bitmask of one meeting
+
+    Returns:
+        Bitmask of the occupied slots; 0 for days outside WEEK_DAYS and for
+        empty or unparsable times
+    """
+    if day not in WEEK_DAYS:
+        return 0
+    first = max(time_to_minutes(start_time) // SLOT_MINUTES, 0)
+    last = min(-(-time_to_minutes(end_time) // SLOT_MINUTES), SLOTS_PER_DAY)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << (WEEK_DAYS.index(day) * SLOTS_PER_DAY + first)
+
+
+def mask_to_bytes(mask: int) -> bytes:
+    """Fixed-width little-endian encoding for the slot_mask column"""
+    return mask.to_bytes(SLOT_MASK_BYTES, "little")
+
+
+def mask_from_bytes(data: Optional[bytes]) -> int:
+    return int.from_bytes(data, "little") if data else 0
+
+
+def schedule_mask(schedules: Iterable[Dict]) -> int:
+    """
+    Combined slot bitmask of course_schedules rows
+
+    Uses the stored slot_mask where present and computes it otherwise.
+    Rows may be dicts or sqlite3.Row objects.
+    """
+    mask = 0
+    for sched in schedules:
+        if 'slot_mask' in sched.keys() and sched['slot_mask'] is not None:
+            mask |= mask_from_bytes(sched['slot_mask'])
+        else:
+            mask |= meeting_mask(sched['day'], sched['start_time'], sched['end_time'])
+    return mask
+
+
+def mask_start(mask: int) -> Optional[Tuple[int, int]]:
+    """
+    Find where a slot bitmask starts
+
+    Returns:
+        (index into WEEK_DAYS, start minute) of the earliest occupied slot,
+        or None for an empty mask
+    """
+    if not mask:
+        return None
+    day, slot = divmod((mask & -mask).bit_length() - 1, SLOTS_PER_DAY)
+    return day, slot * SLOT_MINUTES
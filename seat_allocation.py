@@ -0,0 +1,159 @@
+"""
+ECE Department Course Registration System - Seat Allocation
+Batch allocation of collected seat requests, with waitlists and a lottery
+
+Students submit ranked seat requests during the request phase (see
+Database.submit_registration_requests). An allocation run then hands out
+seats in rounds: every student's first choice is considered before anyone's
+second choice. Within a round, students with the course in their program
+plan go first, then higher levels, then a seeded lottery. Requests that would
+take a student over MAX_CREDITS are rejected; requests for full courses are
+waitlisted in the same priority order, and dropped seats are passed down the
+waitlist automatically (see Database.drop_registration).
+
+Usage:
+    python seat_allocation.py --semester "Fall 2025" [--seed 2025] [--dry-run]
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from database import Database, DEFAULT_DB_NAME, MAX_CREDITS
+
+
+def solve(requests: List[Dict], courses: Dict[int, Dict], students: Dict[int, Dict],
+          plan_course_ids: Dict[Tuple[str, int], Set[int]], enrollment: Dict[int, int],
+          registered: Dict[int, List[int]], waitlist_lengths: Dict[int, int],
+          rng: random.Random) -> Tuple[List, List, List]:
+    """
+    Decide the outcome of every pending request
+
+    Args:
+        requests: Rows with student_id, course_id and preference
+        courses: Course rows keyed by course ID
+        students: Student rows keyed by student DB ID
+        plan_course_ids: Course IDs in each (program, level) plan
+        enrollment: Current enrollment keyed by course ID
+        registered: Course IDs each student already holds a seat in
+        waitlist_lengths: Last waitlist position of each course
+        rng: Lottery random source
+
+    Returns:
+        (allocated, waitlisted, rejected) as taken by Database.record_allocation
+    """
+    # One lottery number per student, drawn in student ID order so a seed
+    # reproduces the run
+    lottery = {student_id: rng.random() for student_id in sorted({r['student_id'] for r in requests})}
+
+    ordered = []
+    choice = {}
+    for request in sorted(requests, key=lambda r: (r['student_id'], r['preference'])):
+        student_id, course_id = request['student_id'], request['course_id']
+        round_number = choice.get(student_id, 0)
+        choice[student_id] = round_number + 1
+        student = students.get(student_id)
+        if student is None:
+            continue
+        in_plan = course_id in plan_course_ids.get((student['program'], student['level']), ())
+        ordered.append((round_number, not in_plan, -student['level'], lottery[student_id],
+                        student_id, course_id))
+    ordered.sort()
+
+    seats = {course_id: course['max_capacity'] - enrollment.get(course_id, 0)
+             for course_id, course in courses.items()}
+    holding = {student_id: set(course_ids) for student_id, course_ids in registered.items()}
+    credits = {student_id: sum(courses[course_id]['credits'] for course_id in course_ids
+                               if course_id in courses)
+               for student_id, course_ids in holding.items()}
+    positions = dict(waitlist_lengths)
+
+    allocated, waitlisted, rejected = [], [], []
+    for _, _, _, _, student_id, course_id in ordered:
+        course = courses.get(course_id)
+        if course is None:
+            rejected.append((student_id, course_id, "Course no longer exists"))
+        elif course_id in holding.get(student_id, ()):
+            rejected.append((student_id, course_id, "Already registered"))
+        elif credits.get(student_id, 0) + course['credits'] > MAX_CREDITS:
+            rejected.append((student_id, course_id, f"Would exceed the maximum of {MAX_CREDITS} credits"))
+        elif seats[course_id] > 0:
+            seats[course_id] -= 1
+            holding.setdefault(student_id, set()).add(course_id)
+            credits[student_id] = credits.get(student_id, 0) + course['credits']
+            allocated.append((student_id, course_id))
+        else:
+            positions[course_id] = positions.get(course_id, 0) + 1
+            waitlisted.append((student_id, course_id, positions[course_id]))
+    return allocated, waitlisted, rejected
+
+
+def allocate_seats(db: Database, semester_year: str, seed: Optional[int] = None,
+                   dry_run: bool = False) -> Dict:
+    """
+    Run seat allocation for every pending request of a semester
+
+    Loading, solving and writing happen in one write transaction, so no
+    registration can land in between and overfill a course.
+
+    Args:
+        db: Database instance
+        semester_year: Semester to allocate
+        seed: Lottery seed; runs with the same seed and data give the same result
+        dry_run: Compute the outcome but roll it back
+
+    Returns:
+        Summary with counts of requests, allocated, waitlisted and rejected,
+        plus seconds taken
+    """
+    start = time.perf_counter()
+    rng = random.Random(seed)
+
+    def work(cursor):
+        requests = db.get_pending_requests(semester_year)
+        courses = {course['id']: course for course in db.get_all_courses()}
+        students = {student['id']: student for student in db.get_all_students()}
+        ids_by_code = {course['course_code']: course_id for course_id, course in courses.items()}
+        plan_course_ids = {key: {ids_by_code[code] for codes in plan.values() for code in codes}
+                           for key, plan in db.get_all_program_plan_codes().items()}
+        enrollment = db.get_enrollment_counts(list(courses), semester_year)
+        registered = db.get_semester_registrations(semester_year)
+        waitlist_lengths = db.get_waitlist_lengths(semester_year)
+
+        outcome = solve(requests, courses, students, plan_course_ids, enrollment,
+                        registered, waitlist_lengths, rng)
+        db.record_allocation(cursor, semester_year, *outcome)
+        if dry_run:
+            cursor.connection.rollback()
+        return len(requests), outcome
+
+    request_count, (allocated, waitlisted, rejected) = db.run_in_transaction(work)
+    return {
+        'requests': request_count,
+        'allocated': len(allocated),
+        'waitlisted': len(waitlisted),
+        'rejected': len(rejected),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Allocate seats for pending registration requests")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="Database file")
+    parser.add_argument("--semester", required=True, help='Semester, e.g. "Fall 2025"')
+    parser.add_argument("--seed", type=int, default=None, help="Lottery seed (random if omitted)")
+    parser.add_argument("--dry-run", action="store_true", help="Report the outcome without saving it")
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    summary = allocate_seats(db, args.semester, seed=args.seed, dry_run=args.dry_run)
+    db.close()
+
+    print(f"{summary['requests']} requests in {summary['seconds']:.2f}s: "
+          f"{summary['allocated']} allocated, {summary['waitlisted']} waitlisted, "
+          f"{summary['rejected']} rejected" + (" (dry run, nothing saved)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,529 @@
+"""
+ECE Department Course Registration System - Registration Server
+Headless HTTP/JSON API on asyncio for registering without the desktop app
+
+The event loop only parses requests and writes responses. Password checks
+run on the AuthService pool, reads on a bounded thread pool, and every
+write (register, drop) goes through one queue drained by a single writer
+thread, so registrations never compete with each other for SQLite's write
+lock. When too many logins, reads or writes are already waiting, requests
+get 503 with a Retry-After header instead of piling up.
+
+Endpoints (JSON bodies; all but /login and /health need an
+"Authorization: Bearer <token>" header from /login, and /metrics an
+administrator's):
+
+    POST /login       {"username", "password"}      -> {"token", "user"}
+    POST /logout
+    GET  /courses     ?semester=Fall 2025            -> plan courses and missing prerequisites
+    POST /validate    {"course_ids", "semester"}     -> {"valid", "errors"}
+    POST /register    {"course_ids", "semester"}     -> {"success", "message"}
+    POST /drop        {"registration_id", "semester"} -> {"success", "message"}
+    GET  /timetable   ?semester=Fall 2025            -> registrations and their meetings
+    GET  /health                                     -> queue depths, write lock waits
+    GET  /metrics                                    -> instrumentation snapshot (admin only, see instrumentation.py)
+
+With --instrument the server records method, SQL and validation timings;
+--metrics-file also rewrites a Prometheus text file every 15 seconds.
+
+Usage:
+    python -m server [--host 127.0.0.1] [--port 8080] [--db ece_course_registration.db]
+                     [--instrument] [--metrics-file metrics.prom]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from auth_service import AuthService
+from database import Database, DEFAULT_DB_NAME
+from instrumentation import RECORDER
+from models import RegistrationSystem
+
+DEFAULT_SEMESTER = "Fall 2025"
+
+# Threads running read-only requests, and how many may wait for one
+READ_WORKERS = 4
+MAX_PENDING_READS = 256
+
+# Writes waiting for the writer thread before new ones are turned away
+MAX_PENDING_WRITES = 1024
+
+# Password checks in progress or waiting for an AuthService thread
+MAX_PENDING_LOGINS = 64
+
+# Seconds between rewrites of the --metrics-file
+METRICS_INTERVAL = 15.0
+
+# Seconds a login token stays valid, and how many expired ones each login drops at most
+SESSION_TTL = 8 * 60 * 60
+SESSION_SWEEP = 64
+
+# Request size limits (bytes, and header lines per request)
+MAX_HEADER_LINE = 8192
+MAX_HEADERS = 100
+MAX_BODY = 64 * 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+            404: "Not Found", 405: "Method Not Allowed", 409: "Conflict",
+            413: "Payload Too Large", 431: "Request Header Fields Too Large",
+            500: "Internal Server Error", 501: "Not Implemented", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    """Ends a request with an error status and a JSON {"error": message} body"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ServerBusy(HTTPError):
+    """The read pool or write queue is full (503, with Retry-After)"""
+
+    def __init__(self, message: str):
+        super().__init__(503, message)
+
+
+class RegistrationServer:
+    """
+    HTTP/JSON front end for RegistrationSystem
+
+    Attributes:
+        db: Database used by every request
+        reg_system: Validation and registration logic
+        auth: Asynchronous password checks
+        read_workers: Threads running read-only requests
+    """
+
+    def __init__(self, db: Database, read_workers: int = READ_WORKERS,
+                 max_pending_reads: int = MAX_PENDING_READS,
+                 max_pending_writes: int = MAX_PENDING_WRITES,
+                 max_pending_logins: int = MAX_PENDING_LOGINS):
+        self.db = db
+        self.reg_system = RegistrationSystem(db)
+        self.auth = AuthService.shared(db)
+        self.read_workers = read_workers
+        self.reader = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="api-read")
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-write")
+        self._max_pending_reads = max_pending_reads
+        self._pending_reads = 0
+        self._write_queue = asyncio.Queue(maxsize=max_pending_writes)
+        self._max_pending_logins = max_pending_logins
+        self._pending_logins = 0
+        self._writer_task = None
+        self._sessions = {}  # Token -> session dict in login order (only touched on the event loop)
+        self._routes = {
+            ('POST', '/login'): self.login,
+            ('POST', '/logout'): self.logout,
+            ('GET', '/courses'): self.courses,
+            ('POST', '/validate'): self.validate,
+            ('POST', '/register'): self.register,
+            ('POST', '/drop'): self.drop,
+            ('GET', '/timetable'): self.timetable,
+            ('GET', '/health'): self.health,
+            ('GET', '/metrics'): self.metrics,
+        }
+
+    # Work scheduling
+    async def run_read(self, fn: Callable, *args):
+        """Run a read-only call on the read pool, or fail fast if it is saturated"""
+        if self._pending_reads >= self._max_pending_reads:
+            raise ServerBusy("Too many requests in progress, retry shortly")
+        self._pending_reads += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.reader, fn, *args)
+        finally:
+            self._pending_reads -= 1
+
+    async def run_login(self, username: str, password: str) -> Optional[Dict]:
+        """Check a password on the AuthService pool, or fail fast if too many are waiting"""
+        if self._pending_logins >= self._max_pending_logins:
+            raise ServerBusy("Too many logins in progress, retry shortly")
+        self._pending_logins += 1
+        try:
+            return await asyncio.wrap_future(self.auth.authenticate(username, password))
+        finally:
+            self._pending_logins -= 1
+
+    async def run_write(self, fn: Callable, *args):
+        """Queue a call for the single writer thread and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._write_queue.put_nowait((fn, args, future))
+        except asyncio.QueueFull:
+            raise ServerBusy("Too many registrations in progress, retry shortly")
+        return await future
+
+    async def _drain_writes(self):
+        """Writer loop: run queued writes one at a time, in arrival order"""
+        loop = asyncio.get_running_loop()
+        while True:
+            fn, args, future = await self._write_queue.get()
+            try:
+                result = await loop.run_in_executor(self.writer, fn, *args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._write_queue.task_done()
+
+    # Sessions
+    def _session(self, headers: Dict[str, str]) -> Dict:
+        """Session of the request's bearer token"""
+        scheme, _, token = headers.get('authorization', '').partition(' ')
+        session = self._sessions.get(token) if scheme.lower() == 'bearer' else None
+        if session is not None and session['expires'] < time.monotonic():
+            del self._sessions[token]
+            session = None
+        if session is None:
+            raise HTTPError(401, "Login required")
+        return session
+
+    def _new_session(self, user_info: Dict, student) -> str:
+        """Start a session and return its token, dropping sessions that have expired"""
+        # Every session lives SESSION_TTL, so the oldest logins expire first;
+        # tokens that are never presented again are dropped here
+        now = time.monotonic()
+        for token, session in list(itertools.islice(self._sessions.items(), SESSION_SWEEP)):
+            if session['expires'] >= now:
+                break
+            del self._sessions[token]
+        token = secrets.token_urlsafe(32)
+        self._sessions[token] = {'user': user_info, 'student': student, 'expires': now + SESSION_TTL}
+        return token
+
+    def _admin_session(self, headers: Dict[str, str]) -> Dict:
+        session = self._session(headers)
+        if session['user']['role'] != 'Admin':
+            raise HTTPError(403, "Only administrators can use this endpoint")
+        return session
+
+    def _student_session(self, headers: Dict[str, str]) -> Dict:
+        session = self._session(headers)
+        if session['student'] is None:
+            raise HTTPError(403, "Only students can use this endpoint")
+        return session
+
+    # Handlers
+    async def login(self, headers, query, body):
+        username, password = _field(body, 'username', str), _field(body, 'password', str)
+        user_info = await self.run_login(username, password)
+        if user_info is None:
+            raise HTTPError(401, "Invalid username or password")
+
+        student = None
+        if user_info['role'] == 'Student' and user_info['student_id']:
+            student = await self.run_read(self.reg_system.get_student_info, user_info['student_id'])
+            if student is None:
+                raise HTTPError(403, "No student record for this account; contact the department")
+            student.id = user_info['student_id']  # Set database ID
+
+        token = self._new_session(user_info, student)
+        return 200, {'token': token, 'user': user_info}
+
+    async def logout(self, headers, query, body):
+        self._session(headers)
+        self._sessions.pop(headers['authorization'].partition(' ')[2], None)
+        return 200, {'success': True}
+
+    async def courses(self, headers, query, body):
+        student = self._student_session(headers)['student']
+        semester = query.get('semester', DEFAULT_SEMESTER)
+        courses = await self.run_read(self._available_courses, student, semester)
+        return 200, {'semester': semester, 'courses': courses}
+
+    def _available_courses(self, student, semester):
+        """Plan courses of both semesters with missing prerequisites and seats taken"""
+        courses = []
+        for plan_semester in [1, 2]:
+            courses.extend(self.reg_system.get_available_courses(student.program, student.level,
+                                                                 plan_semester))
+        course_ids = [course['id'] for course in courses]
+        blocked = self.reg_system.prereq_graph.blocked_courses(
+            course_ids, student.get_completed_course_codes()
+        )
+        enrollment = self.db.get_enrollment_counts(course_ids, semester)
+        for course in courses:
+            course['missing_prerequisites'] = blocked.get(course['id'], [])
+            course['enrolled'] = enrollment[course['id']]
+        return courses
+
+    async def validate(self, headers, query, body):
+        student = self._student_session(headers)['student']
+        semester = _field(body, 'semester', str, DEFAULT_SEMESTER)
+        course_ids = _course_ids(body)
+        valid, errors = await self.run_read(self._validate, student, course_ids, semester)
+        return 200, {'valid': valid, 'errors': errors}
+
+    def _validate(self, student, course_ids, semester):
+        return self.reg_system.validate_schedule(student, self._courses(course_ids), semester)
+
+    async def register(self, headers, query, body):
+        student = self._student_session(headers)['student']
+        semester = _field(body, 'semester', str, DEFAULT_SEMESTER)
+        course_ids = _course_ids(body)
+        success, message = await self.run_write(self._register, student, course_ids, semester)
+        return (200 if success else 409), {'success': success, 'message': message}
+
+    def _register(self, student, course_ids, semester):
+        return self.reg_system.register_student(student, self._courses(course_ids), semester)
+
+    async def drop(self, headers, query, body):
+        student = self._student_session(headers)['student']
+        semester = _field(body, 'semester', str, DEFAULT_SEMESTER)
+        registration_id = _field(body, 'registration_id', int)
+        success, message = await self.run_write(self._drop, student, registration_id, semester)
+        return (200 if success else 409), {'success': success, 'message': message}
+
+    def _drop(self, student, registration_id, semester):
+        owned = {reg['registration_id'] for reg in self.db.get_student_registrations(student.id, semester)}
+        if registration_id not in owned:
+            return False, "You have no such registration this semester"
+        return self.db.drop_registration(registration_id)
+
+    async def timetable(self, headers, query, body):
+        student = self._student_session(headers)['student']
+        semester = query.get('semester', DEFAULT_SEMESTER)
+        registrations = await self.run_read(self._timetable, student, semester)
+        return 200, {'semester': semester, 'registrations': registrations}
+
+    def _timetable(self, student, semester):
+        """Active registrations, each with its meetings"""
+        registrations = self.db.get_student_registrations(student.id, semester)
+        schedules = self.reg_system.catalog.get_schedules_for_courses(
+            [reg['id'] for reg in registrations], semester
+        )
+        for reg in registrations:
+            reg['meetings'] = [{key: meeting[key]
+                                for key in ('day', 'start_time', 'end_time', 'room', 'is_lab')}
+                               for meeting in schedules[reg['id']]]
+        return registrations
+
+    async def health(self, headers, query, body):
+        return 200, {'status': 'ok', 'pending_logins': self._pending_logins,
+                     'pending_reads': self._pending_reads,
+                     'pending_writes': self._write_queue.qsize(),
+                     'transactions': self.db.transaction_stats()}
+
+    async def metrics(self, headers, query, body):
+        self._admin_session(headers)  # Timings and statement text are for staff only
+        return 200, RECORDER.snapshot()
+
+    def _courses(self, course_ids):
+        """Course rows for IDs from a request (runs on a worker thread)"""
+        courses = []
+        for course_id in course_ids:
+            course = self.db.get_course_by_id(course_id)
+            if course is None:
+                raise HTTPError(400, f"Unknown course ID {course_id}")
+            courses.append(course)
+        return courses
+
+    # HTTP
+    async def dispatch(self, method: str, target: str, headers: Dict[str, str],
+                       body: bytes) -> Tuple[int, Dict]:
+        """Route one request to its handler and turn errors into responses"""
+        url = urlsplit(target)
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self._routes):
+                return 405, {'error': f"{method} not allowed on {url.path}"}
+            return 404, {'error': f"No endpoint {url.path}"}
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            payload = json.loads(body) if body else {}
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return 400, {'error': "Request body is not valid JSON"}
+        if not isinstance(payload, dict):
+            return 400, {'error': "Request body must be a JSON object"}
+
+        try:
+            return await handler(headers, query, payload)
+        except HTTPError as e:
+            return e.status, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f"Internal error: {e}"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one keep-alive connection"""
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HTTPError as e:
+                    writer.write(_response(e.status, {'error': str(e)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, target, version, headers, body = request
+                status, payload = await self.dispatch(method, target, headers, body)
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """Start the writer loop and listen for connections"""
+        self._writer_task = asyncio.create_task(self._drain_writes())
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_LINE)
+
+    def shutdown(self):
+        """Stop the writer loop and the worker pools"""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+        self.reader.shutdown(wait=True)
+        self.writer.shutdown(wait=True)
+
+
+def _field(body: Dict, name: str, kind: type, default=None):
+    """A typed field of a JSON body; required unless a default is given"""
+    value = body.get(name, default)
+    if value is None:
+        raise HTTPError(400, f"Missing '{name}'")
+    if not isinstance(value, kind) or isinstance(value, bool):
+        raise HTTPError(400, f"'{name}' must be a {kind.__name__}")
+    return value
+
+
+def _course_ids(body: Dict):
+    course_ids = _field(body, 'course_ids', list)
+    if not course_ids or not all(isinstance(course_id, int) and not isinstance(course_id, bool)
+                                 for course_id in course_ids):
+        raise HTTPError(400, "'course_ids' must be a non-empty list of course IDs")
+    return list(dict.fromkeys(course_ids))
+
+
+async def _read_line(reader: asyncio.StreamReader, what: str) -> bytes:
+    """Read one request or header line, refusing lines over MAX_HEADER_LINE"""
+    try:
+        line = await reader.readline()
+    except ValueError:  # Over the stream's limit; readline has discarded it
+        raise HTTPError(400, f"{what} too long")
+    if len(line) > MAX_HEADER_LINE:
+        raise HTTPError(400, f"{what} too long")
+    return line
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple]:
+    """
+    Read one HTTP/1.x request
+
+    Returns:
+        (method, target, version, headers with lower-case names, body),
+        or None when the client closed the connection
+    """
+    line = await _read_line(reader, "Request line")
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+
+    headers = {}
+    while True:
+        line = await _read_line(reader, "Header line")
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError(431, f"More than {MAX_HEADERS} header lines")
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    # Bodies are only framed by Content-Length; a chunked body would be
+    # read as the next request
+    if 'transfer-encoding' in headers:
+        raise HTTPError(501, "Transfer-Encoding is not supported; send Content-Length")
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY:
+        raise HTTPError(413, f"Request body over {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method.upper(), target, version.upper(), headers, body
+
+
+def _response(status: int, payload: Dict, keep_alive: bool) -> bytes:
+    body = json.dumps(payload).encode('utf-8')
+    headers = [
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if status == 503:
+        headers.append("Retry-After: 1")
+    return ("\r\n".join(headers) + "\r\n\r\n").encode('latin-1') + body
+
+
+async def _write_metrics(path: str):
+    """Rewrite the Prometheus text file every METRICS_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(METRICS_INTERVAL)
+        RECORDER.write_prometheus(path)
+
+
+async def serve(db_name: str, host: str, port: int, read_workers: int,
+                metrics_file: Optional[str] = None):
+    """Run the server until cancelled"""
+    # Connections for the readers, the writer and up to four AuthService threads
+    db = Database(db_name, pool_size=read_workers + 1 + 4)
+    server = RegistrationServer(db, read_workers=read_workers)
+    listener = await server.start(host, port)
+    metrics_task = asyncio.create_task(_write_metrics(metrics_file)) if metrics_file else None
+    print(f"Serving {db_name} on http://{host}:{port} (Ctrl+C to stop)")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        if metrics_task is not None:
+            metrics_task.cancel()
+            RECORDER.write_prometheus(metrics_file)
+        server.shutdown()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless HTTP/JSON registration server")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="Database file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--read-workers", type=int, default=READ_WORKERS,
+                        help="Threads serving read-only requests")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Record method, SQL and validation timings (GET /metrics)")
+    parser.add_argument("--metrics-file", help="Also write them to this Prometheus text file (implies --instrument)")
+    args = parser.parse_args()
+
+    if args.instrument or args.metrics_file:
+        RECORDER.enable()
+    try:
+        asyncio.run(serve(args.db, args.host, args.port, args.read_workers, args.metrics_file))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
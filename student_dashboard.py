@@ -6,11 +6,20 @@ Provides student interface for course registration and timetable viewing
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                              QTabWidget, QTableWidget, QTableWidgetItem, QLineEdit,
                              QMessageBox, QGroupBox, QHeaderView, QListWidget,
-                             QListWidgetItem, QGridLayout, QTextEdit)
+                             QListWidgetItem, QGridLayout, QTextEdit, QCheckBox)
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QColor
-from database import Database
+from database import Database, MAX_CREDITS, MIN_CREDITS
+from async_db import AsyncDatabase
 from models import RegistrationSystem, Student
+from qt_async import LatestRequestLoader, ProgressRelay, show_loading_row
+from schedule_conflicts import mask_start, schedule_mask
+
+# Timetable suggestions shown, and how long the search may run (seconds)
+TIMETABLE_SUGGESTIONS = 5
+TIMETABLE_TIME_BUDGET = 2.0
 
 
 class StudentDashboard(QWidget):
@@ -23,8 +32,14 @@ class StudentDashboard(QWidget):
         super().__init__()
         self.main_window = main_window
         self.user_info = user_info
-        self.db = Database()
-        self.reg_system = RegistrationSystem()
+        self.db = Database.shared()
+        self.reg_system = RegistrationSystem(self.db)
+        self.loader = LatestRequestLoader(AsyncDatabase.shared(self.db), self)
+        # Timetable searches get their own thread so they never hold up queries
+        self.search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="timetable-search")
+        self.search_loader = LatestRequestLoader(self.search_executor, self)
+        self._search_stop = None  # threading.Event of the running search
+        self._search_relay = None  # ProgressRelay of the running search
         
         # Get student information
         self.student = self.reg_system.get_student_info(user_info['student_id'])
@@ -105,6 +120,10 @@ class StudentDashboard(QWidget):
         self.available_courses_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
         left_layout.addWidget(self.available_courses_list)
         
+        self.hide_conflicts_check = QCheckBox("Hide courses that conflict with my timetable")
+        self.hide_conflicts_check.toggled.connect(self.refresh_available_courses)
+        left_layout.addWidget(self.hide_conflicts_check)
+        
         add_btn = QPushButton("Add Selected Course →")
         add_btn.clicked.connect(self.add_course_to_selection)
         left_layout.addWidget(add_btn)
@@ -147,10 +166,38 @@ class StudentDashboard(QWidget):
         register_btn.clicked.connect(self.register_courses)
         right_layout.addWidget(register_btn)
         
+        request_btn = QPushButton("Request Seats (Allocation Run)")
+        request_btn.setToolTip("Submit the selection, most wanted first; full courses are waitlisted")
+        request_btn.clicked.connect(self.request_seats)
+        right_layout.addWidget(request_btn)
+        
         content_layout.addLayout(right_layout, 1)
         
         layout.addLayout(content_layout)
         
+        # Generated timetables, streamed in while the search runs
+        suggestions_group = QGroupBox("Suggested Timetables")
+        suggestions_layout = QVBoxLayout()
+        
+        suggest_row = QHBoxLayout()
+        suggest_btn = QPushButton("Suggest Timetables")
+        suggest_btn.clicked.connect(self.suggest_timetables)
+        suggest_row.addWidget(suggest_btn)
+        self.suggestion_status = QLabel("")
+        suggest_row.addWidget(self.suggestion_status, 1)
+        use_btn = QPushButton("Use Selected Timetable")
+        use_btn.clicked.connect(self.use_suggested_timetable)
+        suggest_row.addWidget(use_btn)
+        suggestions_layout.addLayout(suggest_row)
+        
+        self.suggestions_list = QListWidget()
+        self.suggestions_list.setMaximumHeight(120)
+        self.suggestions_list.itemDoubleClicked.connect(self.use_suggested_timetable)
+        suggestions_layout.addWidget(self.suggestions_list)
+        
+        suggestions_group.setLayout(suggestions_layout)
+        layout.addWidget(suggestions_group)
+        
         # Validation messages area
         self.validation_output = QTextEdit()
         self.validation_output.setReadOnly(True)
@@ -222,6 +269,11 @@ class StudentDashboard(QWidget):
         self.registered_courses_table.setMaximumHeight(200)
         layout.addWidget(self.registered_courses_table)
         
+        # Outcome of seat requests still waiting for a seat
+        self.requests_label = QLabel("")
+        self.requests_label.setWordWrap(True)
+        layout.addWidget(self.requests_label)
+        
         tab.setLayout(layout)
         
         # Load timetable
@@ -285,40 +337,94 @@ class StudentDashboard(QWidget):
             return
         
         self.available_courses_list.clear()
-        
+        loading = QListWidgetItem("Loading courses...")
+        loading.setFlags(Qt.ItemFlag.NoItemFlags)
+        self.available_courses_list.addItem(loading)
+        
+        hide_conflicts_in = None
+        if self.hide_conflicts_check.isChecked():
+            hide_conflicts_in = self.current_semester
+        selected_ids = [course['id'] for course in self.selected_courses]
+        
+        self.loader.load("available_courses", self._load_available_courses,
+                         hide_conflicts_in, selected_ids,
+                         on_result=self._show_available_courses,
+                         on_error=self._show_load_error)
+    
+    def _load_available_courses(self, hide_conflicts_in=None, selected_ids=()):
+        """
+        Load the plan courses and their missing prerequisites (worker thread)
+        
+        Args:
+            hide_conflicts_in: Semester to check for time conflicts with the
+                registered and selected courses, or None to show everything
+            selected_ids: IDs of the courses currently selected
+        
+        Returns:
+            List of (course, missing prerequisite codes) tuples
+        """
         # Get courses for both semesters of current level
+        courses = []
         for semester in [1, 2]:
-            courses = self.db.get_program_plan_courses(
+            courses.extend(self.reg_system.catalog.get_program_plan_courses(
                 self.student.program, self.student.level, semester
-            )
+            ))
+        
+        if hide_conflicts_in:
+            courses = self._without_conflicts(courses, hide_conflicts_in, selected_ids)
+        
+        # Check prerequisites against the transcript in one pass
+        blocked = self.reg_system.prereq_graph.blocked_courses(
+            [course['id'] for course in courses], self.student.get_completed_course_codes()
+        )
+        return [(course, blocked.get(course['id'], [])) for course in courses]
+    
+    def _without_conflicts(self, courses, semester, selected_ids):
+        """
+        Drop courses whose meetings clash with the student's registered or
+        selected courses (one AND of weekly slot bitmasks per course)
+        """
+        taken_ids = {reg['id'] for reg in self.db.get_student_registrations(self.student.id, semester)}
+        taken_ids.update(selected_ids)
+        masks = self.reg_system.catalog.get_slot_masks(
+            [course['id'] for course in courses] + list(taken_ids), semester
+        )
+        
+        busy = 0
+        for course_id in taken_ids:
+            busy |= masks[course_id]
+        
+        # Courses already taken or selected stay listed
+        return [course for course in courses
+                if course['id'] in taken_ids or not masks[course['id']] & busy]
+    
+    def _show_available_courses(self, rows):
+        """Fill the available courses list from _load_available_courses"""
+        self.available_courses_list.clear()
+        
+        for course, missing_prereqs in rows:
+            can_take = not missing_prereqs
             
-            for course in courses:
-                # Check prerequisites
-                prereqs = self.db.get_course_prerequisites(course['id'])
-                can_take = True
-                missing_prereqs = []
-                
-                for prereq in prereqs:
-                    if not self.student.has_completed_course(prereq['course_code']):
-                        can_take = False
-                        missing_prereqs.append(prereq['course_code'])
-                
-                # Create list item
-                item_text = f"{course['course_code']} - {course['name']} ({course['credits']} cr)"
-                
-                if not can_take:
-                    item_text += f" [Missing: {', '.join(missing_prereqs)}]"
-                
-                item = QListWidgetItem(item_text)
-                item.setData(Qt.ItemDataRole.UserRole, course)  # Store course data
-                
-                # Color code based on prerequisites
-                if not can_take:
-                    item.setForeground(QColor("red"))
-                else:
-                    item.setForeground(QColor("green"))
-                
-                self.available_courses_list.addItem(item)
+            # Create list item
+            item_text = f"{course['course_code']} - {course['name']} ({course['credits']} cr)"
+            
+            if not can_take:
+                item_text += f" [Missing: {', '.join(missing_prereqs)}]"
+            
+            item = QListWidgetItem(item_text)
+            item.setData(Qt.ItemDataRole.UserRole, course)  # Store course data
+            
+            # Color code based on prerequisites
+            if not can_take:
+                item.setForeground(QColor("red"))
+            else:
+                item.setForeground(QColor("green"))
+            
+            self.available_courses_list.addItem(item)
+    
+    def _show_load_error(self, error):
+        """Report a failed background load"""
+        QMessageBox.critical(self, "Error", f"Failed to load data: {error}")
     
     def add_course_to_selection(self):
         """Add selected course to registration list"""
@@ -357,6 +463,10 @@ class StudentDashboard(QWidget):
         
         self.credits_label.setText(f"Total Credits: {total_credits}")
         
+        # What conflicts depends on the selection
+        if self.hide_conflicts_check.isChecked():
+            self.refresh_available_courses()
+        
         # Color code based on credit limits
         if total_credits < 12:
             self.credits_label.setStyleSheet("font-size: 14px; font-weight: bold; color: red;")
@@ -365,6 +475,84 @@ class StudentDashboard(QWidget):
         else:
             self.credits_label.setStyleSheet("font-size: 14px; font-weight: bold; color: green;")
     
+    def suggest_timetables(self):
+        """Search for conflict-free timetables in the background, showing them as they are found"""
+        if not self.student:
+            return
+        
+        if self._search_stop is not None:
+            self._search_stop.set()  # A superseded search stops at its next check
+        stop = threading.Event()
+        self._search_stop = stop
+        
+        # The superseded search's result is dropped, so its relay is freed here
+        self._release_search_relay()
+        relay = ProgressRelay(self)
+        relay.progress.connect(lambda timetables: self._show_suggestions(timetables, stop))
+        self._search_relay = relay
+        
+        self.suggestions_list.clear()
+        self.suggestion_status.setText("Searching...")
+        self.search_loader.load("suggestions", self.reg_system.suggest_timetables,
+                                self.student, self.current_semester,
+                                TIMETABLE_SUGGESTIONS, TIMETABLE_TIME_BUDGET,
+                                relay.report, stop.is_set,
+                                on_result=self._finish_suggestions,
+                                on_error=self._suggestions_failed)
+    
+    def _release_search_relay(self):
+        """Free the progress relay of the current search, if any"""
+        if self._search_relay is not None:
+            self._search_relay.deleteLater()
+            self._search_relay = None
+    
+    def _show_suggestions(self, timetables, stop=None):
+        """Fill the suggestions list; partial results of a superseded search are ignored"""
+        if stop is not None and stop is not self._search_stop:
+            return
+        
+        self.suggestions_list.clear()
+        for timetable in timetables:
+            codes = ", ".join(course['course_code'] for course in timetable['courses'])
+            item = QListWidgetItem(f"{codes} ({timetable['credits']} cr, "
+                                   f"{timetable['days']} days on campus)")
+            item.setData(Qt.ItemDataRole.UserRole, timetable['courses'])
+            self.suggestions_list.addItem(item)
+        if stop is not None:
+            self.suggestion_status.setText(f"Searching... {len(timetables)} found so far")
+    
+    def _suggestions_failed(self, error):
+        """Report a failed search"""
+        self._release_search_relay()
+        self._search_stop = None
+        self.suggestion_status.setText("")
+        self._show_load_error(error)
+    
+    def _finish_suggestions(self, result):
+        """Show the final search result"""
+        self._release_search_relay()
+        self._search_stop = None
+        self._show_suggestions(result['timetables'])
+        
+        if not result['timetables']:
+            status = f"No conflict-free timetable of {MIN_CREDITS}-{MAX_CREDITS} credits fits your plan"
+        else:
+            count = len(result['timetables'])
+            status = f"{count} timetable{'s' if count != 1 else ''} found in {result['seconds']:.1f}s"
+        if not result['complete']:
+            status += " (time limit reached; best found so far)"
+        self.suggestion_status.setText(status)
+    
+    def use_suggested_timetable(self):
+        """Replace the selection with the highlighted suggestion"""
+        current_item = self.suggestions_list.currentItem()
+        if not current_item:
+            QMessageBox.warning(self, "Warning", "Please select a suggested timetable first")
+            return
+        
+        self.selected_courses = list(current_item.data(Qt.ItemDataRole.UserRole))
+        self.refresh_selected_courses()
+    
     def validate_schedule(self):
         """Validate selected courses"""
         if not self.selected_courses:
@@ -431,6 +619,29 @@ class StudentDashboard(QWidget):
         else:
             QMessageBox.critical(self, "Error", message)
     
+    def request_seats(self):
+        """Submit the selected courses as seat requests for the allocation run"""
+        if not self.selected_courses:
+            QMessageBox.warning(self, "Warning", "No courses selected")
+            return
+        
+        if not self.student:
+            QMessageBox.critical(self, "Error", "Student information not found")
+            return
+        
+        success, message = self.reg_system.request_seats(
+            self.student, self.selected_courses, self.current_semester
+        )
+        
+        if success:
+            QMessageBox.information(self, "Requests Submitted", message)
+            self.selected_courses.clear()
+            self.refresh_selected_courses()
+            self.refresh_timetable()
+        else:
+            self.validation_output.setStyleSheet("color: red;")
+            self.validation_output.setText(message)
+    
     def refresh_timetable(self):
         """Refresh timetable display"""
         semester = self.timetable_semester_input.text().strip()
@@ -443,10 +654,37 @@ class StudentDashboard(QWidget):
             for col in range(self.timetable_grid.columnCount()):
                 self.timetable_grid.setItem(row, col, QTableWidgetItem(""))
         
-        # Get registered courses
-        registrations = self.db.get_student_registrations(self.student.id, semester)
+        show_loading_row(self.registered_courses_table, "Loading registrations...")
+        
+        self.loader.load("timetable", self._load_timetable, self.student.id, semester,
+                         on_result=self._show_timetable,
+                         on_error=self._show_load_error)
+    
+    def _load_timetable(self, student_id, semester):
+        """
+        Load registrations, their meeting times and seat requests (worker thread)
+        
+        Returns:
+            (registrations, schedules keyed by course ID, seat requests)
+        """
+        registrations = self.db.get_student_registrations(student_id, semester)
+        schedules = self.reg_system.catalog.get_schedules_for_courses(
+            [reg['id'] for reg in registrations], semester
+        )
+        requests = self.db.get_student_requests(student_id, semester)
+        return registrations, schedules, requests
+    
+    def _show_timetable(self, result):
+        """Fill the registered courses table and timetable grid from _load_timetable"""
+        registrations, schedules, requests = result
+        
+        waiting = [f"{req['course_code']} (waitlist #{req['waitlist_position']})"
+                   if req['status'] == 'Waitlisted' else f"{req['course_code']} (pending allocation)"
+                   for req in requests if req['status'] in ('Pending', 'Waitlisted')]
+        self.requests_label.setText("Seat requests: " + ", ".join(waiting) if waiting else "")
         
         # Update registered courses table
+        self.registered_courses_table.clearSpans()
         self.registered_courses_table.setRowCount(len(registrations))
         
         for i, reg in enumerate(registrations):
@@ -460,30 +698,24 @@ class StudentDashboard(QWidget):
             drop_btn.clicked.connect(lambda checked, reg_id=reg['registration_id']: self.drop_course(reg_id))
             self.registered_courses_table.setCellWidget(i, 4, drop_btn)
             
-            # Get schedule and populate timetable
-            schedule = self.db.get_course_schedule(reg['id'], semester)
-            for sched in schedule:
-                # Map day to column
-                day_map = {"Sunday": 0, "Monday": 1, "Tuesday": 2, "Wednesday": 3, "Thursday": 4}
-                col = day_map.get(sched['day'], -1)
+            # Populate timetable
+            for sched in schedules.get(reg['id'], []):
+                # Day column and start time come from the precomputed slot mask
+                start = mask_start(schedule_mask([sched]))
                 
-                if col >= 0:
-                    # Calculate row from time
-                    try:
-                        start_hour = int(sched['start_time'].split(':')[0])
-                        row = start_hour - 8  # Assuming starts at 8:00
+                if start is not None:
+                    col, start_minute = start
+                    row = start_minute // 60 - 8  # Assuming starts at 8:00
+                    
+                    if 0 <= row < self.timetable_grid.rowCount():
+                        cell_text = f"{reg['course_code']}\n{sched['room'] or ''}"
+                        if sched['is_lab']:
+                            cell_text += "\n(Lab)"
                         
-                        if 0 <= row < self.timetable_grid.rowCount():
-                            cell_text = f"{reg['course_code']}\n{sched['room'] or ''}"
-                            if sched['is_lab']:
-                                cell_text += "\n(Lab)"
-                            
-                            item = QTableWidgetItem(cell_text)
-                            item.setBackground(QColor("#4CAF50" if not sched['is_lab'] else "#2196F3"))
-                            item.setForeground(QColor("white"))
-                            self.timetable_grid.setItem(row, col, item)
-                    except:
-                        pass
+                        item = QTableWidgetItem(cell_text)
+                        item.setBackground(QColor("#4CAF50" if not sched['is_lab'] else "#2196F3"))
+                        item.setForeground(QColor("white"))
+                        self.timetable_grid.setItem(row, col, item)
     
     def drop_course(self, registration_id):
         """Drop a registered course"""
@@ -0,0 +1,406 @@
+"""
+ECE Department Course Registration System - Synthetic Data
+Seeded generator of realistic test databases of any size
+
+Builds a four-year curriculum for the four programs (shared first-year
+and core courses, program tracks and electives), a prerequisite DAG whose
+edges always point to an earlier term, the program plans, a timetable for
+one semester and N students spread over programs and levels. Each
+student's transcript is simulated term by term along their plan: a course
+is only taken once its prerequisites were passed in an earlier term, and
+failed courses are retaken, so transcripts never contradict the
+prerequisite graph.
+
+The same seed and student count always give the same database. Rows are
+written through BulkImporter, so a 100k-student database takes well
+under a minute.
+
+Usage:
+    python synthetic_data.py --db test.db [--students 100000] [--seed 2025]
+                             [--semester "Fall 2025"] [--profile bulk-load]
+"""
+
+import argparse
+import math
+import random
+import sys
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from bulk_import import CHUNK_SIZE, BulkImporter, PROGRAMS
+from database import Database, DEFAULT_DB_NAME
+
+# Course code prefix of the shared courses and of each program's track
+TRACK_PREFIXES = {'common': "ECE", 'Computer': "CPE", 'Communications': "CME",
+                  'Power': "PWE", 'Biomedical': "BME"}
+
+# Level -> (shared core courses, program core courses) per plan semester
+PLAN_SHAPE = {1: (5, 0), 2: (3, 2), 3: (1, 4), 4: (0, 4)}
+
+# Electives per program and plan semester, offered from this level on
+ELECTIVES_PER_SEMESTER = 1
+ELECTIVES_FROM_LEVEL = 3
+
+# Share of students per level and per program
+LEVEL_WEIGHTS = {1: 30, 2: 27, 3: 23, 4: 20}
+PROGRAM_WEIGHTS = {'Computer': 35, 'Communications': 25, 'Power': 20, 'Biomedical': 20}
+
+# Lecture patterns: (days, start, minutes, weight). Late mornings are the
+# most popular; every lecture ends before the 14:00 lab block.
+LECTURE_SLOTS = [
+    (("Sunday", "Tuesday", "Thursday"), "08:00", 50, 2),
+    (("Sunday", "Tuesday", "Thursday"), "09:00", 50, 5),
+    (("Sunday", "Tuesday", "Thursday"), "10:00", 50, 6),
+    (("Sunday", "Tuesday", "Thursday"), "11:00", 50, 5),
+    (("Sunday", "Tuesday", "Thursday"), "12:00", 50, 3),
+    (("Sunday", "Tuesday", "Thursday"), "13:00", 50, 2),
+    (("Monday", "Wednesday"), "08:00", 75, 3),
+    (("Monday", "Wednesday"), "09:30", 75, 6),
+    (("Monday", "Wednesday"), "11:00", 75, 5),
+    (("Monday", "Wednesday"), "12:30", 75, 3),
+]
+LAB_BLOCK = ("14:00", "16:50")
+
+# Letter grades and how often they are given; F is the only failing grade
+GRADES = ["A", "A-", "B+", "B", "B-", "C+", "C", "D+", "D", "F"]
+GRADE_WEIGHTS = [14, 10, 12, 15, 10, 10, 10, 5, 6, 8]
+
+# Chance that a student takes the elective offered in a term
+ELECTIVE_UPTAKE = 0.6
+
+TOPICS = {
+    'common': ["Calculus", "Physics", "General Chemistry", "Introduction to Engineering",
+               "Programming Fundamentals", "Linear Algebra", "Circuit Analysis",
+               "Digital Logic Design", "Differential Equations", "Probability and Statistics",
+               "Electronics", "Signals and Systems", "Engineering Economics"],
+    'Computer': ["Data Structures", "Computer Architecture", "Operating Systems",
+                 "Embedded Systems", "Computer Networks", "Database Systems", "Algorithms",
+                 "Software Engineering", "Parallel Computing", "Computer Security",
+                 "VLSI Design", "Machine Learning"],
+    'Communications': ["Signal Processing", "Communication Systems", "Electromagnetic Fields",
+                       "Antennas and Propagation", "Wireless Communications", "Information Theory",
+                       "Microwave Engineering", "Optical Communications", "Digital Communications",
+                       "Satellite Systems", "Radar Systems", "Coding Theory"],
+    'Power': ["Electrical Machines", "Power Electronics", "Power Systems Analysis",
+              "Control Systems", "Power System Protection", "Renewable Energy Systems",
+              "High Voltage Engineering", "Electric Drives", "Smart Grids",
+              "Power Quality", "Energy Storage", "Power Distribution"],
+    'Biomedical': ["Biomedical Instrumentation", "Biosignal Processing", "Physiology for Engineers",
+                   "Medical Imaging", "Biomechanics", "Biomaterials", "Rehabilitation Engineering",
+                   "Clinical Engineering", "Bioinformatics", "Medical Device Design",
+                   "Neural Engineering", "Biosensors"],
+}
+
+FIRST_NAMES = ["Ahmed", "Fatima", "Mohammed", "Sara", "Omar", "Layla", "Youssef", "Mariam",
+               "Khalid", "Nour", "Hassan", "Aisha", "Ali", "Huda", "Karim", "Rania", "Tariq",
+               "Salma", "Ibrahim", "Dina", "Mostafa", "Yasmin", "Adam", "Hana", "Ziad", "Reem",
+               "Samir", "Lina", "Faris", "Jana"]
+LAST_NAMES = ["Hassan", "Ali", "Khalid", "Ahmed", "Said", "Mahmoud", "Ibrahim", "Mansour",
+              "Farouk", "Nasser", "Saleh", "Haddad", "Youssef", "Rashid", "Kamal", "Hamdan",
+              "Fawzi", "Sabry", "Zaki", "Osman", "Qasim", "Amin", "Darwish", "Shaheen"]
+
+
+def term_labels(semester_year: str, count: int) -> List[str]:
+    """
+    The `count` terms before a Fall/Spring semester, oldest first
+
+    Raises:
+        ValueError: If the semester is not "Fall YYYY" or "Spring YYYY"
+    """
+    season, _, year = semester_year.partition(" ")
+    if season not in ("Fall", "Spring") or not year.isdigit():
+        raise ValueError(f"Semester must be 'Fall YYYY' or 'Spring YYYY', got {semester_year!r}")
+    year = int(year)
+    labels = []
+    for _ in range(count):
+        season, year = ("Spring", year) if season == "Fall" else ("Fall", year - 1)
+        labels.append(f"{season} {year}")
+    return labels[::-1]
+
+
+def _weighted_sample(rng: random.Random, items: List, weights: List[float], k: int) -> List:
+    """k distinct items, each draw weighted (Efraimidis-Spirakis keys)"""
+    keyed = sorted(((rng.random() ** (1.0 / weight), index) for index, weight in enumerate(weights)),
+                   reverse=True)
+    return [items[index] for _, index in keyed[:k]]
+
+
+class SyntheticDataGenerator:
+    """
+    Deterministic generator of a whole registration database
+
+    Attributes:
+        students: Number of students to generate
+        seed: Random seed; the same seed and size give the same data
+        semester_year: Current semester ("Fall YYYY" or "Spring YYYY"); the
+            timetable is for this term and transcripts cover the terms before it
+    """
+
+    def __init__(self, students: int = 1000, seed: int = 2025, semester_year: str = "Fall 2025"):
+        self.students = students
+        self.seed = seed
+        self.semester_year = semester_year
+        self.plan_semester = 1 if semester_year.startswith("Fall") else 2
+        # Every past term a level 4 student can have, oldest first
+        self._terms = term_labels(semester_year, 2 * len(PLAN_SHAPE))
+        self.rng = random.Random(seed)
+
+        # Programs and levels are drawn first: course capacities follow the cohorts
+        programs = list(PROGRAM_WEIGHTS)
+        levels = list(LEVEL_WEIGHTS)
+        self._cohort = list(zip(self.rng.choices(programs, list(PROGRAM_WEIGHTS.values()), k=students),
+                                self.rng.choices(levels, list(LEVEL_WEIGHTS.values()), k=students)))
+        self._build_catalog()
+
+    def _build_catalog(self):
+        """Courses, prerequisite edges, plans and meetings, all in memory"""
+        rng = self.rng
+        level_sizes = Counter(level for _, level in self._cohort)
+        program_sizes = Counter(self._cohort)
+        topic_use = Counter()
+
+        self.courses = []        # Course records for the importer
+        self.prerequisites = []  # (course code, prerequisite code)
+        self.plans = []          # (program, level, semester, course code, is elective)
+        self.meetings = []       # Schedule records for the current semester
+        # Track -> plan position -> core course codes, for prerequisites and transcripts
+        self._core = {track: {} for track in TRACK_PREFIXES}
+        # Program -> plan position -> elective codes
+        self._electives = {program: {} for program in PROGRAMS}
+        self._prereqs = {}       # Course code -> prerequisite codes
+
+        def add_course(track: str, level: int, semester: int, index: int, lab: bool,
+                       students: int) -> str:
+            topics = TOPICS[track]
+            count = topic_use[track]
+            topic_use[track] += 1
+            # Topics are reused as "II", "III", ... once a track runs out
+            repeat = count // len(topics)
+            name = topics[count % len(topics)] + (f" {'I' * (repeat + 1)}" if repeat else "")
+            code = f"{TRACK_PREFIXES[track]}{level}{semester}{index}"
+            self.courses.append({
+                'course_code': code, 'name': name, 'credits': 4 if lab else 3,
+                'lecture_hours': 3, 'lab_hours': 2 if lab else 0,
+                'max_capacity': max(30, math.ceil(students * 1.1)),
+                'description': f"Level {level} {'core' if track == 'common' else track} course",
+            })
+            return code
+
+        def add_prerequisites(code: str, tracks: Tuple[str, ...], position: int):
+            # One or two courses from the previous two terms of the same
+            # tracks; edges only point backwards, so the graph stays acyclic
+            candidates = [earlier for track in tracks for back in (1, 2)
+                          for earlier in self._core[track].get(position - back, [])]
+            if not candidates:
+                return
+            chosen = rng.sample(candidates, min(len(candidates), rng.choice([1, 1, 1, 2, 2])))
+            self._prereqs[code] = chosen
+            self.prerequisites.extend((code, prerequisite) for prerequisite in chosen)
+
+        for level, (shared, per_program) in PLAN_SHAPE.items():
+            for semester in (1, 2):
+                position = (level - 1) * 2 + semester - 1
+                common_codes = []
+                for index in range(shared):
+                    code = add_course('common', level, semester, index, index < 2, level_sizes[level])
+                    add_prerequisites(code, ('common',), position)
+                    common_codes.append(code)
+                self._core['common'][position] = common_codes
+
+                for program in PROGRAMS:
+                    codes = []
+                    for index in range(per_program):
+                        code = add_course(program, level, semester, index, index == 0,
+                                          program_sizes[program, level])
+                        add_prerequisites(code, ('common', program), position)
+                        codes.append(code)
+                    self._core[program][position] = codes
+                    electives = []
+                    if level >= ELECTIVES_FROM_LEVEL:
+                        for offset in range(ELECTIVES_PER_SEMESTER):
+                            code = add_course(program, level, semester, 5 + offset, False,
+                                              program_sizes[program, level] // 2)
+                            add_prerequisites(code, (program,), position)
+                            electives.append(code)
+                    self._electives[program][position] = electives
+
+                    self.plans.extend((program, level, semester, code, False) for code in common_codes + codes)
+                    self.plans.extend((program, level, semester, code, True) for code in electives)
+
+                if semester == self.plan_semester:
+                    self._schedule_term(level, common_codes,
+                                        {program: self._core[program][position] + self._electives[program][position]
+                                         for program in PROGRAMS})
+
+    def _schedule_term(self, level: int, common_codes: List[str], program_codes: Dict[str, List[str]]):
+        """
+        Give one plan term's courses lecture slots and lab blocks
+
+        Shared courses are placed first; each program's courses then take
+        the remaining slots and lab days, so no two courses of one plan
+        term clash.
+        """
+        rng = self.rng
+        weights = [slot[3] for slot in LECTURE_SLOTS]
+        labs = {course['course_code'] for course in self.courses if course['lab_hours']}
+        shared_slots = _weighted_sample(rng, list(range(len(LECTURE_SLOTS))), weights, len(common_codes))
+        shared_days = rng.sample(range(5), len(common_codes))
+
+        def place(codes: List[str], slots: List[int], days: List[int]):
+            lab_days = iter(days)
+            for code, slot in zip(codes, slots):
+                lecture_days, start, minutes, _ = LECTURE_SLOTS[slot]
+                hour, minute = map(int, start.split(":"))
+                end = hour * 60 + minute + minutes
+                room = f"A{level}{len(self.meetings) % 40:02d}"
+                for day in lecture_days:
+                    self.meetings.append({'course_code': code, 'day': day, 'start_time': start,
+                                          'end_time': f"{end // 60:02d}:{end % 60:02d}", 'room': room,
+                                          'is_lab': False, 'semester_year': self.semester_year})
+                if code in labs:
+                    day = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday")[next(lab_days)]
+                    self.meetings.append({'course_code': code, 'day': day, 'start_time': LAB_BLOCK[0],
+                                          'end_time': LAB_BLOCK[1], 'room': f"L{level}{day[:2]}",
+                                          'is_lab': True, 'semester_year': self.semester_year})
+
+        place(common_codes, shared_slots, [day for day, code in zip(shared_days, common_codes) if code in labs])
+        for program, codes in program_codes.items():
+            free = [slot for slot in range(len(LECTURE_SLOTS)) if slot not in shared_slots]
+            slots = _weighted_sample(rng, free, [weights[slot] for slot in free], len(codes))
+            used = {day for day, code in zip(shared_days, common_codes) if code in labs}
+            days = [day for day in range(5) if day not in used]
+            rng.shuffle(days)
+            place(codes, slots, days)
+
+    def _student_ids(self) -> Iterator[str]:
+        """University IDs: entry year followed by a serial number"""
+        entry_year = int(self.semester_year.split()[-1]) - (0 if self.plan_semester == 1 else 1)
+        serials = Counter()
+        for _, level in self._cohort:
+            year = entry_year - level + 1
+            serials[year] += 1
+            yield f"{year}{serials[year]:06d}"
+
+    def student_rows(self) -> Iterator[Tuple[int, Dict]]:
+        """(sequence number, student record) for every student"""
+        rng = random.Random(self.seed + 1)
+        for number, ((program, level), student_id) in enumerate(zip(self._cohort, self._student_ids()), 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield number, {'student_id': student_id, 'name': f"{first} {last}",
+                           'email': f"{first.lower()}.{last.lower()}.{student_id}@ece.edu",
+                           'program': program, 'level': level}
+
+    def transcript_rows(self) -> Iterator[Tuple[int, Dict]]:
+        """
+        (sequence number, transcript record) for every student's past terms
+
+        Each term the student takes the plan's courses for that term plus
+        anything failed or postponed earlier, but only courses whose
+        prerequisites were all passed in an earlier term.
+        """
+        rng = random.Random(self.seed + 2)
+        number = 0
+        for (program, level), student_id in zip(self._cohort, self._student_ids()):
+            current = (level - 1) * 2 + self.plan_semester - 1
+            passed = set()
+            pending = []
+            for position, label in zip(range(current), self._terms[len(self._terms) - current:]):
+                wanted = pending + self._core['common'].get(position, []) + self._core[program].get(position, [])
+                wanted += [code for code in self._electives[program].get(position, [])
+                           if rng.random() < ELECTIVE_UPTAKE]
+                pending = []
+                newly_passed = []
+                for code in wanted:
+                    if not passed.issuperset(self._prereqs.get(code, ())):
+                        pending.append(code)
+                        continue
+                    grade = rng.choices(GRADES, GRADE_WEIGHTS)[0]
+                    if grade == "F":
+                        pending.append(code)
+                    else:
+                        newly_passed.append(code)
+                    number += 1
+                    yield number, {'student_id': student_id, 'course_code': code,
+                                   'grade': grade, 'semester_year': label, 'passed': grade != "F"}
+                passed.update(newly_passed)
+
+    def catalog_rows(self, kind: str) -> Iterator[Tuple[int, Dict]]:
+        """(sequence number, record) for a catalog import kind"""
+        if kind == 'courses':
+            records = self.courses
+        elif kind == 'prerequisites':
+            records = [{'course_code': code, 'prerequisite_code': prerequisite}
+                       for code, prerequisite in self.prerequisites]
+        elif kind == 'program_plans':
+            records = [{'program': program, 'level': level, 'semester': semester,
+                        'course_code': code, 'is_elective': elective}
+                       for program, level, semester, code, elective in self.plans]
+        elif kind == 'course_schedules':
+            records = self.meetings
+        else:
+            raise ValueError(f"Unknown catalog kind '{kind}'")
+        return enumerate(records, 1)
+
+    def write(self, db: Database, chunk_size: int = CHUNK_SIZE,
+              progress: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Load the generated data into an empty database
+
+        Args:
+            db: Database to fill (open it with the 'bulk-load' profile for speed)
+            chunk_size: Rows per bulk import transaction
+            progress: Passed to BulkImporter
+
+        Returns:
+            BulkImporter stats for each kind, in import order
+
+        Raises:
+            ValueError: If the database already has courses or students
+        """
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            for table in ('courses', 'students'):
+                cursor.execute(f"SELECT 1 FROM {table} LIMIT 1")
+                if cursor.fetchone() is not None:
+                    raise ValueError(f"Synthetic data must be written to an empty database ({table} has rows)")
+        importer = BulkImporter(db, chunk_size=chunk_size, progress=progress)
+        results = [importer.import_rows(kind, self.catalog_rows(kind))
+                   for kind in ('courses', 'prerequisites', 'program_plans', 'course_schedules')]
+        results.append(importer.import_rows('students', self.student_rows()))
+        results.append(importer.import_rows('transcripts', self.transcript_rows()))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a realistic test database")
+    parser.add_argument("--db", default=DEFAULT_DB_NAME, help="Database file (must not hold courses or students)")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--semester", default="Fall 2025", help='Current semester, e.g. "Fall 2025"')
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per transaction")
+    parser.add_argument("--profile", default="bulk-load", help="Storage profile (see database.STORAGE_PROFILES)")
+    args = parser.parse_args()
+
+    try:
+        generator = SyntheticDataGenerator(args.students, args.seed, args.semester)
+    except ValueError as e:
+        parser.error(str(e))
+    db = Database(args.db, profile=args.profile)
+    try:
+        results = generator.write(db, args.chunk_size)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        db.close()
+
+    for stats in results:
+        print(f"{stats['kind']:17s} {stats['imported']:9d} rows in {stats['seconds']:6.2f}s "
+              f"({stats['rows_per_second']:,.0f} rows/s)")
+    print(f"Total {sum(stats['imported'] for stats in results)} rows in "
+          f"{sum(stats['seconds'] for stats in results):.1f}s")
+    sys.exit(1 if any(stats['rejected'] for stats in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
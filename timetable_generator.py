@@ -0,0 +1,172 @@
+"""
+ECE Department Course Registration System - Timetable Generator
+Branch-and-bound search for the best conflict-free course selections
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+
+from database import MAX_CREDITS, MIN_CREDITS
+from schedule_conflicts import SLOTS_PER_DAY, WEEK_DAYS
+
+# Weekly slot bitmask of each teaching day
+_DAY_MASKS = [((1 << SLOTS_PER_DAY) - 1) << (day * SLOTS_PER_DAY) for day in range(len(WEEK_DAYS))]
+
+# Nodes explored between time budget checks
+_CHECK_EVERY = 256
+
+
+def teaching_days(mask: int) -> int:
+    """Number of days a weekly slot bitmask has meetings on"""
+    return sum(1 for day_mask in _DAY_MASKS if mask & day_mask)
+
+
+def generate_timetables(courses: List[Dict], masks: Dict[int, int],
+                        min_credits: int = MIN_CREDITS, max_credits: int = MAX_CREDITS,
+                        top_k: int = 5, time_budget: float = 2.0,
+                        weights: Optional[Dict[int, float]] = None, busy_mask: int = 0,
+                        on_found: Optional[Callable[[List[Dict]], None]] = None,
+                        cancelled: Optional[Callable[[], bool]] = None) -> Dict:
+    """
+    Find the top-K conflict-free course selections
+
+    A selection is a set of courses with pairwise disjoint slot masks,
+    clear of busy_mask, whose credits are within [min_credits, max_credits]
+    and to which no further course can be added. Selections are ranked by
+    total weight, then by fewer teaching days.
+
+    The search picks courses in order of weight per credit. Each pick
+    narrows the candidates to those compatible with everything chosen
+    so far, one AND per pick. A branch is pruned when it cannot reach
+    min_credits, or when even a fractional fill of the remaining credit
+    budget cannot beat the K-th best selection found so far.
+
+    Args:
+        courses: Eligible course rows (id and credits are used)
+        masks: Weekly slot bitmask keyed by course ID
+        min_credits: Minimum credits of a selection
+        max_credits: Maximum credits of a selection
+        top_k: Number of selections to return
+        time_budget: Seconds after which the search stops with what it has
+        weights: Course preference keyed by course ID (default: its credits)
+        busy_mask: Slots already taken, e.g. by registered courses
+        on_found: Called with the current best selections whenever a new
+            one enters the top K (on the searching thread)
+        cancelled: Polled during the search; returning True stops it
+
+    Returns:
+        Dict with 'timetables' (best first; each with 'course_ids',
+        'credits', 'score' and 'days'), 'complete' (False if the time
+        budget or cancellation cut the search short), 'nodes' and 'seconds'
+    """
+    start = time.perf_counter()
+    deadline = start + time_budget
+    weights = weights or {}
+
+    # Courses that clash with the busy slots or could never fit are out
+    candidates = [course for course in courses
+                  if not masks.get(course['id'], 0) & busy_mask and 0 < course['credits'] <= max_credits]
+    candidates.sort(key=lambda course: (-weights.get(course['id'], course['credits']) / course['credits'],
+                                        -weights.get(course['id'], course['credits']), course['id']))
+    count = len(candidates)
+    ids = [course['id'] for course in candidates]
+    credit = [course['credits'] for course in candidates]
+    weight = [weights.get(course_id, course_credits) for course_id, course_credits in zip(ids, credit)]
+    mask = [masks.get(course_id, 0) for course_id in ids]
+
+    # compatible[i]: candidates (as a bitset over positions) that do not clash with i
+    compatible = []
+    for i in range(count):
+        bits = 0
+        for j in range(count):
+            if i != j and not mask[i] & mask[j]:
+                bits |= 1 << j
+        compatible.append(bits)
+
+    credit_of = dict(zip(ids, credit))
+    best = []  # (score, -days, course IDs), best first
+    state = {'nodes': 0, 'stopped': False}
+
+    def threshold():
+        return best[-1][0] if len(best) >= top_k else None
+
+    def record(chosen, score, slots):
+        entry = (score, -teaching_days(slots | busy_mask), sorted(ids[i] for i in chosen))
+        if len(best) >= top_k and entry[:2] <= best[-1][:2]:
+            return
+        best.append(entry)
+        best.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        del best[top_k:]
+        if on_found is not None:
+            on_found(_timetables(best, credit_of))
+
+    def search(position, allowed, chosen, credits, score, slots):
+        state['nodes'] += 1
+        if state['nodes'] % _CHECK_EVERY == 0:
+            if time.perf_counter() > deadline or (cancelled is not None and cancelled()):
+                state['stopped'] = True
+        if state['stopped']:
+            return
+
+        budget = max_credits - credits
+        fits = [i for i in _positions(allowed) if credit[i] <= budget]
+        if not fits:
+            # Nothing more can be added: a complete selection
+            if credits >= min_credits:
+                record(chosen, score, slots)
+            return
+
+        ahead = [i for i in fits if i >= position]
+        if credits + sum(credit[i] for i in ahead) < min_credits:
+            return  # Cannot reach the minimum on this branch
+
+        floor = threshold()
+        if floor is not None and score + _fractional_bound(ahead, credit, weight, budget) < floor:
+            return
+
+        for i in ahead:
+            if credit[i] > budget:
+                continue
+            search(i + 1, allowed & compatible[i], chosen + [i], credits + credit[i],
+                   score + weight[i], slots | mask[i])
+            if state['stopped']:
+                return
+
+    search(0, (1 << count) - 1, [], 0, 0, 0)
+    return {
+        'timetables': _timetables(best, credit_of),
+        'complete': not state['stopped'],
+        'nodes': state['nodes'],
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def _positions(bits: int) -> List[int]:
+    """Set bit positions of a bitset, lowest first"""
+    positions = []
+    while bits:
+        low = bits & -bits
+        positions.append(low.bit_length() - 1)
+        bits ^= low
+    return positions
+
+
+def _fractional_bound(positions: List[int], credit: List[int], weight: List[float],
+                      budget: int) -> float:
+    """Most weight the positions could add within the credit budget (fractional knapsack)"""
+    total = 0.0
+    for i in positions:  # Already in weight-per-credit order
+        if credit[i] <= budget:
+            total += weight[i]
+            budget -= credit[i]
+        else:
+            return total + weight[i] * budget / credit[i]
+    return total
+
+
+def _timetables(best, credit_of: Dict[int, int]) -> List[Dict]:
+    return [{'course_ids': course_ids,
+             'credits': sum(credit_of[course_id] for course_id in course_ids),
+             'score': score,
+             'days': -negative_days}
+            for score, negative_days, course_ids in best]